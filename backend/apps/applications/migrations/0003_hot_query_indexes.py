@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job', 'status', '-applied_at'], name='application_job_id_8d245e_idx'),
+        ),
+    ]
@@ -37,3 +37,7 @@ class JobApplication(models.Model):
     
     class Meta:
         unique_together = ['job', 'applicant']
+        indexes = [
+            # Employer dashboards: a job's applications in one status, newest first
+            models.Index(fields=['job', 'status', '-applied_at']),
+        ]
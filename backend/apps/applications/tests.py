@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from backend.apps.applications.models import JobApplication
+from backend.apps.applications.views import EXPORT_APPLICATION_EXPRESSIONS, EXPORT_APPLICATION_FIELDS
+from backend.apps.jobs.tests import create_employer, create_jobs
+from backend.apps.users.models import CustomUser, JobSeekerProfile
+
+
+@override_settings(MATCHING_CONCURRENCY=0, JOB_NOTIFICATION_CONCURRENCY=0)
+class ApplicationExportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = create_employer()
+        own_jobs = create_jobs(cls.employer, 2)
+        other_job = create_jobs(create_employer('other', 'Initech'), 1)[0]
+        cls.applications = []
+        for number in range(2):
+            user = CustomUser.objects.create(username=f'applicant{number}', email=f'applicant{number}@example.com',
+                                             user_type='job_seeker')
+            applicant = JobSeekerProfile.objects.create(user=user, first_name=f'Applicant{number}', last_name='Smith',
+                                                        title='Developer', experience_level='mid',
+                                                        current_location='Berlin')
+            cls.applications += [JobApplication.objects.create(job=job, applicant=applicant) for job in own_jobs]
+            JobApplication.objects.create(job=other_job, applicant=applicant)
+        cls.columns = list(EXPORT_APPLICATION_FIELDS) + list(EXPORT_APPLICATION_EXPRESSIONS)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.employer.user)
+
+    def export(self, **params):
+        response = self.client.get('/api/applications/export/', params)
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_ndjson_has_one_object_per_own_application(self):
+        response, body = self.export()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(sorted(row['id'] for row in rows), sorted(str(app.id) for app in self.applications))
+        self.assertEqual(list(rows[0]), self.columns)
+        self.assertEqual({row['applicant_email'] for row in rows}, {'applicant0@example.com', 'applicant1@example.com'})
+
+    def test_csv_of_one_job(self):
+        job_id = self.applications[0].job_id
+        response, body = self.export(output='csv', job_id=str(job_id))
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(list(rows[0]), self.columns)
+        self.assertEqual(sorted(row['id'] for row in rows),
+                         sorted(str(app.id) for app in self.applications if app.job_id == job_id))
+
+    def test_unsupported_output_is_rejected(self):
+        response = self.client.get('/api/applications/export/', {'output': 'xlsx'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Unsupported export format', response.json()['error'])
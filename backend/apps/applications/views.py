@@ -0,0 +1,46 @@
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from django.db.models import F
+from .models import JobApplication
+from backend.utils.export import streaming_export
+
+# Columns of an applications export
+EXPORT_APPLICATION_FIELDS = (
+    'id', 'job_id', 'status',
+    'overall_match_score', 'skill_match_score', 'experience_match_score', 'location_match_score',
+    'applied_at', 'updated_at',
+)
+
+# Columns taken from the job and the applicant
+EXPORT_APPLICATION_EXPRESSIONS = {
+    'job_title': F('job__title'),
+    'applicant_first_name': F('applicant__first_name'),
+    'applicant_last_name': F('applicant__last_name'),
+    'applicant_email': F('applicant__user__email'),
+}
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def export_applications(request):
+    """
+    Stream the applications to the current employer's jobs as NDJSON, or CSV with ?output=csv
+
+    Pass job_id to export the applicants of a single job.
+    """
+    try:
+        applications = JobApplication.objects.filter(job__employer__user=request.user)
+        if request.query_params.get('job_id'):
+            applications = applications.filter(job_id=request.query_params['job_id'])
+        return streaming_export(
+            applications.order_by('applied_at', 'id'),
+            EXPORT_APPLICATION_FIELDS,
+            'applications',
+            request.query_params.get('output', 'ndjson'),
+            expressions=EXPORT_APPLICATION_EXPRESSIONS,
+        )
+
+    except Exception as e:
+        return Response({
+            'error': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,89 @@
+import random
+import time
+from types import SimpleNamespace
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from backend.apps.jobs.models import Job
+from backend.apps.jobs.signals import calculate_job_match
+from backend.services.job_matcher import SeekerMatrix
+from backend.services.skill_extractor import DEFAULT_SKILL_KEYWORDS
+
+LOCATIONS = ['New York', 'San Francisco', 'Austin', 'Remote', 'London', 'Berlin', 'Bangalore', 'Toronto']
+JOB_TYPES = [job_type for job_type, _ in Job.JOB_TYPES]
+LEVELS = [level for level, _ in Job.EXPERIENCE_LEVELS]
+SKILLS = [keyword.title() for keyword in DEFAULT_SKILL_KEYWORDS]
+
+
+def synthetic_seekers(count, seed=0):
+    rng = random.Random(seed)
+    for user_id in range(count):
+        yield (
+            user_id,
+            rng.sample(SKILLS, rng.randint(0, 15)),
+            rng.choice(LEVELS + ['']),
+            rng.choice(LOCATIONS),
+            rng.sample(LOCATIONS, rng.randint(0, 2)),
+            rng.choice(JOB_TYPES + ['']),
+        )
+
+
+def synthetic_jobs(count, seed=1):
+    rng = random.Random(seed)
+    return [
+        SimpleNamespace(
+            extracted_skills=rng.sample(SKILLS, rng.randint(1, 8)),
+            experience_required=rng.choice(LEVELS),
+            location=f'{rng.choice(LOCATIONS)}, Hybrid',
+            job_type=rng.choice(JOB_TYPES),
+        )
+        for _ in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the vectorized seeker matrix against the scalar calculate_job_match loop'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seekers', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                            help='Numbers of job seekers to benchmark')
+        parser.add_argument('--jobs', type=int, default=20,
+                            help='Jobs scored per measurement')
+        parser.add_argument('--scalar-sample', type=int, default=20_000,
+                            help='Seekers scored with the scalar function; its time is extrapolated beyond this')
+
+    def handle(self, *args, **options):
+        jobs = synthetic_jobs(options['jobs'])
+
+        for count in options['seekers']:
+            rows = list(synthetic_seekers(count))
+            started = time.perf_counter()
+            matrix = SeekerMatrix(rows)
+            build_s = time.perf_counter() - started
+
+            started = time.perf_counter()
+            single = np.stack([matrix.score(job) for job in jobs])
+            single_ms = (time.perf_counter() - started) * 1000 / len(jobs)
+
+            started = time.perf_counter()
+            batch = matrix.score_many(jobs)
+            batch_ms = (time.perf_counter() - started) * 1000 / len(jobs)
+
+            sample = rows[:options['scalar_sample']]
+            seekers = [
+                SimpleNamespace(extracted_skills=skills, experience_level=level, current_location=location,
+                                preferred_locations=preferred, preferred_job_type=job_type)
+                for _, skills, level, location, preferred, job_type in sample
+            ]
+            started = time.perf_counter()
+            scalar = np.array([[calculate_job_match(seeker, job) for seeker in seekers] for job in jobs])
+            scalar_ms = (time.perf_counter() - started) * 1000 / len(jobs) * count / len(sample)
+
+            identical = np.array_equal(single[:, :len(sample)], scalar) and np.array_equal(batch, single)
+            self.stdout.write(
+                f'{count:>9} seekers (built in {build_s:.1f}s): '
+                f'scalar {scalar_ms:9.1f} ms/job, vectorized {single_ms:7.2f} ms/job, '
+                f'batch {batch_ms:7.2f} ms/job, speedup {scalar_ms / single_ms:6.1f}x, '
+                f'identical: {"yes" if identical else "NO"}'
+            )
@@ -0,0 +1,87 @@
+import re
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from backend.apps.applications.models import JobApplication
+from backend.apps.jobs.models import Job, JobSkill
+from backend.apps.jobs.search import search_jobs
+from backend.apps.jobs.views import JobListPagination
+from backend.apps.matching.models import JobMatch, SeekerLocationPosting
+from backend.apps.skills.models import UserSkill
+from backend.services.seeker_index import candidate_profiles
+
+# Plan lines that mean a whole table is read, or rows are sorted after
+# being fetched, per database vendor
+FULL_SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN \w+$'),
+    'postgresql': re.compile(r'\bSeq Scan\b'),
+}
+SORT_PATTERNS = {
+    'sqlite': re.compile(r'\bUSE TEMP B-TREE\b'),
+    'postgresql': re.compile(r'^\s*(->\s*)?Sort\b'),
+}
+
+
+def hot_queries():
+    """(description, queryset) for each query the API runs on hot paths"""
+    some_id = uuid.uuid4()
+    queries = [
+        ('list_jobs page', Job.objects.filter(is_active=True).order_by('-created_at', '-id')[:11]),
+        ('list_jobs later page', Job.objects.filter(
+            JobListPagination().after([timezone.now(), some_id], reverse=False), is_active=True,
+        ).order_by('-created_at', '-id')[:11]),
+        ('get_job', Job.objects.select_related('employer').filter(id=some_id)),
+        ('employer job export', Job.objects.filter(employer_id=1).order_by('created_at', 'id')),
+        ('job applications by status',
+         JobApplication.objects.filter(job_id=some_id, status='pending').order_by('-applied_at')),
+        ('employer application export',
+         JobApplication.objects.filter(job__employer__user_id=some_id).order_by('applied_at', 'id')),
+        ('recommended jobs', JobMatch.objects.filter(user_id=some_id, job__is_active=True).order_by('-score', 'id')[:21]),
+        ("a job's skills", JobSkill.objects.filter(job_id=some_id).values('skill_id')),
+        ('jobs requiring a skill', JobSkill.objects.filter(skill_id=1).values('job_id')),
+        ('users with a skill', UserSkill.objects.filter(skill_id=1).values('user_id')),
+        ('longest seeker location', SeekerLocationPosting.objects.order_by(Length('location').desc())[:1]),
+        ('job search', search_jobs(Job.objects.filter(is_active=True), 'python developer')[:10]),
+    ]
+    job = Job.objects.only('id', 'location', 'extracted_skills').first()
+    if job is not None:
+        queries.append(('notification candidates', candidate_profiles(job).values('id')))
+    return queries
+
+
+class Command(BaseCommand):
+    help = ('Print the query plan of each hot query and flag full table scans and sorts. '
+            'Run ANALYZE first on PostgreSQL: with no statistics it scans small tables.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--strict', action='store_true',
+                            help='Exit with an error if any plan contains a full table scan')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in FULL_SCAN_PATTERNS:
+            raise CommandError(f'No plan checks for the {connection.vendor} backend')
+        full_scan = FULL_SCAN_PATTERNS[connection.vendor]
+        sort = SORT_PATTERNS[connection.vendor]
+
+        scanned, sorted_ = [], []
+        for description, queryset in hot_queries():
+            plan = queryset.explain().splitlines()
+            notes = []
+            if any(full_scan.search(line) for line in plan):
+                scanned.append(description)
+                notes.append('FULL SCAN')
+            if any(sort.search(line) for line in plan):
+                # Fine for small result sets such as one employer's rows
+                sorted_.append(description)
+                notes.append('sort')
+            self.stdout.write(f"== {description}: {', '.join(notes) or 'ok'}")
+            for line in plan:
+                self.stdout.write(f'   {line}')
+
+        self.stdout.write(f'{len(scanned)} full scans, {len(sorted_)} sorts')
+        if scanned and options['strict']:
+            raise CommandError(f"Full scans in: {', '.join(scanned)}")
@@ -0,0 +1,20 @@
+from importlib import import_module
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+# The statements that first filled the index
+search_index_migration = import_module('backend.apps.jobs.migrations.0003_job_search_index')
+
+
+class Command(BaseCommand):
+    help = 'Repopulate the SQLite full-text job search index, e.g. after VACUUM'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('The full-text index table only exists on SQLite')
+        with transaction.atomic(), connection.cursor() as cursor:
+            for statement in search_index_migration.POPULATE_SQL:
+                cursor.execute(statement)
+            cursor.execute('SELECT count(*) FROM jobs_job_fts')
+            self.stdout.write(f'Indexed {cursor.fetchone()[0]} jobs')
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='description_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,83 @@
+from django.db import migrations
+
+# SQLite only: an FTS5 index over job text kept current by triggers. The
+# rowid of jobs_job is used as the FTS rowid; VACUUM can renumber it, so run
+# `manage.py rebuild_job_search_index` after vacuuming.
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE jobs_job_fts USING fts5(
+        title, description, location, company_name,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER jobs_job_fts_insert AFTER INSERT ON jobs_job BEGIN
+        INSERT INTO jobs_job_fts (rowid, title, description, location, company_name)
+        VALUES (new.rowid, new.title, new.description, new.location,
+                (SELECT company_name FROM users_employerprofile WHERE id = new.employer_id));
+    END
+    """,
+    """
+    CREATE TRIGGER jobs_job_fts_update AFTER UPDATE OF title, description, location, employer_id ON jobs_job BEGIN
+        UPDATE jobs_job_fts
+        SET title = new.title, description = new.description, location = new.location,
+            company_name = (SELECT company_name FROM users_employerprofile WHERE id = new.employer_id)
+        WHERE rowid = new.rowid;
+    END
+    """,
+    """
+    CREATE TRIGGER jobs_job_fts_delete AFTER DELETE ON jobs_job BEGIN
+        DELETE FROM jobs_job_fts WHERE rowid = old.rowid;
+    END
+    """,
+    """
+    CREATE TRIGGER jobs_job_fts_company AFTER UPDATE OF company_name ON users_employerprofile BEGIN
+        UPDATE jobs_job_fts SET company_name = new.company_name
+        WHERE rowid IN (SELECT rowid FROM jobs_job WHERE employer_id = new.id);
+    END
+    """,
+]
+
+POPULATE_SQL = [
+    "DELETE FROM jobs_job_fts",
+    """
+    INSERT INTO jobs_job_fts (rowid, title, description, location, company_name)
+    SELECT job.rowid, job.title, job.description, job.location, employer.company_name
+    FROM jobs_job AS job LEFT JOIN users_employerprofile AS employer ON employer.id = job.employer_id
+    """,
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS jobs_job_fts_company",
+    "DROP TRIGGER IF EXISTS jobs_job_fts_delete",
+    "DROP TRIGGER IF EXISTS jobs_job_fts_update",
+    "DROP TRIGGER IF EXISTS jobs_job_fts_insert",
+    "DROP TABLE IF EXISTS jobs_job_fts",
+]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in CREATE_SQL + POPULATE_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_description_hash'),
+        ('users', '0004_jobseekerprofile_preferred_job_type'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_job_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', '-created_at', '-id'], name='jobs_job_is_acti_2ffb72_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_job_list_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_is_acti_2ffb72_idx',
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='jobs_job_active_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['employer', 'created_at', 'id'], name='jobs_job_employe_e896e4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobskill',
+            index=models.Index(fields=['job', 'skill'], name='jobs_jobski_job_id_2a5c45_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobskill',
+            index=models.Index(fields=['skill', 'job'], name='jobs_jobski_skill_i_1a433c_idx'),
+        ),
+    ]
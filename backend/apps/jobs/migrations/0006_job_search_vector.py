@@ -0,0 +1,91 @@
+from django.db import migrations
+
+# PostgreSQL only: a weighted tsvector of job text in jobs_job.search_vector,
+# GIN-indexed and kept current by triggers. Title weighs most, then location
+# and company name, then the description. The company name lives in
+# users_employerprofile, so a generated column can't hold it.
+CREATE_SQL = [
+    "ALTER TABLE jobs_job ADD COLUMN search_vector tsvector",
+    """
+    CREATE FUNCTION jobs_job_search_vector(title text, description text, location text, company_name text)
+    RETURNS tsvector LANGUAGE sql IMMUTABLE AS $$
+        SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('english', coalesce(location, '') || ' ' || coalesce(company_name, '')), 'B')
+            || setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    $$
+    """,
+    """
+    CREATE FUNCTION jobs_job_search_vector_row() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.search_vector := jobs_job_search_vector(
+            NEW.title, NEW.description, NEW.location,
+            (SELECT company_name FROM users_employerprofile WHERE id = NEW.employer_id)
+        );
+        RETURN NEW;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER jobs_job_search_vector_row
+    BEFORE INSERT OR UPDATE OF title, description, location, employer_id ON jobs_job
+    FOR EACH ROW EXECUTE FUNCTION jobs_job_search_vector_row()
+    """,
+    """
+    CREATE FUNCTION jobs_job_search_vector_company() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE jobs_job
+        SET search_vector = jobs_job_search_vector(title, description, location, NEW.company_name)
+        WHERE employer_id = NEW.id;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER jobs_job_search_vector_company
+    AFTER UPDATE OF company_name ON users_employerprofile
+    FOR EACH ROW WHEN (OLD.company_name IS DISTINCT FROM NEW.company_name)
+    EXECUTE FUNCTION jobs_job_search_vector_company()
+    """,
+    """
+    UPDATE jobs_job
+    SET search_vector = jobs_job_search_vector(
+        title, description, location,
+        (SELECT company_name FROM users_employerprofile WHERE id = jobs_job.employer_id)
+    )
+    """,
+    "CREATE INDEX jobs_job_search_vector_idx ON jobs_job USING GIN (search_vector)",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS jobs_job_search_vector_company ON users_employerprofile",
+    "DROP TRIGGER IF EXISTS jobs_job_search_vector_row ON jobs_job",
+    "DROP FUNCTION IF EXISTS jobs_job_search_vector_company()",
+    "DROP FUNCTION IF EXISTS jobs_job_search_vector_row()",
+    "ALTER TABLE jobs_job DROP COLUMN IF EXISTS search_vector",
+    "DROP FUNCTION IF EXISTS jobs_job_search_vector(text, text, text, text)",
+]
+
+
+def create_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in CREATE_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_vector, drop_search_vector),
+    ]
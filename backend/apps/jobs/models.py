@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 import uuid
 from backend.apps.users.models import EmployerProfile
 from backend.apps.skills.models import Skill, UserSkill
@@ -41,6 +42,7 @@ class Job(models.Model):
     # Requirements (extracted from job description)
     extracted_skills = models.JSONField(default=list)
     extracted_requirements = models.JSONField(default=dict)
+    description_hash = models.CharField(max_length=64, blank=True)  # SHA-256 of the description last extracted
     
     # Status and Visibility
     is_active = models.BooleanField(default=True)
@@ -52,6 +54,14 @@ class Job(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     expires_at = models.DateTimeField()
 
+    class Meta:
+        indexes = [
+            # Newest-first pages of list_jobs; only active jobs are indexed
+            models.Index(fields=['-created_at', '-id'], condition=Q(is_active=True), name='jobs_job_active_recent_idx'),
+            # An employer's postings in date order (exports, dashboards)
+            models.Index(fields=['employer', 'created_at', 'id']),
+        ]
+
 class JobSkill(models.Model):
     job = models.ForeignKey(Job, on_delete=models.CASCADE)
     skill = models.ForeignKey(Skill, on_delete=models.CASCADE)
@@ -61,3 +71,10 @@ class JobSkill(models.Model):
         ('nice_to_have', 'Nice to Have'),
     ])
     min_proficiency = models.CharField(max_length=20, choices=UserSkill.PROFICIENCY_LEVELS)
+
+    class Meta:
+        indexes = [
+            # Covering indexes: a job's skill ids, and the jobs requiring a skill
+            models.Index(fields=['job', 'skill']),
+            models.Index(fields=['skill', 'job']),
+        ]
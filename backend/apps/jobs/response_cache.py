@@ -0,0 +1,72 @@
+# response_cache.py
+# Cached, conditional responses for the job endpoints
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
+
+# Part of every cache key; bumping it retires every cached job response at once,
+# in this process and in any other worker sharing the cache
+GENERATION_KEY = 'jobs:response_generation'
+
+
+def generation() -> int:
+    value = cache.get(GENERATION_KEY)
+    if value is None:
+        # A fresh, never-before-used generation in case the key was evicted
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        value = cache.get(GENERATION_KEY)
+    return value
+
+
+def invalidate():
+    """Drop every cached job response"""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, time.time_ns(), None)
+
+
+def response_key(name: str, *parts) -> str:
+    """Cache key of one endpoint's response for some request parameters"""
+    digest = hashlib.sha256('\0'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'jobs:response:{generation()}:{name}:{digest}'
+
+
+def cached_response(request, key: str, build) -> HttpResponse:
+    """
+    Serve a JSON response from the cache, or build and cache it
+
+    Args:
+        request: Incoming GET request; If-None-Match and If-Modified-Since
+            are answered with 304 Not Modified
+        key: Cache key from response_key()
+        build: Called on a miss; returns (data, last_modified) where
+            last_modified is a datetime or None. It must read from the
+            primary database: invalidate() runs as soon as the primary
+            commits, before replicas necessarily have the change
+
+    Returns:
+        A 200 response with the cached bytes, or a 304
+    """
+    entry = cache.get(key)
+    if entry is None:
+        data, last_modified = build()
+        body = JSONRenderer().render(data)
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        entry = (body, etag, int(last_modified.timestamp()) if last_modified else None)
+        cache.set(key, entry, getattr(settings, 'JOB_RESPONSE_CACHE_TIMEOUT', 300))
+
+    body, etag, last_modified = entry
+    response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    # Clients may keep the response but must revalidate it before reuse
+    patch_cache_control(response, private=True, no_cache=True)
+    return get_conditional_response(request, etag=etag, last_modified=last_modified, response=response)
@@ -0,0 +1,75 @@
+# search.py
+# Full-text search over job postings
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+# FTS5 table kept in sync with jobs_job and users_employerprofile by triggers
+# (see migration 0003_job_search_index)
+FTS_TABLE = 'jobs_job_fts'
+
+# BM25 weights for the title, description, location and company_name columns
+FTS_WEIGHTS = (10.0, 1.0, 5.0, 5.0)
+
+# PostgreSQL: weighted tsvector column of jobs_job, GIN-indexed and kept in
+# sync by triggers (see migration 0006_job_search_vector), and the text search
+# configuration it was built with
+SEARCH_VECTOR_COLUMN = 'search_vector'
+SEARCH_CONFIG = 'english'
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 query matching every word as a prefix
+
+    Quoting each word keeps characters such as quotes, '-' or ':' in user
+    input from being read as FTS5 syntax.
+    """
+    return ' '.join(f'"{word}"*' for word in _WORD_RE.findall(query.lower()))
+
+
+def search_jobs(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Narrow a Job queryset to full-text matches of query, best match first
+
+    Uses the FTS5 index and BM25 on SQLite and the indexed search_vector
+    column with ts_rank on PostgreSQL; other databases fall back to
+    substring matching.
+    """
+    if not _WORD_RE.search(query or ''):
+        return queryset.none()
+
+    if connection.vendor == 'sqlite':
+        weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+        # Matches are found through the index; bm25() is then computed for those rows only
+        matches = RawSQL(
+            f'jobs_job.rowid IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)',
+            [fts_query(query)], output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f'SELECT bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = jobs_job.rowid',
+            [fts_query(query)], output_field=FloatField(),
+        )
+        return queryset.filter(matches).annotate(rank=rank).order_by('rank')
+
+    if connection.vendor == 'postgresql':
+        search_query = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+        matches = RawSQL(f'jobs_job.{SEARCH_VECTOR_COLUMN} @@ {search_query}', [query],
+                         output_field=BooleanField())
+        rank = RawSQL(f'ts_rank(jobs_job.{SEARCH_VECTOR_COLUMN}, {search_query})', [query],
+                      output_field=FloatField())
+        return queryset.filter(matches).annotate(rank=rank).order_by('-rank')
+
+    words = _WORD_RE.findall(query)
+    condition = Q()
+    for word in words:
+        condition &= (
+            Q(title__icontains=word) | Q(description__icontains=word)
+            | Q(location__icontains=word) | Q(employer__company_name__icontains=word)
+        )
+    return queryset.filter(condition).order_by('-created_at')
@@ -1,54 +1,48 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
 from .models import Job
-from backend.apps.users.models import JobSeekerProfile
+from . import response_cache
+from backend.apps.users.models import EmployerProfile
+from backend.services.job_matcher import seeker_locations
+from backend.services.job_notifier import notify_new_job
+from backend.services.job_requirements import refresh_job_requirements, sync_job_skills
+
+@receiver(pre_save, sender=Job)
+def job_requirements_handler(sender, instance, **kwargs):
+    # Re-extract skills only when the description changed
+    instance._requirements_changed = refresh_job_requirements(instance)
+
+@receiver(post_save, sender=Job)
+def job_skills_handler(sender, instance, **kwargs):
+    if getattr(instance, '_requirements_changed', False):
+        sync_job_skills(instance)
 
 @receiver(post_save, sender=Job)
 def job_created_handler(sender, instance, created, **kwargs):
     if created:  # Only for new jobs
-        # Get all job seekers
-        job_seekers = JobSeekerProfile.objects.all()
-        channel_layer = get_channel_layer()
-        
-        for seeker in job_seekers:
-            # Calculate match score (simplified logic)
-            match_score = calculate_job_match(seeker, instance)
-            
-            # Only send to users with good match (>60%)
-            if match_score > 60:
-                # Send to user's WebSocket group
-                async_to_sync(channel_layer.group_send)(
-                    f'user_{seeker.user.id}',
-                    {
-                        'type': 'job_update',
-                        'job_data': {
-                            'id': instance.id,
-                            'title': instance.title,
-                            'company': instance.employer.company_name if instance.employer else 'Unknown Company',
-                            'location': instance.location,
-                            'salary_range': f"${instance.salary_min:,} - ${instance.salary_max:,}" if instance.salary_min and instance.salary_max else 'Not specified',
-                            'job_type': instance.job_type,
-                            'posted_date': instance.created_at.isoformat(),
-                            'description': instance.description[:200] + '...' if len(instance.description) > 200 else instance.description,
-                        },
-                        'match_score': match_score
-                    }
-                )
+        # Match and notify job seekers in the background once the job is committed
+        notify_new_job(instance)
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=EmployerProfile)  # Job responses include the company name
+def job_responses_handler(sender, **kwargs):
+    # Not before the commit, or a concurrent request could cache the old data again
+    transaction.on_commit(response_cache.invalidate)
 
 def calculate_job_match(seeker, job):
     """
     Calculate match score between job seeker and job
-    This is a simplified version - you can enhance this with more sophisticated matching logic
+    This is the reference version of the scoring; SeekerMatrix in
+    backend/services/job_matcher.py computes the same scores for all seekers at once
     """
     score = 0
     
     # Location match (30% weight)
-    if hasattr(seeker, 'preferred_location') and seeker.preferred_location and job.location:
-        if seeker.preferred_location.lower() in job.location.lower():
-            score += 30
-        elif seeker.preferred_location.lower() == job.location.lower():
+    locations = seeker_locations(getattr(seeker, 'current_location', ''), getattr(seeker, 'preferred_locations', None))
+    if locations and job.location:
+        if any(location in job.location.lower() for location in locations):
             score += 30
     
     # Skills match (40% weight)
@@ -61,9 +55,11 @@ def calculate_job_match(seeker, job):
     
     # Experience level match (20% weight)
     if hasattr(seeker, 'experience_level') and seeker.experience_level and job.experience_required:
+        levels = [level for level, _ in Job.EXPERIENCE_LEVELS]
         if seeker.experience_level == job.experience_required:
             score += 20
-        elif abs(seeker.experience_level - job.experience_required) <= 1:
+        elif (seeker.experience_level in levels and job.experience_required in levels
+              and abs(levels.index(seeker.experience_level) - levels.index(job.experience_required)) <= 1):
             score += 15
     
     # Job type preference (10% weight)
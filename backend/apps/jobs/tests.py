@@ -0,0 +1,316 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from backend.apps.jobs.models import Job
+from backend.apps.jobs.views import EXPORT_JOB_FIELDS
+from backend.apps.matching.tests import use_temporary_storage
+from backend.apps.users.models import CustomUser, EmployerProfile
+from backend.utils.database import ReplicaReadsMiddleware, ReplicaRouter
+
+
+def create_employer(username='employer', company_name='Acme'):
+    user = CustomUser.objects.create(username=username, email=f'{username}@example.com', user_type='employer')
+    return EmployerProfile.objects.create(user=user, company_name=company_name, company_description='Widgets',
+                                          industry='Manufacturing', location='Berlin')
+
+
+def create_jobs(employer, count, **fields):
+    return Job.objects.bulk_create([
+        Job(employer=employer, title=f'Job {number}', description='Build things', job_type='full_time',
+            experience_required='mid', location='Berlin', expires_at=timezone.now() + timedelta(days=30), **fields)
+        for number in range(count)
+    ])
+
+
+@override_settings(MATCHING_CONCURRENCY=0, JOB_NOTIFICATION_CONCURRENCY=0)
+class JobListPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = create_employer()
+        jobs = create_jobs(employer, 23)
+        create_jobs(employer, 2, is_active=False)
+        # Plenty of ties on created_at, which only the id can break
+        now = timezone.now()
+        for number, job in enumerate(jobs):
+            Job.objects.filter(id=job.id).update(created_at=now - timedelta(minutes=number // 5))
+        cls.expected = [
+            str(job_id) for job_id in
+            Job.objects.filter(is_active=True).order_by('-created_at', '-id').values_list('id', flat=True)
+        ]
+        cls.user = employer.user
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        for query in queries.captured_queries:
+            self.assertNotIn('OFFSET', query['sql'].upper())
+        return response.json()
+
+    def test_pages_walk_every_job_once_in_both_directions(self):
+        pages = []
+        data = self.get('/api/jobs/list/?page_size=4&fields=id')
+        self.assertIsNone(data['previous'])
+        pages.append([job['id'] for job in data['jobs']])
+        while data['next']:
+            data = self.get(data['next'])
+            pages.append([job['id'] for job in data['jobs']])
+        self.assertEqual([job_id for page in pages for job_id in page], self.expected)
+        self.assertEqual([len(page) for page in pages], [4, 4, 4, 4, 4, 3])
+
+        backwards = []
+        while data['previous']:
+            data = self.get(data['previous'])
+            backwards.append([job['id'] for job in data['jobs']])
+        self.assertEqual(backwards, pages[-2::-1])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/api/jobs/list/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(MATCHING_CONCURRENCY=0, JOB_NOTIFICATION_CONCURRENCY=0)
+class JobResponseCacheTests(TestCase):
+    """Cached job responses must be dropped by every change that shows up in them"""
+
+    def setUp(self):
+        use_temporary_storage(self)
+        cache.clear()
+        self.employer = create_employer()
+        self.job = create_jobs(self.employer, 1)[0]
+        self.client = APIClient()
+        self.client.force_authenticate(self.employer.user)
+        self.job_url = f'/api/jobs/{self.job.id}/'
+
+    def get(self, url, **headers):
+        response = self.client.get(url, **headers)
+        self.assertIn(response.status_code, (200, 304), response.content)
+        return response
+
+    def test_responses_are_served_from_the_cache(self):
+        for url in (self.job_url, '/api/jobs/list/'):
+            first = self.get(url)
+            with self.assertNumQueries(0):
+                second = self.get(url)
+            self.assertEqual(second.content, first.content)
+
+    def test_job_save_invalidates(self):
+        self.get(self.job_url)
+        self.get('/api/jobs/list/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.title = 'Renamed'
+            self.job.save()
+        self.assertEqual(self.get(self.job_url).json()['job']['title'], 'Renamed')
+        self.assertEqual(self.get('/api/jobs/list/').json()['jobs'][0]['title'], 'Renamed')
+
+    def test_job_delete_invalidates(self):
+        self.get(self.job_url)
+        self.get('/api/jobs/list/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.delete()
+        # get_job has always answered a missing job with its generic 400
+        self.assertEqual(self.client.get(self.job_url).status_code, 400)
+        self.assertEqual(self.get('/api/jobs/list/').json()['jobs'], [])
+
+    def test_employer_save_invalidates(self):
+        self.get(self.job_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employer.company_name = 'Renamed Inc'
+            self.employer.save()
+        self.assertEqual(self.get(self.job_url).json()['job']['company'], 'Renamed Inc')
+
+    def test_conditional_get(self):
+        etag = self.get(self.job_url)['ETag']
+        not_modified = self.get(self.job_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.title = 'Renamed'
+            self.job.save()
+        changed = self.get(self.job_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+
+
+@mock.patch('backend.utils.database.replica_aliases', return_value=['replica_1'])
+class ReplicaRoutingTests(TestCase):
+
+    def route(self, method, *operations):
+        """
+        Database chosen for each operation of a request: 'read', 'write', or
+        a model instance whose related rows are read
+        """
+        router, chosen = ReplicaRouter(), []
+
+        def get_response(request):
+            for operation in operations:
+                if operation == 'write':
+                    chosen.append(router.db_for_write(Job))
+                elif operation == 'read':
+                    chosen.append(router.db_for_read(Job))
+                else:
+                    chosen.append(router.db_for_read(Job, instance=operation))
+            return HttpResponse()
+
+        ReplicaReadsMiddleware(get_response)(RequestFactory().generic(method, '/'))
+        return chosen
+
+    def test_get_reads_from_a_replica(self, replica_aliases):
+        self.assertEqual(self.route('GET', 'read', 'read'), ['replica_1', 'replica_1'])
+
+    def test_write_moves_the_rest_of_the_request_to_the_primary(self, replica_aliases):
+        self.assertEqual(self.route('GET', 'read', 'write', 'read'), ['replica_1', 'default', 'default'])
+        # The next request starts over
+        self.assertEqual(self.route('GET', 'read'), ['replica_1'])
+
+    def test_unsafe_methods_use_the_primary(self, replica_aliases):
+        self.assertEqual(self.route('POST', 'read'), ['default'])
+
+    def test_outside_requests_use_the_primary(self, replica_aliases):
+        self.assertEqual(ReplicaRouter().db_for_read(Job), 'default')
+
+    def test_related_rows_follow_their_instance(self, replica_aliases):
+        job = Job(title='Pinned')
+        job._state.db = 'default'
+        self.assertEqual(self.route('GET', job, 'read'), ['default', 'replica_1'])
+
+    @override_settings(MATCHING_CONCURRENCY=0, JOB_NOTIFICATION_CONCURRENCY=0,
+                       DATABASE_ROUTERS=['backend.utils.database.ReplicaRouter'],
+                       MIDDLEWARE=['backend.utils.database.ReplicaReadsMiddleware'] + settings.MIDDLEWARE)
+    def test_cached_job_responses_are_built_from_the_primary(self, replica_aliases):
+        # replica_1 isn't a configured database, so any read routed to it fails
+        cache.clear()
+        employer = create_employer()
+        job = create_jobs(employer, 1)[0]
+        client = APIClient()
+        client.force_authenticate(employer.user)
+        for url in (f'/api/jobs/{job.id}/', '/api/jobs/list/'):
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+
+
+@override_settings(MATCHING_CONCURRENCY=0, JOB_NOTIFICATION_CONCURRENCY=0)
+class JobSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = create_employer(company_name='Globex')
+        expires_at = timezone.now() + timedelta(days=30)
+
+        def job(title, description, **fields):
+            defaults = {'job_type': 'full_time', 'experience_required': 'mid', 'location': 'Berlin',
+                        'salary_min': Decimal('50000'), 'salary_max': Decimal('70000')}
+            defaults.update(fields)
+            return Job.objects.create(employer=employer, title=title, description=description,
+                                      expires_at=expires_at, **defaults)
+
+        cls.title_match = job('Python Developer', 'Build services')
+        cls.description_match = job('Backend Engineer', 'Mostly python, some Go')
+        cls.remote_senior = job('Senior Python Engineer', 'Lead the team', experience_required='senior',
+                                is_remote=True, salary_min=Decimal('90000'), salary_max=Decimal('120000'))
+        cls.unrelated = job('Accountant', 'Balance the books')
+        job('Python Contractor', 'Closed posting', is_active=False)
+        cls.user = employer.user
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def search(self, expected_status=200, **params):
+        response = self.client.get('/api/jobs/search/', params)
+        self.assertEqual(response.status_code, expected_status, response.content)
+        return response.json()
+
+    def titles(self, **params):
+        return [job['title'] for job in self.search(**params)['jobs']]
+
+    def test_title_matches_rank_above_description_matches(self):
+        data = self.search(q='python')
+        self.assertEqual(data['count'], 3)
+        titles = [job['title'] for job in data['jobs']]
+        self.assertEqual(titles[-1], 'Backend Engineer')
+        self.assertEqual(set(titles[:2]), {'Python Developer', 'Senior Python Engineer'})
+
+    def test_every_word_must_match_as_a_prefix(self):
+        self.assertEqual(self.titles(q='pyth engin'), ['Senior Python Engineer', 'Backend Engineer'])
+        self.assertEqual(self.titles(q='accountant python'), [])
+
+    def test_company_name_is_searched(self):
+        self.assertEqual(len(self.titles(q='globex')), 4)
+
+    def test_filters(self):
+        self.assertEqual(self.titles(q='python', experience_required='senior'), ['Senior Python Engineer'])
+        self.assertEqual(self.titles(q='python', is_remote='true'), ['Senior Python Engineer'])
+        self.assertEqual(self.titles(q='python', salary_min='100000'), ['Senior Python Engineer'])
+        self.assertNotIn('Senior Python Engineer', self.titles(q='python', salary_max='80000'))
+        self.assertEqual(self.titles(q='python', job_type='part_time'), [])
+
+    def test_punctuation_is_not_query_syntax(self):
+        self.assertEqual(self.titles(q='"python" -developer: (build*'), ['Python Developer'])
+        self.assertEqual(self.search(q='-- "" ::')['jobs'], [])
+
+    def test_missing_query_is_rejected(self):
+        self.assertEqual(self.search(400, q='  ')['error'], 'q is required')
+
+    def test_invalid_salaries_are_rejected(self):
+        for value in ('lots', 'NaN', 'Infinity', '-inf'):
+            self.assertIn('must be numbers', self.search(400, q='python', salary_min=value)['error'])
+            self.assertIn('must be numbers', self.search(400, q='python', salary_max=value)['error'])
+
+
+@override_settings(MATCHING_CONCURRENCY=0, JOB_NOTIFICATION_CONCURRENCY=0)
+class JobExportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = create_employer()
+        cls.jobs = create_jobs(cls.employer, 3)
+        create_jobs(create_employer('other', 'Initech'), 2)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.employer.user)
+
+    def export(self, **params):
+        response = self.client.get('/api/jobs/export/', params)
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_ndjson_has_one_object_per_own_job(self):
+        response, body = self.export()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="jobs.ndjson"')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(sorted(row['id'] for row in rows), sorted(str(job.id) for job in self.jobs))
+        self.assertEqual(set(rows[0]), set(EXPORT_JOB_FIELDS))
+
+    def test_csv_has_a_header_and_one_row_per_own_job(self):
+        response, body = self.export(output='csv')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0], list(EXPORT_JOB_FIELDS))
+        self.assertEqual(sorted(row[0] for row in rows[1:]), sorted(str(job.id) for job in self.jobs))
+
+    def test_unsupported_output_is_rejected(self):
+        response = self.client.get('/api/jobs/export/', {'output': 'xml'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Unsupported export format', response.json()['error'])
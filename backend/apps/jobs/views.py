@@ -1,29 +1,66 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import PageNumberPagination
 from django.shortcuts import get_object_or_404
+from decimal import Decimal, InvalidOperation
 from .models import Job
+from . import response_cache, search
 from backend.apps.users.models import EmployerProfile
+from backend.utils.export import streaming_export
+from backend.utils.pagination import KeysetPagination
 from django.contrib.auth.models import User
 
 class JobDataSerializer:
-    """Simple serializer for Job model"""
-    
+    # Output field -> (model columns it reads, how to compute it)
+    FIELDS = {
+        'id': (('id',), lambda job: str(job.id)),
+        'title': (('title',), lambda job: job.title),
+        'company': (('employer__company_name',),
+                    lambda job: job.employer.company_name if job.employer else 'Unknown Company'),
+        'location': (('location',), lambda job: job.location),
+        'salary_range': (('salary_min', 'salary_max'),
+                         lambda job: f"${job.salary_min:,} - ${job.salary_max:,}" if job.salary_min and job.salary_max else 'Not specified'),
+        'job_type': (('job_type',), lambda job: job.job_type),
+        'posted_date': (('created_at',), lambda job: job.created_at.isoformat()),
+        'description': (('description',),
+                        lambda job: job.description[:200] + '...' if len(job.description) > 200 else job.description),
+        'experience_required': (('experience_required',), lambda job: job.experience_required),
+        'is_remote': (('is_remote',), lambda job: job.is_remote),
+        'status': (('is_active',), lambda job: 'active' if job.is_active else 'inactive'),
+    }
+
     @staticmethod
-    def to_dict(job):
-        return {
-            'id': str(job.id),
-            'title': job.title,
-            'company': job.employer.company_name if job.employer else 'Unknown Company',
-            'location': job.location,
-            'salary_range': f"${job.salary_min:,} - ${job.salary_max:,}" if job.salary_min and job.salary_max else 'Not specified',
-            'job_type': job.job_type,
-            'posted_date': job.created_at.isoformat(),
-            'description': job.description[:200] + '...' if len(job.description) > 200 else job.description,
-            'experience_required': job.experience_required,
-            'is_remote': job.is_remote,
-            'status': 'active' if job.is_active else 'inactive'
-        }
+    def to_dict(job, fields=None):
+        return {name: JobDataSerializer.FIELDS[name][1](job) for name in fields or JobDataSerializer.FIELDS}
+
+    @staticmethod
+    def parse_fields(value):
+        """Output fields named in a comma-separated fields= parameter, or None for all of them"""
+        if not value:
+            return None
+        fields = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in fields if name not in JobDataSerializer.FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return fields
+
+    @staticmethod
+    def columns(fields):
+        """Model columns to load for some output fields"""
+        return {column for name in fields for column in JobDataSerializer.FIELDS[name][0]}
+
+# Columns of a job export
+EXPORT_JOB_FIELDS = (
+    'id', 'title', 'job_type', 'experience_required', 'min_years_experience',
+    'location', 'is_remote', 'salary_min', 'salary_max', 'salary_currency',
+    'is_active', 'applications_count', 'views_count', 'created_at', 'updated_at', 'expires_at',
+)
+
+class JobListPagination(KeysetPagination):
+    # Seeks on (created_at, id) instead of counting an OFFSET, so every page
+    # costs the same however deep it is; page_size defaults to PAGE_SIZE
+    ordering = ('-created_at', '-id')
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
@@ -73,15 +110,100 @@ def create_job(request):
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def list_jobs(request):
-    """List all active jobs"""
+    """
+    List active jobs, newest first, one cursor page at a time
+
+    Query parameters: cursor, page_size and fields (comma-separated output
+    fields, e.g. fields=id,title,company).
+    """
+    def build():
+        fields = JobDataSerializer.parse_fields(request.query_params.get('fields'))
+        # From the primary, so a lagging replica's rows can't be cached as current
+        jobs = Job.objects.using('default').filter(is_active=True)
+        if fields is None or 'company' in fields:
+            jobs = jobs.select_related('employer')
+        if fields is not None:
+            # The cursor is built from the ordering columns, so always load them
+            jobs = jobs.only(*JobDataSerializer.columns(fields) | {'id', 'created_at'})
+
+        paginator = JobListPagination()
+        page = paginator.paginate_queryset(jobs, request)
+        # No Last-Modified: a page also changes when one of its jobs is removed
+        return {
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'jobs': [JobDataSerializer.to_dict(job, fields) for job in page]
+        }, None
+
     try:
-        jobs = Job.objects.filter(is_active=True).order_by('-created_at')
-        jobs_data = [JobDataSerializer.to_dict(job) for job in jobs]
+        key = response_cache.response_key(
+            # Page links are absolute URLs, so the host is part of the key
+            'list', request.get_host(), sorted(request.query_params.lists())
+        )
+        return response_cache.cached_response(request, key, build)
         
+    except Exception as e:
+        return Response({
+            'error': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+def parse_amount(value):
+    """A finite Decimal from a query parameter; raises InvalidOperation otherwise"""
+    amount = Decimal(value)
+    if not amount.is_finite():  # NaN and Infinity parse, but can't be compared to a salary
+        raise InvalidOperation(value)
+    return amount
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def search_jobs(request):
+    """
+    Full-text search over active jobs, best match first
+
+    Query parameters: q (required), job_type, experience_required,
+    is_remote, salary_min, salary_max and page.
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        jobs = Job.objects.filter(is_active=True).select_related('employer')
+        params = request.query_params
+        if params.get('job_type'):
+            jobs = jobs.filter(job_type=params['job_type'])
+        if params.get('experience_required'):
+            jobs = jobs.filter(experience_required=params['experience_required'])
+        if params.get('is_remote'):
+            jobs = jobs.filter(is_remote=params['is_remote'].lower() in ('1', 'true', 'yes'))
+        # Keep jobs whose salary range overlaps the requested one
+        if params.get('salary_min'):
+            jobs = jobs.filter(salary_max__gte=parse_amount(params['salary_min']))
+        if params.get('salary_max'):
+            jobs = jobs.filter(salary_min__lte=parse_amount(params['salary_max']))
+
+        paginator = PageNumberPagination()
+        page = paginator.paginate_queryset(search.search_jobs(jobs, query), request)
         return Response({
-            'jobs': jobs_data
+            'count': paginator.page.paginator.count,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'jobs': [JobDataSerializer.to_dict(job) for job in page]
         }, status=status.HTTP_200_OK)
-        
+
+    except InvalidOperation:
+        return Response({'error': 'salary_min and salary_max must be numbers'}, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def export_jobs(request):
+    """
+    Stream every posting of the current employer as NDJSON, or CSV with ?output=csv
+    """
+    try:
+        jobs = Job.objects.filter(employer__user=request.user).order_by('created_at', 'id')
+        return streaming_export(jobs, EXPORT_JOB_FIELDS, 'jobs', request.query_params.get('output', 'ndjson'))
+
     except Exception as e:
         return Response({
             'error': str(e)
@@ -91,13 +213,13 @@ def list_jobs(request):
 @permission_classes([permissions.IsAuthenticated])
 def get_job(request, job_id):
     """Get a specific job by ID"""
+    def build():
+        # From the primary, so a lagging replica's row can't be cached as current
+        job = get_object_or_404(Job.objects.using('default').select_related('employer'), id=job_id)
+        return {'job': JobDataSerializer.to_dict(job)}, job.updated_at
+
     try:
-        job = get_object_or_404(Job, id=job_id)
-        job_data = JobDataSerializer.to_dict(job)
-        
-        return Response({
-            'job': job_data
-        }, status=status.HTTP_200_OK)
+        return response_cache.cached_response(request, response_cache.response_key('job', job_id), build)
         
     except Exception as e:
         return Response({
@@ -0,0 +1,68 @@
+import itertools
+import random
+import shutil
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from backend.services.ml_pipeline import TfidfIndex
+from backend.services.skill_extractor import DEFAULT_SKILL_KEYWORDS
+
+
+def synthetic_vocabulary(size, seed=0):
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    words = {''.join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(size)}
+    return list(DEFAULT_SKILL_KEYWORDS) + sorted(words)
+
+
+def synthetic_documents(count, vocabulary, words_per_doc=250, seed=1):
+    """Documents with Zipf-distributed words, like real job descriptions"""
+    rng = random.Random(seed)
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+    for number in range(count):
+        yield f'{number:036d}', ' '.join(rng.choices(vocabulary, cum_weights=cum_weights, k=words_per_doc))
+
+
+class Command(BaseCommand):
+    help = 'Benchmark TF-IDF index build and query latency on synthetic job descriptions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--docs', type=int, nargs='+', default=[10_000, 100_000],
+                            help='Index sizes to benchmark')
+        parser.add_argument('--queries', type=int, default=200,
+                            help='Queries per measurement')
+        parser.add_argument('--vocabulary', type=int, default=20_000,
+                            help='Distinct words in the synthetic corpus')
+
+    def handle(self, *args, **options):
+        vocabulary = synthetic_vocabulary(options['vocabulary'])
+        queries = [text for _, text in synthetic_documents(options['queries'], vocabulary, seed=2)]
+
+        for count in options['docs']:
+            directory = tempfile.mkdtemp(prefix='tfidf-bench-')
+            try:
+                index = TfidfIndex(directory)
+                started = time.perf_counter()
+                index.rebuild(synthetic_documents(count, vocabulary))
+                build_s = time.perf_counter() - started
+
+                started = time.perf_counter()
+                index.add(synthetic_documents(100, vocabulary, seed=3))
+                add_ms = (time.perf_counter() - started) * 1000
+
+                latencies = []
+                for text in queries:
+                    started = time.perf_counter()
+                    index.query(text, k=10)
+                    latencies.append((time.perf_counter() - started) * 1000)
+                latencies.sort()
+
+                self.stdout.write(
+                    f'{count:>8} docs: built in {build_s:.1f}s, 100 incremental adds in {add_ms:.0f} ms, '
+                    f'query p50 {latencies[len(latencies) // 2]:.2f} ms, '
+                    f'p95 {latencies[int(len(latencies) * 0.95)]:.2f} ms'
+                )
+            finally:
+                shutil.rmtree(directory, ignore_errors=True)
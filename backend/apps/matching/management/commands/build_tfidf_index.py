@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from backend.apps.jobs.models import Job
+from backend.services import ml_pipeline
+from backend.utils.pagination import keyset_chunks
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the job text similarity index from every active job'
+
+    def handle(self, *args, **options):
+        index = ml_pipeline.get_index('jobs')
+        chunks = keyset_chunks(Job.objects.filter(is_active=True), ['id', 'title', 'description'], key='id')
+        index.rebuild(
+            (str(job_id), ml_pipeline.job_text(title, description))
+            for chunk in chunks for job_id, title, description in chunk
+        )
+        self.stdout.write(f'Indexed {len(index)} jobs in {index.directory}')
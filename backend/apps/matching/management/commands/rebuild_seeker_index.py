@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from backend.apps.users.models import JobSeekerProfile
+from backend.services.seeker_index import index_seekers
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the skill and location postings of every job seeker'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Profiles indexed per batch')
+
+    def handle(self, *args, **options):
+        profiles = JobSeekerProfile.objects.only(
+            'id', 'extracted_skills', 'current_location', 'preferred_locations'
+        ).order_by('id')
+
+        batch = []
+        indexed = 0
+        for profile in profiles.iterator(chunk_size=options['batch_size']):
+            batch.append(profile)
+            if len(batch) >= options['batch_size']:
+                index_seekers(batch)
+                indexed += len(batch)
+                batch = []
+        index_seekers(batch)
+        indexed += len(batch)
+
+        self.stdout.write(f'Indexed {indexed} job seekers')
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('skills', '0002_seed_default_taxonomy'),
+        ('users', '0004_jobseekerprofile_preferred_job_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeekerSkillPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.jobseekerprofile')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='skills.skill')),
+            ],
+            options={
+                'unique_together': {('skill', 'profile')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SeekerLocationPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location', models.CharField(max_length=100)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.jobseekerprofile')),
+            ],
+            options={
+                'unique_together': {('location', 'profile')},
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:06
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_description_hash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('matching', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.IntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='jobs.job')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-score', 'id'], name='matching_jo_user_id_66a9b0_idx')],
+                'unique_together': {('user', 'job')},
+            },
+        ),
+    ]
@@ -0,0 +1,68 @@
+from django.db import migrations, models
+
+# Frozen copy of the posting rules of backend/services/seeker_index.py at the
+# time of this migration
+POSTING_KEY_LENGTH = 100
+
+
+def seeker_postings(profile):
+    """Skill and location keys a profile was indexed under"""
+    skills = {skill.lower()[:POSTING_KEY_LENGTH] for skill in profile.extracted_skills or []}
+    locations = [profile.current_location] + list(profile.preferred_locations or [])
+    locations = {
+        location.lower()[:POSTING_KEY_LENGTH]
+        for location in locations if isinstance(location, str) and location.strip()
+    }
+    return skills, locations
+
+
+def clear_skill_postings(apps, schema_editor):
+    apps.get_model('matching', 'SeekerSkillPosting').objects.all().delete()
+
+
+def rebuild_postings(apps, schema_editor):
+    JobSeekerProfile = apps.get_model('users', 'JobSeekerProfile')
+    SeekerSkillPosting = apps.get_model('matching', 'SeekerSkillPosting')
+    SeekerLocationPosting = apps.get_model('matching', 'SeekerLocationPosting')
+
+    # Location keys are no longer whitespace-collapsed
+    SeekerLocationPosting.objects.all().delete()
+    profiles = JobSeekerProfile.objects.only('id', 'extracted_skills', 'current_location', 'preferred_locations')
+    for profile in profiles.iterator(chunk_size=1000):
+        skills, locations = seeker_postings(profile)
+        SeekerSkillPosting.objects.bulk_create(
+            [SeekerSkillPosting(profile_id=profile.id, skill=skill) for skill in skills]
+        )
+        SeekerLocationPosting.objects.bulk_create(
+            [SeekerLocationPosting(profile_id=profile.id, location=location) for location in locations]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0002_jobmatch'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_skill_postings, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='seekerskillposting',
+            unique_together=set(),
+        ),
+        migrations.RemoveField(
+            model_name='seekerskillposting',
+            name='skill',
+        ),
+        migrations.AddField(
+            model_name='seekerskillposting',
+            name='skill',
+            field=models.CharField(default='', max_length=100),
+            preserve_default=False,
+        ),
+        migrations.AlterUniqueTogether(
+            name='seekerskillposting',
+            unique_together={('skill', 'profile')},
+        ),
+        migrations.RunPython(rebuild_postings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:53
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0003_name_keyed_postings'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='seekerlocationposting',
+            index=models.Index(django.db.models.functions.text.Length('location'), name='matching_location_length_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import models
+from django.db.models.functions import Length
+from backend.apps.users.models import CustomUser, JobSeekerProfile
+from backend.apps.jobs.models import Job
+
+class SeekerSkillPosting(models.Model):
+    """Inverted index entry: a job seeker who has a skill"""
+    skill = models.CharField(max_length=100)  # Lowercased, as in extracted_skills
+    profile = models.ForeignKey(JobSeekerProfile, on_delete=models.CASCADE)
+
+    class Meta:
+        unique_together = ['skill', 'profile']
+
+class SeekerLocationPosting(models.Model):
+    """Inverted index entry: a job seeker who wants to work in a location"""
+    location = models.CharField(max_length=100)  # Lowercased
+    profile = models.ForeignKey(JobSeekerProfile, on_delete=models.CASCADE)
+
+    class Meta:
+        unique_together = ['location', 'profile']
+        indexes = [
+            # Longest location, which bounds the keys a job location is looked up under
+            models.Index(Length('location'), name='matching_location_length_idx'),
+        ]
+
+class JobMatch(models.Model):
+    """One of a job seeker's top-scoring active jobs (see MATCHING_TOP_K)"""
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE)
+    score = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['user', 'job']
+        indexes = [
+            models.Index(fields=['user', '-score', 'id']),
+        ]
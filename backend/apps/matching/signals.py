@@ -0,0 +1,71 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from backend.apps.jobs.models import Job
+from backend.apps.matching.models import JobMatch
+from backend.apps.users.models import JobSeekerProfile
+from backend.services import match_store, ml_pipeline
+from backend.services.job_matcher import SEEKER_FIELDS
+from backend.services.seeker_index import index_seekers
+
+@receiver(pre_save, sender=JobSeekerProfile)
+def seeker_matching_fields_handler(sender, instance, **kwargs):
+    # Note whether anything the matcher reads is about to change
+    previous = None
+    if instance.pk:
+        previous = JobSeekerProfile.objects.filter(pk=instance.pk).values_list(*SEEKER_FIELDS).first()
+    instance._matching_changed = previous != tuple(getattr(instance, field) for field in SEEKER_FIELDS)
+
+@receiver(post_save, sender=JobSeekerProfile)
+def seeker_postings_handler(sender, instance, **kwargs):
+    # Keep the seeker's skill and location postings in step with the profile
+    index_seekers([instance])
+
+@receiver(post_save, sender=JobSeekerProfile)
+def seeker_recommendations_handler(sender, instance, **kwargs):
+    if getattr(instance, '_matching_changed', True):
+        match_store.schedule(match_store.rescore_seekers, [instance.user_id])
+
+@receiver(pre_save, sender=Job)
+def job_matching_fields_handler(sender, instance, **kwargs):
+    # Note the stored state, to tell which recommendation lists and index entries need updating
+    fields = ('is_active', 'title') + match_store.JobRow._fields[1:]
+    previous = None
+    if instance.pk:
+        previous = Job.objects.filter(pk=instance.pk).values_list(*fields).first()
+    instance._was_active = previous is not None and previous[0]
+    instance._title_changed = previous is not None and previous[1] != instance.title
+    instance._matching_changed = previous is not None and previous[2:] != tuple(
+        getattr(instance, field) for field in fields[2:]
+    )
+
+@receiver(post_save, sender=Job)
+def job_recommendations_handler(sender, instance, created, **kwargs):
+    # New jobs are added when their notifications are sent
+    if created:
+        return
+    was_active = getattr(instance, '_was_active', instance.is_active)
+    if was_active and not instance.is_active:
+        match_store.schedule(match_store.remove_job, instance.id)
+    elif instance.is_active and not was_active:
+        match_store.schedule(match_store.add_job, instance.id)
+    elif instance.is_active and getattr(instance, '_matching_changed', False):
+        match_store.schedule(match_store.rescore_job, instance.id)
+
+@receiver(pre_delete, sender=Job)
+def job_matches_deleted_handler(sender, instance, **kwargs):
+    # The job's matches are deleted with it; refill the lists that held it
+    user_ids = list(JobMatch.objects.filter(job_id=instance.id).values_list('user_id', flat=True))
+    if user_ids:
+        match_store.schedule(match_store.remove_job, instance.id, user_ids)
+
+@receiver(post_save, sender=Job)
+def job_text_index_handler(sender, instance, created, **kwargs):
+    # Only new, (de)activated or retitled/rewritten active jobs change the text index
+    activation_changed = instance.is_active != getattr(instance, '_was_active', instance.is_active)
+    text_changed = getattr(instance, '_title_changed', False) or getattr(instance, '_requirements_changed', False)
+    if created or activation_changed or (instance.is_active and text_changed):
+        match_store.schedule(ml_pipeline.index_jobs, [instance.id])
+
+@receiver(post_delete, sender=Job)
+def job_deleted_handler(sender, instance, **kwargs):
+    match_store.schedule(ml_pipeline.index_jobs, [instance.id])
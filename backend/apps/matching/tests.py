@@ -0,0 +1,397 @@
+import asyncio
+import json
+import random
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from backend.apps.jobs.models import Job
+from backend.apps.jobs.signals import calculate_job_match
+from backend.apps.matching.models import JobMatch, SeekerLocationPosting
+from backend.apps.users.models import CustomUser, EmployerProfile, JobSeekerProfile
+from backend.services import match_store, ml_pipeline
+from backend.services.resume_parser import ResumeProcessor
+from backend.services.job_matcher import MATCH_THRESHOLD, SEEKER_FIELDS, SeekerMatrix
+from backend.services.seeker_index import (
+    NON_CANDIDATE_MAX_SCORE, candidate_profiles, location_keys, longest_location,
+)
+from websocket.routing import websocket_urlpatterns
+
+LONG_SKILL = 'distributed ' * 12
+SKILLS = ['Python', 'python', 'Django', 'React', 'AWS', 'Underwater Basket Weaving', 'go', LONG_SKILL.upper()]
+SEEKER_LOCATIONS = ['New York', 'new  york', 'NY', 'Remote', 'San Francisco, CA', 'york', 'Berlin', ' ', '']
+JOB_LOCATIONS = ['New York, NY (Remote)', 'Greater New  York area', 'San Francisco, CA', 'Berlin/Remote', 'Paris', '']
+LEVELS = [level for level, _ in Job.EXPERIENCE_LEVELS] + ['']
+JOB_TYPES = ['full_time', 'part_time', 'contract', '']
+
+
+def create_user(username, user_type='job_seeker'):
+    return CustomUser.objects.create(username=username, email=f'{username}@example.com', user_type=user_type)
+
+
+def create_seeker(username, **fields):
+    defaults = {
+        'first_name': 'Test', 'last_name': 'Seeker', 'title': 'Developer', 'experience_level': 'mid',
+        'current_location': '', 'preferred_locations': [], 'extracted_skills': [],
+    }
+    defaults.update(fields)
+    return JobSeekerProfile.objects.create(user=create_user(username), **defaults)
+
+
+def create_employer(username='employer'):
+    return EmployerProfile.objects.create(
+        user=create_user(username, 'employer'), company_name='Acme', company_description='Widgets',
+        industry='Manufacturing', location='Berlin',
+    )
+
+
+def use_temporary_storage(test):
+    """Point ML_INDEX_DIR and MEDIA_ROOT at a directory removed after the test"""
+    directory = tempfile.TemporaryDirectory()
+    test.addCleanup(directory.cleanup)
+    test.enterContext(override_settings(ML_INDEX_DIR=directory.name, MEDIA_ROOT=directory.name))
+    # Index handles are kept per process and would outlive the directory
+    test.enterContext(mock.patch.dict(ml_pipeline._indexes, clear=True))
+
+
+def job_with(**fields):
+    """Unsaved job carrying only the fields the matcher reads"""
+    defaults = {'extracted_skills': [], 'location': '', 'experience_required': '', 'job_type': ''}
+    defaults.update(fields)
+    return Job(**defaults)
+
+
+class CandidatePruningTests(TestCase):
+    """candidate_profiles() must never drop a seeker that brute-force scoring would keep"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(7)
+        for number in range(80):
+            create_seeker(
+                f'seeker{number}',
+                extracted_skills=rng.sample(SKILLS, rng.randint(0, 3)),
+                current_location=rng.choice(SEEKER_LOCATIONS),
+                preferred_locations=rng.sample(SEEKER_LOCATIONS, rng.randint(0, 2)),
+                experience_level=rng.choice(LEVELS),
+                preferred_job_type=rng.choice(JOB_TYPES),
+            )
+        cls.jobs = [
+            job_with(
+                extracted_skills=rng.sample(SKILLS, rng.randint(0, 4)),
+                location=rng.choice(JOB_LOCATIONS),
+                experience_required=rng.choice(LEVELS),
+                job_type=rng.choice(JOB_TYPES),
+            )
+            for _ in range(40)
+        ]
+
+    def test_candidates_cover_every_seeker_above_the_pruning_bound(self):
+        matrix = SeekerMatrix.from_database()
+        for job in self.jobs:
+            expected = dict(matrix.matches(job, NON_CANDIDATE_MAX_SCORE))
+            candidates = set(candidate_profiles(job).values_list('user_id', flat=True))
+            self.assertLessEqual(expected.keys(), candidates, job.__dict__)
+
+    def test_pruned_scores_equal_brute_force_scores(self):
+        matrix = SeekerMatrix.from_database()
+        for job in self.jobs:
+            pruned = SeekerMatrix(candidate_profiles(job).order_by('id').values_list(*SEEKER_FIELDS))
+            self.assertEqual(dict(pruned.matches(job, MATCH_THRESHOLD)), dict(matrix.matches(job, MATCH_THRESHOLD)))
+            self.assertEqual(
+                dict(pruned.matches(job, NON_CANDIDATE_MAX_SCORE)),
+                dict(matrix.matches(job, NON_CANDIDATE_MAX_SCORE)),
+            )
+
+    def test_matrix_scores_equal_reference_scores(self):
+        matrix = SeekerMatrix.from_database()
+        profiles = {profile.user_id: profile for profile in JobSeekerProfile.objects.all()}
+        for job in self.jobs:
+            scores = dict(zip(matrix.user_ids.tolist(), matrix.score(job).tolist()))
+            self.assertEqual(scores, {user_id: calculate_job_match(profile, job) for user_id, profile in profiles.items()})
+
+    def test_location_contained_in_job_location_makes_a_candidate(self):
+        seeker = create_seeker('located', current_location='York', experience_level='senior')
+        job = job_with(location='Greater New York Area', experience_required='senior', job_type='full_time')
+        self.assertIn(seeker, candidate_profiles(job))
+
+    def test_skill_without_a_skill_row_makes_a_candidate(self):
+        seeker = create_seeker('niche', extracted_skills=['Underwater Basket Weaving'])
+        job = job_with(extracted_skills=['underwater basket weaving'])
+        self.assertIn(seeker, candidate_profiles(job))
+
+    def test_postings_follow_profile_changes(self):
+        seeker = create_seeker('mover', current_location='Paris', extracted_skills=['Rust'])
+        seeker.current_location = 'Lisbon'
+        seeker.extracted_skills = ['Elixir']
+        seeker.save()
+        self.assertNotIn(seeker, candidate_profiles(job_with(location='Paris', extracted_skills=['rust'])))
+        self.assertIn(seeker, candidate_profiles(job_with(location='Lisbon, Portugal')))
+        self.assertIn(seeker, candidate_profiles(job_with(extracted_skills=['ELIXIR'])))
+
+    def test_location_lookup_is_bounded_by_the_longest_posting(self):
+        seeker = create_seeker('nearby', current_location='Porto')
+        job = job_with(location='Somewhere north of Porto, along the coast of a rather long country name' * 2)
+        longest = max(len(location) for location in SeekerLocationPosting.objects.values_list('location', flat=True))
+        self.assertEqual(longest_location(), longest)
+        self.assertEqual(max(len(key) for key in location_keys(job.location, longest)), longest)
+
+        with self.assertNumQueries(2):
+            candidates = candidate_profiles(job)
+        # Each query of the queryset carries only the location keys that matched
+        _, params = candidates.query.sql_with_params()
+        self.assertEqual([param for param in params if isinstance(param, str)], ['porto'])
+        self.assertIn(seeker, candidates)
+
+
+@override_settings(MATCHING_TOP_K=2, MATCHING_MIN_SCORE=30, MATCHING_CONCURRENCY=0, JOB_NOTIFICATION_CONCURRENCY=0)
+class TopKMaintenanceTests(TestCase):
+    """Stored recommendations must always equal each seeker's brute-force top K"""
+
+    def setUp(self):
+        use_temporary_storage(self)
+        self.employer = create_employer()
+        with self.captureOnCommitCallbacks(execute=True):
+            # Scores 60 on location, experience and job type without a single shared skill
+            self.local = create_seeker('local', current_location='Berlin', experience_level='senior',
+                                       preferred_job_type='full_time', extracted_skills=['Cobol'])
+            self.pythonista = create_seeker('pythonista', current_location='Remote', experience_level='mid',
+                                            extracted_skills=['Python', 'Django'])
+            self.frontend = create_seeker('frontend', current_location='Paris', experience_level='entry',
+                                          extracted_skills=['React'])
+
+    def create_job(self, description, **fields):
+        defaults = {
+            'employer': self.employer, 'title': 'Engineer', 'description': description, 'job_type': 'full_time',
+            'experience_required': 'senior', 'location': 'Berlin, Germany',
+            'expires_at': timezone.now() + timedelta(days=30),
+        }
+        defaults.update(fields)
+        with self.captureOnCommitCallbacks(execute=True):
+            return Job.objects.create(**defaults)
+
+    def save(self, instance):
+        with self.captureOnCommitCallbacks(execute=True):
+            instance.save()
+
+    def assertTopK(self):
+        matrix = SeekerMatrix.from_database()
+        jobs = list(Job.objects.filter(is_active=True))
+        scores = matrix.score_many(jobs) if jobs else None
+        for position, user_id in enumerate(matrix.user_ids.tolist()):
+            expected = sorted(
+                (int(scores[index, position]) for index in range(len(jobs)) if scores[index, position] > 30),
+                reverse=True,
+            )[:2]
+            stored = {job_id: score for job_id, score in JobMatch.objects.filter(user_id=user_id).values_list('job_id', 'score')}
+            self.assertEqual(sorted(stored.values(), reverse=True), expected, user_id)
+            for index, job in enumerate(jobs):
+                if job.id in stored:
+                    self.assertEqual(stored[job.id], scores[index, position])
+
+    def test_new_jobs_are_recorded(self):
+        self.create_job('Senior engineer in Berlin')
+        self.assertTrue(JobMatch.objects.filter(user=self.local.user).exists())
+        self.create_job('Python and Django developer', location='Remote', experience_required='mid')
+        self.create_job('React developer', location='Paris', experience_required='entry', job_type='part_time')
+        self.create_job('Python engineer', location='Remote', experience_required='senior')
+        self.assertTopK()
+
+    def test_deactivated_and_reactivated_jobs(self):
+        job = self.create_job('Senior engineer in Berlin')
+        self.create_job('Python and Django developer', location='Remote', experience_required='mid')
+        job.is_active = False
+        self.save(job)
+        self.assertFalse(JobMatch.objects.filter(job=job).exists())
+        self.assertTopK()
+        job.is_active = True
+        self.save(job)
+        self.assertTrue(JobMatch.objects.filter(job=job).exists())
+        self.assertTopK()
+
+    def test_changed_requirements_are_rescored(self):
+        jobs = [
+            self.create_job('Python and Django developer', location='Remote', experience_required='mid'),
+            self.create_job('Python developer', location='Remote', experience_required='mid'),
+            self.create_job('Django developer', location='Remote', experience_required='senior'),
+        ]
+        jobs[0].description = 'React developer'
+        jobs[0].location = 'Paris'
+        self.save(jobs[0])
+        self.assertTopK()
+        jobs[2].experience_required = 'mid'
+        self.save(jobs[2])
+        self.assertTopK()
+
+    def test_deleted_jobs_are_refilled(self):
+        jobs = [
+            self.create_job('Python and Django developer', location='Remote', experience_required='mid'),
+            self.create_job('Python developer', location='Remote', experience_required='mid'),
+            self.create_job('Django developer', location='Remote', experience_required='senior'),
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs[0].delete()
+        self.assertEqual(JobMatch.objects.filter(user=self.pythonista.user).count(), 2)
+        self.assertTopK()
+
+    def test_profile_changes_are_rescored(self):
+        self.create_job('Python and Django developer', location='Remote', experience_required='mid')
+        self.create_job('React developer', location='Paris', experience_required='entry')
+        self.frontend.extracted_skills = ['Python', 'Django']
+        self.frontend.current_location = 'Remote'
+        self.save(self.frontend)
+        self.assertTopK()
+
+    def test_unrelated_saves_leave_recommendations_alone(self):
+        job = self.create_job('Senior engineer in Berlin')
+        with mock.patch.object(match_store, 'schedule') as schedule:
+            job.views_count += 1
+            job.save()
+        schedule.assert_not_called()
+
+
+@override_settings(MATCHING_CONCURRENCY=0, JOB_NOTIFICATION_CONCURRENCY=0)
+class JobTextIndexTests(TestCase):
+
+    def setUp(self):
+        use_temporary_storage(self)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job = Job.objects.create(
+                employer=create_employer(), title='Glassblower', description='Shaping molten glass',
+                job_type='full_time', experience_required='mid', location='Murano',
+                expires_at=timezone.now() + timedelta(days=30),
+            )
+
+    def save(self, **fields):
+        for field, value in fields.items():
+            setattr(self.job, field, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.save()
+
+    def found(self, text):
+        return str(self.job.id) in dict(ml_pipeline.get_index('jobs').query(text))
+
+    def test_index_follows_activation(self):
+        self.assertTrue(self.found('glassblower'))
+        self.save(is_active=False)
+        self.assertFalse(self.found('glassblower'))
+        self.save(is_active=True)
+        self.assertTrue(self.found('glassblower'))
+
+    def test_index_follows_title_and_description(self):
+        self.save(title='Sommelier')
+        self.assertTrue(self.found('sommelier'))
+        self.save(description='Tasting wine')
+        self.assertTrue(self.found('wine'))
+        self.assertFalse(self.found('molten'))
+
+    def test_other_saves_leave_the_index_alone(self):
+        self.save(is_active=False)
+        with mock.patch.object(ml_pipeline, 'index_jobs') as index_jobs:
+            self.save(views_count=5)
+            self.save(title='Sommelier')
+            self.save(is_active=True, views_count=6)
+            self.save(views_count=7)
+        self.assertEqual(index_jobs.call_count, 1)
+
+
+class ResumeJobsTests(TestCase):
+
+    def setUp(self):
+        use_temporary_storage(self)
+        ml_pipeline.get_index('jobs').add([
+            ('job-1', ml_pipeline.job_text('Python developer', 'Django and Python services')),
+            ('job-2', ml_pipeline.job_text('Florist', 'Arranging flowers')),
+        ])
+        self.seeker = create_seeker('reader', resume=SimpleUploadedFile('resume.pdf', b'%PDF-1.4'))
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker.user)
+
+    def similar_keys(self):
+        with mock.patch('backend.apps.matching.views._jobs_with_similarity', side_effect=lambda similar: similar):
+            response = self.client.get('/api/matching/resume-jobs/')
+        self.assertEqual(response.status_code, 200)
+        return [key for key, _ in response.data['jobs']]
+
+    def test_stored_terms_are_queried_without_reading_the_resume(self):
+        JobSeekerProfile.objects.filter(id=self.seeker.id).update(resume_terms={'python': 3, 'django': 1})
+        with mock.patch.object(ResumeProcessor, 'extract_terms') as extract_terms:
+            self.assertEqual(self.similar_keys(), ['job-1'])
+        extract_terms.assert_not_called()
+
+    def test_missing_terms_are_extracted_once(self):
+        with mock.patch.object(ResumeProcessor, 'extract_terms', return_value={'flowers': 1}) as extract_terms:
+            self.assertEqual(self.similar_keys(), ['job-2'])
+            self.assertEqual(self.similar_keys(), ['job-2'])
+        self.assertEqual(extract_terms.call_count, 1)
+        self.seeker.refresh_from_db()
+        self.assertEqual(self.seeker.resume_terms, {'flowers': 1})
+
+
+class JobUpdatesConsumerTests(SimpleTestCase):
+    """Batching of job_update events into WebSocket frames"""
+
+    async def connect(self, user_id='seeker-1'):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), f'/ws/job-updates/{user_id}/')
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator
+
+    async def send_updates(self, count, user_id='seeker-1'):
+        channel_layer = get_channel_layer()
+        for number in range(count):
+            await channel_layer.group_send(f'user_{user_id}', {
+                'type': 'job_update', 'job_json': json.dumps({'id': number}), 'match_score': number,
+            })
+
+    @override_settings(JOB_UPDATES_BATCH_WINDOW=0.5, JOB_UPDATES_MAX_BATCH=50)
+    async def test_burst_is_sent_in_frames_of_at_most_max_batch(self):
+        communicator = await self.connect()
+        await self.send_updates(120)
+        frames = [await communicator.receive_json_from(timeout=2) for _ in range(3)]
+        self.assertEqual([frame['type'] for frame in frames], ['new_jobs'] * 3)
+        self.assertEqual([len(frame['jobs']) for frame in frames], [50, 50, 20])
+        self.assertEqual(
+            [(update['job']['id'], update['match_score']) for frame in frames for update in frame['jobs']],
+            [(number, number) for number in range(120)],
+        )
+        self.assertTrue(await communicator.receive_nothing(timeout=0.6))
+        await communicator.disconnect()
+
+    @override_settings(JOB_UPDATES_BATCH_WINDOW=0.05)
+    async def test_lone_update_is_sent_as_new_job(self):
+        communicator = await self.connect()
+        # Events from before job_json was added carry the job as data
+        await get_channel_layer().group_send('user_seeker-1', {
+            'type': 'job_update', 'job_data': {'id': 'job-1', 'title': 'Florist'}, 'match_score': 87,
+        })
+        self.assertEqual(await communicator.receive_json_from(timeout=1), {
+            'type': 'new_job', 'job': {'id': 'job-1', 'title': 'Florist'}, 'match_score': 87,
+        })
+        await communicator.disconnect()
+
+    @override_settings(JOB_UPDATES_BATCH_WINDOW=0)
+    async def test_zero_window_sends_each_update_on_its_own(self):
+        communicator = await self.connect()
+        await self.send_updates(2)
+        frames = [await communicator.receive_json_from(timeout=1) for _ in range(2)]
+        self.assertEqual([(frame['type'], frame['job']['id']) for frame in frames], [('new_job', 0), ('new_job', 1)])
+        await communicator.disconnect()
+
+    @override_settings(JOB_UPDATES_BATCH_WINDOW=0.05)
+    async def test_disconnect_cancels_the_pending_flush(self):
+        communicator = await self.connect()
+        await self.send_updates(3)
+        # Let the consumer buffer the events before the client goes away
+        await asyncio.sleep(0.01)
+        await communicator.disconnect()
+        await asyncio.sleep(0.1)
+        self.assertTrue(communicator.output_queue.empty())
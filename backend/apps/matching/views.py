@@ -0,0 +1,83 @@
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from django.shortcuts import get_object_or_404
+from .models import JobMatch
+from backend.apps.jobs.models import Job
+from backend.apps.jobs.views import JobDataSerializer
+from backend.apps.users.models import JobSeekerProfile
+from backend.services import ml_pipeline
+from backend.services.resume_parser import ResumeProcessor
+
+MAX_SIMILAR_JOBS = 50
+
+class RecommendedJobsPagination(CursorPagination):
+    ordering = ('-score', 'id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def recommended_jobs(request):
+    """List the current user's best-matching active jobs, highest score first"""
+    # Scores are precomputed by the match store; nothing is scored here
+    matches = JobMatch.objects.filter(user=request.user, job__is_active=True).select_related('job__employer')
+    paginator = RecommendedJobsPagination()
+    page = paginator.paginate_queryset(matches, request)
+    return paginator.get_paginated_response([
+        dict(JobDataSerializer.to_dict(match.job), match_score=match.score)
+        for match in page
+    ])
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def similar_jobs(request, job_id):
+    """List active jobs whose descriptions are most similar to a job's"""
+    try:
+        job = get_object_or_404(Job, id=job_id)
+        similar = ml_pipeline.get_index('jobs').query(
+            ml_pipeline.job_text(job.title, job.description),
+            k=_limit(request),
+            exclude=[str(job.id)],
+        )
+        return Response({'jobs': _jobs_with_similarity(similar)}, status=status.HTTP_200_OK)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def resume_jobs(request):
+    """List active jobs most similar to the current user's uploaded resume"""
+    profile = JobSeekerProfile.objects.filter(user=request.user).only('id', 'resume', 'resume_terms').first()
+    if not profile or not profile.resume:
+        return Response({'error': 'Upload a resume first'}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        limit = _limit(request)
+        terms = profile.resume_terms
+        if terms is None:
+            # Resume parsed before its terms were stored; fill them in once
+            with profile.resume.open('rb') as resume_file:
+                terms = ResumeProcessor().extract_terms(resume_file)
+            JobSeekerProfile.objects.filter(id=profile.id).update(resume_terms=terms)
+        similar = ml_pipeline.get_index('jobs').query(terms, k=limit)
+        return Response({'jobs': _jobs_with_similarity(similar)}, status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+def _limit(request):
+    try:
+        limit = int(request.query_params.get('limit', 10))
+    except ValueError:
+        raise ValueError('limit must be a number')
+    return max(1, min(limit, MAX_SIMILAR_JOBS))
+
+def _jobs_with_similarity(similar):
+    """Job data for (job id, similarity) pairs, most similar first, skipping jobs that are gone"""
+    jobs = Job.objects.filter(id__in=[job_id for job_id, _ in similar], is_active=True).select_related('employer')
+    jobs = {str(job.id): job for job in jobs}
+    return [
+        dict(JobDataSerializer.to_dict(jobs[job_id]), similarity=similarity)
+        for job_id, similarity in similar if job_id in jobs
+    ]
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SkillsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'backend.apps.skills'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,77 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from backend.services.resume_parser import ResumeProcessor
+from backend.services.skill_extractor import SkillMatcher
+
+# Filler vocabulary for synthetic resumes, chosen to contain the substrings
+# ('r', 'go', 'lean', 'java') that tripped up the old substring loop
+FILLER_WORDS = [
+    'managed', 'team', 'delivered', 'projects', 'across', 'regions', 'improved', 'performance',
+    'google', 'category', 'cleaning', 'javanese', 'reporting', 'stakeholders', 'designed',
+    'architecture', 'customers', 'ongoing', 'responsible', 'for', 'the', 'and', 'with', 'growth',
+]
+CHARS_PER_PAGE = 3000
+
+
+def legacy_extract_skills(keywords, text):
+    """The original substring loop, kept here as the benchmark baseline"""
+    found_skills = []
+    for skill in keywords:
+        if skill in text:
+            found_skills.append(skill.title())
+    found_skills = list(set(found_skills))
+    found_skills.sort()
+    return found_skills
+
+
+def synthetic_resume(pages, keywords, seed=0):
+    rng = random.Random(seed)
+    words = []
+    length = 0
+    while length < pages * CHARS_PER_PAGE:
+        word = rng.choice(keywords) if rng.random() < 0.02 else rng.choice(FILLER_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the compiled skill matcher against the legacy keyword loop'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, nargs='+', default=[2, 30],
+                            help='Resume sizes to benchmark, in pages')
+        parser.add_argument('--repeat', type=int, default=50,
+                            help='Extractions per measurement')
+
+    def handle(self, *args, **options):
+        keywords = ResumeProcessor().skill_keywords
+
+        started = time.perf_counter()
+        matcher = SkillMatcher.from_keywords(keywords)
+        build_ms = (time.perf_counter() - started) * 1000
+        self.stdout.write(f'Compiled {len(matcher.terms)} terms in {build_ms:.2f} ms')
+
+        for pages in options['pages']:
+            text = synthetic_resume(pages, keywords)
+            legacy_ms = self._time(lambda: legacy_extract_skills(keywords, text), options['repeat'])
+            matcher_ms = self._time(lambda: matcher.extract(text), options['repeat'])
+
+            legacy = set(legacy_extract_skills(keywords, text))
+            compiled = set(matcher.extract(text))
+            self.stdout.write(
+                f'{pages:>3} pages ({len(text):>7} chars): '
+                f'legacy {legacy_ms:8.3f} ms, compiled {matcher_ms:8.3f} ms, '
+                f'speedup {legacy_ms / matcher_ms:5.1f}x, '
+                f'false positives removed: {", ".join(sorted(legacy - compiled)) or "none"}'
+            )
+
+    @staticmethod
+    def _time(func, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - started) * 1000 / repeat
@@ -0,0 +1,62 @@
+from django.db import migrations
+
+# Frozen copy of the built-in taxonomy at the time of this migration
+DEFAULT_SKILL_TAXONOMY = {
+    'programming_languages': [
+        'python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift', 'kotlin',
+        'typescript', 'scala', 'r', 'matlab', 'perl', 'bash', 'powershell'
+    ],
+    'frameworks_libraries': [
+        'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'express', 'spring', 'laravel',
+        'asp.net', 'rails', 'fastapi', 'tornado', 'bootstrap', 'tailwind', 'material-ui'
+    ],
+    'databases': [
+        'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 'sql server', 'mariadb',
+        'elasticsearch', 'cassandra', 'dynamodb', 'firebase'
+    ],
+    'cloud_devops': [
+        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab', 'github actions',
+        'terraform', 'ansible', 'nginx', 'apache', 'linux', 'ubuntu', 'centos'
+    ],
+    'data_science_ml': [
+        'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy', 'matplotlib', 'seaborn',
+        'jupyter', 'spark', 'hadoop', 'kafka', 'airflow', 'tableau', 'power bi'
+    ],
+    'soft_skills': [
+        'leadership', 'communication', 'teamwork', 'problem solving', 'project management',
+        'agile', 'scrum', 'kanban', 'lean', 'six sigma', 'customer service', 'mentoring'
+    ],
+    'uncategorized': [
+        'jquery', 'axios', 'lodash', 'moment', 'chart.js', 'd3.js',
+        'git', 'svn', 'jira', 'confluence', 'slack', 'teams', 'zoom', 'figma', 'sketch',
+        'postman', 'swagger', 'graphql', 'rest api', 'soap', 'microservices'
+    ],
+}
+
+
+def seed_taxonomy(apps, schema_editor):
+    SkillCategory = apps.get_model('skills', 'SkillCategory')
+    Skill = apps.get_model('skills', 'Skill')
+    for category_name, keywords in DEFAULT_SKILL_TAXONOMY.items():
+        category, _ = SkillCategory.objects.get_or_create(name=category_name)
+        for keyword in keywords:
+            # Names match what resume parsing has always returned for the keyword
+            Skill.objects.get_or_create(
+                name=keyword.title(),
+                defaults={
+                    'category': category,
+                    'aliases': [keyword],
+                    'is_technical': category_name != 'soft_skills',
+                },
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_taxonomy, migrations.RunPython.noop),
+    ]
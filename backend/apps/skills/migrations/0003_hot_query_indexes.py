@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0002_seed_default_taxonomy'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userskill',
+            index=models.Index(fields=['skill', 'user'], name='skills_user_skill_i_98241b_idx'),
+        ),
+    ]
@@ -27,3 +27,7 @@ class UserSkill(models.Model):
     
     class Meta:
         unique_together = ['user', 'skill']
+        indexes = [
+            # Users with a skill, answered from the index alone
+            models.Index(fields=['skill', 'user']),
+        ]
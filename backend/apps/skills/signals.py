@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Skill, SkillCategory
+from backend.services.skill_extractor import invalidate_skill_index
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=SkillCategory)
+@receiver(post_delete, sender=SkillCategory)
+def skill_taxonomy_changed_handler(sender, **kwargs):
+    # Rebuild the shared skill index lazily on its next use
+    invalidate_skill_index()
@@ -0,0 +1,54 @@
+import time
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from backend.apps.skills.models import Skill, SkillCategory
+from backend.services import skill_extractor
+from backend.services.resume_parser import ResumeProcessor
+from backend.services.skill_extractor import DEFAULT_SKILL_CATEGORIES, get_skill_index
+
+
+class SkillIndexInvalidationTests(TestCase):
+
+    def setUp(self):
+        self.category = SkillCategory.objects.create(name='languages_of_the_future')
+        # Don't leave an index holding this test's rolled-back skills behind
+        self.addCleanup(skill_extractor.invalidate_skill_index)
+        get_skill_index()
+
+    def test_taxonomy_changes_rebuild_the_index(self):
+        Skill.objects.create(name='Zig', category=self.category, aliases=['ziglang'])
+        self.assertEqual(get_skill_index().matcher.extract('written in ziglang'), ['Zig'])
+        Skill.objects.filter(name='Zig').delete()
+        self.assertEqual(get_skill_index().matcher.extract('written in ziglang'), [])
+
+    @override_settings(SKILL_INDEX_MAX_AGE=60)
+    def test_index_is_rebuilt_once_too_old(self):
+        # bulk_create sends no signal, like a change made by another process with an unshared cache
+        Skill.objects.bulk_create([Skill(name='Odin', category=self.category)])
+        index = get_skill_index()
+        self.assertEqual(index.matcher.extract('odin'), [])
+        self.assertIs(get_skill_index(), index)
+        with mock.patch.object(skill_extractor.time, 'monotonic', return_value=time.monotonic() + 61):
+            self.assertEqual(get_skill_index().matcher.extract('odin'), ['Odin'])
+
+
+class SkillCategoriesTests(TestCase):
+
+    def setUp(self):
+        self.addCleanup(skill_extractor.invalidate_skill_index)
+        skill_extractor.invalidate_skill_index()
+
+    def test_seeded_taxonomy_lists_the_built_in_categories(self):
+        categories = ResumeProcessor().get_skill_categories()
+        self.assertEqual(categories, DEFAULT_SKILL_CATEGORIES)
+        self.assertNotIn('tools_platforms', categories)
+        self.assertNotIn('jquery', categories['frameworks_libraries'])
+
+    def test_uncategorized_keywords_are_still_extracted(self):
+        self.assertEqual(get_skill_index().matcher.extract('jquery and git'), ['Git', 'Jquery'])
+
+    def test_new_skills_are_listed_under_their_category(self):
+        Skill.objects.create(name='Svelte', category=SkillCategory.objects.get(name='frameworks_libraries'))
+        self.assertIn('svelte', ResumeProcessor().get_skill_categories()['frameworks_libraries'])
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'backend.apps.users'
+
+    def ready(self):
+        # Tunes every SQLite connection as it is opened
+        from backend.utils import database  # noqa: F401
@@ -0,0 +1,188 @@
+import io
+import os
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from backend.apps.users.models import JobSeekerProfile
+from backend.services import match_store
+from backend.services.resume_parser import ResumeProcessor
+from backend.services.seeker_index import index_seekers
+
+RESUME_EXTENSIONS = ('.pdf', '.doc', '.docx')
+LOOKUP_FIELDS = {
+    'email': 'user__email__in',
+    'username': 'user__username__in',
+    'id': 'user__id__in',
+}
+
+_processor = None
+_archive = None
+
+
+def _init_worker(is_zip, source):
+    """Give each pool process its own DB connections, one ResumeProcessor and, for a zip, the open archive"""
+    global _processor, _archive
+    import django
+    django.setup()
+    connections.close_all()
+    _processor = ResumeProcessor()
+    # Kept open for the life of the worker
+    _archive = zipfile.ZipFile(source) if is_zip else None
+
+
+def _process_entry(source, name, use_cache):
+    """Parse one resume inside a pool process; returns (name, result, error, seconds)"""
+    started = time.perf_counter()
+    try:
+        if _archive is not None:
+            resume_file = File(io.BytesIO(_archive.read(name)), name=name)
+        else:
+            resume_file = File(open(os.path.join(source, name), 'rb'), name=name)
+        with resume_file:
+            result = _processor.process_resume(resume_file, use_cache=use_cache)
+        return name, result, None, time.perf_counter() - started
+    except Exception as e:
+        return name, None, str(e), time.perf_counter() - started
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class Command(BaseCommand):
+    help = 'Parse a directory or zip of resumes in parallel and store the extracted data on job seeker profiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='Directory or .zip archive of PDF/DOC/DOCX resumes')
+        parser.add_argument('--match-by', choices=sorted(LOOKUP_FIELDS), default='email',
+                            help='User field that each file name (without extension) is matched against')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help='Number of parser processes')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Profiles written per bulk_update')
+        parser.add_argument('--checkpoint', default=None,
+                            help='File recording completed resumes (defaults to <source>.checkpoint)')
+        parser.add_argument('--use-cache', action='store_true',
+                            help='Read and populate the resume extraction cache')
+
+    def handle(self, *args, **options):
+        source = os.path.abspath(options['source'])
+        if not os.path.exists(source):
+            raise CommandError(f'{source} does not exist')
+
+        checkpoint_path = options['checkpoint'] or f'{source}.checkpoint'
+        done = set()
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as checkpoint:
+                done = {line.rstrip('\n') for line in checkpoint}
+
+        is_zip = zipfile.is_zipfile(source)
+        names = [name for name in self._list_resumes(source, is_zip) if name not in done]
+        self.stdout.write(f'{len(names)} resumes to ingest ({len(done)} already done)')
+        if not names:
+            return
+
+        self.lookup = LOOKUP_FIELDS[options['match_by']]
+        self.stats = {'updated': 0, 'unmatched': 0, 'failed': 0}
+        latencies = []
+        pending = []
+        started = time.perf_counter()
+
+        # Workers must not reuse the parent's DB connections
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker,
+                                 initargs=(is_zip, source)) as executor, \
+                open(checkpoint_path, 'a') as checkpoint:
+            results = executor.map(
+                _process_entry,
+                [source] * len(names), names, [options['use_cache']] * len(names),
+                chunksize=8,
+            )
+            for processed, (name, result, error, seconds) in enumerate(results, start=1):
+                latencies.append(seconds)
+                if error:
+                    self.stats['failed'] += 1
+                    self.stderr.write(f'{name}: {error}')
+                pending.append((name, result))
+
+                if len(pending) >= options['batch_size']:
+                    self._flush(pending, checkpoint)
+                    self._report(processed, started, latencies)
+            self._flush(pending, checkpoint)
+
+        self._report(len(names), started, latencies)
+        self.stdout.write(
+            f"Updated {self.stats['updated']} profiles, {self.stats['unmatched']} unmatched, "
+            f"{self.stats['failed']} failed"
+        )
+
+    def _list_resumes(self, source, is_zip):
+        if is_zip:
+            with zipfile.ZipFile(source) as archive:
+                names = [info.filename for info in archive.infolist() if not info.is_dir()]
+        elif os.path.isdir(source):
+            names = [
+                os.path.relpath(os.path.join(root, file_name), source)
+                for root, _, file_names in os.walk(source) for file_name in file_names
+            ]
+        else:
+            raise CommandError(f'{source} is neither a directory nor a zip archive')
+        return sorted(name for name in names if name.lower().endswith(RESUME_EXTENSIONS))
+
+    def _resume_key(self, name):
+        """Value of the --match-by field a resume's file name stands for, or None if it can't be one"""
+        stem = os.path.splitext(os.path.basename(name))[0]
+        if self.lookup != LOOKUP_FIELDS['id']:
+            return stem
+        # The database accepts any spelling of a UUID; compare the canonical one
+        try:
+            return str(uuid.UUID(stem))
+        except ValueError:
+            return None
+
+    def _flush(self, pending, checkpoint):
+        """
+        Write a batch of results with one bulk_update, then checkpoint the
+        resumes that were saved; failed and unmatched ones are retried next run
+        """
+        keys = {name: self._resume_key(name) for name, result in pending if result is not None}
+        parsed = {keys[name]: result for name, result in pending if keys.get(name) is not None}
+        profiles = list(
+            JobSeekerProfile.objects.filter(**{self.lookup: list(parsed)})
+            .select_related('user')
+            .only('id', 'extracted_skills', 'extracted_experience', 'resume_terms', 'current_location',
+                  'preferred_locations', 'user__email', 'user__username', 'user__id')
+        )
+        field = self.lookup.split('__')[1]
+        for profile in profiles:
+            result = parsed[str(getattr(profile.user, field))]
+            profile.extracted_skills = result.get('skills', [])
+            profile.extracted_experience = result.get('experience', {})
+            profile.resume_terms = result.get('terms')
+        JobSeekerProfile.objects.bulk_update(profiles, ['extracted_skills', 'extracted_experience', 'resume_terms'])
+        # bulk_update sends no post_save, so refresh the matching indexes here
+        index_seekers(profiles)
+        match_store.rescore_seekers([profile.user_id for profile in profiles])
+
+        saved = {str(getattr(profile.user, field)) for profile in profiles}
+        self.stats['updated'] += len(profiles)
+        self.stats['unmatched'] += sum(1 for key in keys.values() if key not in saved)
+        checkpoint.writelines(f'{name}\n' for name, key in keys.items() if key in saved)
+        checkpoint.flush()
+        pending.clear()
+
+    def _report(self, processed, started, latencies):
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{processed} resumes in {elapsed:.1f}s: {processed / elapsed if elapsed else 0:.1f} docs/sec, '
+            f'p95 latency {_percentile(latencies, 0.95) * 1000:.0f} ms'
+        )
@@ -0,0 +1,38 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from backend.apps.users.models import ResumeParseJob
+from backend.services.resume_queue import run_job
+
+
+class Command(BaseCommand):
+    help = 'Process queued resume parse jobs outside the web workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=None,
+                            help='Worker threads (defaults to RESUME_WORKER_CONCURRENCY)')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep polling for new jobs instead of exiting once the queue is empty')
+        parser.add_argument('--interval', type=float, default=2.0,
+                            help='Seconds between polls in --loop mode')
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency'] or max(getattr(settings, 'RESUME_WORKER_CONCURRENCY', 2), 1)
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='resume-worker') as executor:
+            while True:
+                job_ids = list(
+                    ResumeParseJob.objects.filter(status='queued')
+                    .order_by('created_at')
+                    .values_list('id', flat=True)[:concurrency * 10]
+                )
+                processed = sum(executor.map(run_job, job_ids))
+                if processed:
+                    self.stdout.write(f'Processed {processed} resume job(s)')
+                if not options['loop']:
+                    break
+                if not job_ids:
+                    time.sleep(options['interval'])
@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter under -X importtime: set Django up the way a
+# WSGI worker does, then serve one request and report the timings as JSON
+PROBE = '''
+import time
+started = time.perf_counter()
+import json, sys
+from io import BytesIO
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+ready = time.perf_counter()
+
+path, host = sys.argv[1], sys.argv[2]
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SERVER_NAME': host,
+    'SERVER_PORT': '80', 'HTTP_HOST': host, 'SERVER_PROTOCOL': 'HTTP/1.1', 'wsgi.version': (1, 0),
+    'wsgi.url_scheme': 'http', 'wsgi.input': BytesIO(), 'wsgi.errors': sys.stderr,
+    'wsgi.multithread': False, 'wsgi.multiprocess': True, 'wsgi.run_once': False,
+}
+statuses = []
+response = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+b''.join(response)
+getattr(response, 'close', lambda: None)()
+served = time.perf_counter()
+print(json.dumps({'setup': ready - started, 'first_request': served - ready, 'status': statuses[0]}))
+'''
+
+
+def parse_importtime(output):
+    """(module, self us, cumulative us, nesting level) for each -X importtime line"""
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|', 2)
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), int(own), int(cumulative), level))
+    return imports
+
+
+class Command(BaseCommand):
+    help = 'Measure worker cold start: import time per module and time to first request'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/jobs/list/',
+                            help='Request path served as the first request')
+        parser.add_argument('--top', type=int, default=20,
+                            help='Number of slowest imports to list')
+
+    def handle(self, *args, **options):
+        hosts = [host for host in settings.ALLOWED_HOSTS if host and not host.startswith(('.', '*'))]
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE))
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROBE, options['path'], hosts[0] if hosts else 'localhost'],
+            capture_output=True, text=True, env=env,
+        )
+        if result.returncode != 0:
+            raise CommandError(f'Startup probe failed:\n{result.stderr[-2000:]}')
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        imports = parse_importtime(result.stderr)
+
+        self.stdout.write(f"Django setup:   {timings['setup'] * 1000:8.1f} ms")
+        self.stdout.write(f"First request:  {timings['first_request'] * 1000:8.1f} ms ({options['path']} -> {timings['status']})")
+        self.stdout.write(f'Total import:   {sum(own for _, own, _, _ in imports) / 1000:8.1f} ms '
+                          f'across {len(imports)} modules')
+
+        # Top-level entries already include everything they imported
+        self.stdout.write("\nSlowest top-level imports (cumulative ms):")
+        top_level = sorted((entry for entry in imports if entry[3] == 0), key=lambda entry: -entry[2])
+        for name, _, cumulative, _ in top_level[:options['top']]:
+            self.stdout.write(f'  {cumulative / 1000:8.1f}  {name}')
+
+        self.stdout.write("\nSlowest modules by their own import time (ms):")
+        for name, own, _, _ in sorted(imports, key=lambda entry: -entry[1])[:options['top']]:
+            self.stdout.write(f'  {own / 1000:8.1f}  {name}')
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_resumeparsejob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeExtractionCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64)),
+                ('taxonomy_version', models.CharField(max_length=32)),
+                ('result', models.JSONField(default=dict)),
+                ('hits', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['last_used_at'], name='users_resum_last_us_8d8565_idx')],
+                'unique_together': {('sha256', 'taxonomy_version')},
+            },
+        ),
+    ]
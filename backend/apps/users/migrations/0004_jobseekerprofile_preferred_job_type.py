@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_resumeextractioncache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='preferred_job_type',
+            field=models.CharField(blank=True, choices=[('full_time', 'Full Time'), ('part_time', 'Part Time'), ('contract', 'Contract'), ('internship', 'Internship'), ('freelance', 'Freelance')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_jobseekerprofile_preferred_job_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resumeextractioncache',
+            index=models.Index(fields=['created_at'], name='users_resum_created_0bb6d0_idx'),
+        ),
+    ]
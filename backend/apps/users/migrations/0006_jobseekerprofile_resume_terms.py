@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_resumeextractioncache_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='resume_terms',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
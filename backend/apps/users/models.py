@@ -32,6 +32,7 @@ class JobSeekerProfile(models.Model):
     
     # Resume and Documents
     resume = models.FileField(upload_to='resumes/', blank=True)
+    resume_terms = models.JSONField(null=True, blank=True)  # Token counts of the resume, None until parsed
     portfolio_url = models.URLField(blank=True)
     linkedin_url = models.URLField(blank=True)
     github_url = models.URLField(blank=True)
@@ -44,6 +45,13 @@ class JobSeekerProfile(models.Model):
     current_location = models.CharField(max_length=100)
     preferred_locations = models.JSONField(default=list)  # ["Remote", "New York", "San Francisco"]
     willing_to_relocate = models.BooleanField(default=False)
+    preferred_job_type = models.CharField(max_length=20, blank=True, choices=[
+        ('full_time', 'Full Time'),
+        ('part_time', 'Part Time'),
+        ('contract', 'Contract'),
+        ('internship', 'Internship'),
+        ('freelance', 'Freelance'),
+    ])
     
     # Salary Expectations
     expected_salary_min = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
@@ -79,3 +87,38 @@ class EmployerProfile(models.Model):
     ])
     industry = models.CharField(max_length=100)
     location = models.CharField(max_length=100)
+
+class ResumeParseJob(models.Model):
+    STATUSES = (
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    resume = models.FileField(upload_to='resume_jobs/')
+    status = models.CharField(max_length=20, choices=STATUSES, default='queued')
+
+    # Extraction results, copied to the profile once the job is done
+    extracted_skills = models.JSONField(default=list)
+    extracted_experience = models.JSONField(default=dict)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+class ResumeExtractionCache(models.Model):
+    """Extraction results keyed by the SHA-256 of the resume file and the skill taxonomy version"""
+    sha256 = models.CharField(max_length=64)
+    taxonomy_version = models.CharField(max_length=32)
+    result = models.JSONField(default=dict)
+    hits = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['sha256', 'taxonomy_version']
+        indexes = [models.Index(fields=['last_used_at']), models.Index(fields=['created_at'])]
@@ -1,17 +1,28 @@
+from django.db import transaction
+from django.db.models import Prefetch
 from rest_framework import serializers
-from .models import JobSeekerProfile
-from backend.apps.skills.models import UserSkill
+from .models import JobSeekerProfile, ResumeParseJob
+from backend.apps.skills.models import Skill, UserSkill
 
 class JobSeekerProfileSerializer(serializers.ModelSerializer):
     skills = serializers.SerializerMethodField()
     
     class Meta:
         model = JobSeekerProfile
-        fields = '__all__'
+        exclude = ('resume_terms',)
         read_only_fields = ('user', 'extracted_skills', 'extracted_experience')
     
+    @staticmethod
+    def with_skills(queryset):
+        """Load everything get_skills reads up front: two queries for any number of profiles"""
+        return queryset.defer('resume_terms').select_related('user').prefetch_related(Prefetch(
+            'user__userskill_set', queryset=UserSkill.objects.select_related('skill'), to_attr='profile_skills',
+        ))
+
     def get_skills(self, obj):
-        user_skills = UserSkill.objects.filter(user=obj.user)
+        user_skills = getattr(obj.user, 'profile_skills', None)
+        if user_skills is None:
+            user_skills = UserSkill.objects.filter(user_id=obj.user_id).select_related('skill')
         return [{
             'skill_name': us.skill.name,
             'proficiency_level': us.proficiency_level,
@@ -28,7 +39,63 @@ class ExtractedSkillsSerializer(serializers.ModelSerializer):
         model = JobSeekerProfile
         fields = ['extracted_skills']
 
+class UserSkillListSerializer(serializers.ListSerializer):
+    """
+    A user's complete skill list, saved as a diff against their current rows
+
+    Skill ids are checked with one in_bulk query and changed rows are
+    upserted with a single bulk_create; skills left out of the list are
+    deleted. Saving any number of skills takes a handful of queries.
+    """
+
+    def validate(self, attrs):
+        skill_ids = [entry['skill_id'] for entry in attrs]
+        if len(set(skill_ids)) != len(skill_ids):
+            raise serializers.ValidationError('Each skill may only be listed once')
+        unknown = set(skill_ids) - Skill.objects.in_bulk(skill_ids).keys()
+        if unknown:
+            raise serializers.ValidationError(f'Unknown skill ids: {sorted(unknown)}')
+        return attrs
+
+    def save(self, user):
+        existing = {user_skill.skill_id: user_skill for user_skill in UserSkill.objects.filter(user=user)}
+        rows, changed = [], []
+        for entry in self.validated_data:
+            current = existing.get(entry['skill_id'])
+            if current is not None and all(getattr(current, field) == value for field, value in entry.items()):
+                rows.append(current)
+                continue
+            row = UserSkill(user=user, **entry)
+            rows.append(row)
+            changed.append(row)
+
+        removed = existing.keys() - {row.skill_id for row in rows}
+        with transaction.atomic():
+            if removed:
+                UserSkill.objects.filter(user=user, skill_id__in=removed).delete()
+            if changed:
+                UserSkill.objects.bulk_create(
+                    changed,
+                    update_conflicts=True,
+                    unique_fields=['user', 'skill'],
+                    update_fields=['proficiency_level', 'years_of_experience', 'is_verified'],
+                )
+        self.instance = rows
+        return rows
+
 class UserSkillSerializer(serializers.ModelSerializer):
+    # A plain id, so a list of skills is validated in one query (see UserSkillListSerializer)
+    skill = serializers.IntegerField(source='skill_id')
+
     class Meta:
         model = UserSkill
         fields = ['skill', 'proficiency_level', 'years_of_experience', 'is_verified']
+        list_serializer_class = UserSkillListSerializer
+
+class ResumeParseJobSerializer(serializers.ModelSerializer):
+    job_id = serializers.UUIDField(source='id', read_only=True)
+
+    class Meta:
+        model = ResumeParseJob
+        fields = ['job_id', 'status', 'extracted_skills', 'extracted_experience', 'error',
+                  'created_at', 'started_at', 'finished_at']
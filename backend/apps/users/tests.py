@@ -0,0 +1,308 @@
+import io
+import re
+import time
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from backend.apps.skills.models import Skill, SkillCategory, UserSkill
+from backend.apps.users.management.commands.ingest_resumes import LOOKUP_FIELDS, Command as IngestResumesCommand
+from backend.apps.users.models import CustomUser, JobSeekerProfile, ResumeExtractionCache
+from backend.apps.users.serializers import JobSeekerProfileSerializer
+from backend.services import resume_cache
+from backend.services.resume_parser import ResumeProcessor
+from backend.utils.firebase_auth import FirebaseAuthentication, TokenCache
+from backend.utils.text_processor import analyze
+
+
+def parsed(truncated):
+    return {'skills': ['python'], 'experience': {}, 'terms': {'python': 2}, 'text_length': 10,
+            'truncated': truncated}
+
+
+@override_settings(RESUME_CACHE_ENABLED=True)
+class ResumeCacheTests(TestCase):
+
+    def process(self, content, result):
+        with mock.patch.object(ResumeProcessor, '_parse', return_value=result) as parse:
+            returned = ResumeProcessor().process_resume(SimpleUploadedFile('resume.pdf', content))
+        return returned, parse.call_count
+
+    def test_complete_results_are_reused(self):
+        self.assertEqual(self.process(b'resume', parsed(False)), (parsed(False), 1))
+        self.assertEqual(self.process(b'resume', parsed(False)), (parsed(False), 0))
+        self.assertEqual(ResumeExtractionCache.objects.get().hits, 1)
+
+    def test_truncated_results_are_not_cached(self):
+        self.assertEqual(self.process(b'long resume', parsed(True)), (parsed(True), 1))
+        self.assertFalse(ResumeExtractionCache.objects.exists())
+        self.assertEqual(self.process(b'long resume', parsed(True))[1], 1)
+
+    @override_settings(RESUME_CACHE_MAX_AGE=3600, RESUME_CACHE_MAX_ENTRIES=2)
+    def test_expired_and_least_recently_used_entries_are_evicted(self):
+        now = timezone.now()
+        for number, age in enumerate([7200, 30, 20, 10]):
+            ResumeExtractionCache.objects.create(sha256=f'{number:064}', taxonomy_version='v1')
+            ResumeExtractionCache.objects.filter(sha256=f'{number:064}').update(
+                created_at=now - timedelta(seconds=age), last_used_at=now - timedelta(seconds=age),
+            )
+        resume_cache.evict()
+        self.assertEqual(
+            sorted(ResumeExtractionCache.objects.values_list('sha256', flat=True)),
+            [f'{2:064}', f'{3:064}'],
+        )
+
+
+class IngestResumesCheckpointTests(TestCase):
+
+    def setUp(self):
+        self.user = CustomUser.objects.create(username='saved', email='saved@example.com', user_type='job_seeker')
+        JobSeekerProfile.objects.create(user=self.user, first_name='Saved', last_name='Seeker', title='Developer',
+                                        experience_level='mid', current_location='Berlin')
+
+    def flush(self, match_by, pending):
+        """Checkpoint lines and stats after one _flush of pending (name, result) pairs"""
+        command = IngestResumesCommand(stdout=io.StringIO(), stderr=io.StringIO())
+        command.lookup = LOOKUP_FIELDS[match_by]
+        command.stats = {'updated': 0, 'unmatched': 0, 'failed': 0}
+        checkpoint = io.StringIO()
+        command._flush(pending, checkpoint)
+        return checkpoint.getvalue().splitlines(), command.stats
+
+    def test_only_saved_resumes_are_checkpointed(self):
+        lines, stats = self.flush('email', [
+            ('batch/saved@example.com.pdf', parsed(False)),
+            ('batch/failed@example.com.pdf', None),
+            ('batch/unknown@example.com.docx', parsed(False)),
+        ])
+
+        self.assertEqual(lines, ['batch/saved@example.com.pdf'])
+        self.assertEqual(stats, {'updated': 1, 'unmatched': 1, 'failed': 0})
+        profile = JobSeekerProfile.objects.get(user=self.user)
+        self.assertEqual(profile.extracted_skills, ['python'])
+        self.assertEqual(profile.resume_terms, {'python': 2})
+
+    def test_ids_match_in_any_uuid_spelling(self):
+        stem = self.user.id.hex.upper()
+        lines, stats = self.flush('id', [
+            (f'{stem}.pdf', parsed(False)),
+            ('not-a-uuid.pdf', parsed(False)),
+            (f'{uuid.uuid4()}.pdf', parsed(False)),
+        ])
+
+        self.assertEqual(lines, [f'{stem}.pdf'])
+        self.assertEqual(stats, {'updated': 1, 'unmatched': 2, 'failed': 0})
+        self.assertEqual(JobSeekerProfile.objects.get(user=self.user).extracted_skills, ['python'])
+
+
+def baseline_experience(text):
+    """ResumeProcessor._extract_experience as it was before the shared text scanner"""
+    experience_info = {'total_years': 0, 'experience_level': 'entry', 'found_patterns': []}
+    for pattern in [
+        r'(\d+)\s*(?:years?|yrs?)\s*(?:of\s*)?experience',
+        r'experience:\s*(\d+)\s*(?:years?|yrs?)',
+        r'(\d+)\s*(?:years?|yrs?)\s*in\s*(?:the\s*)?field',
+        r'worked\s*(?:for\s*)?(\d+)\s*(?:years?|yrs?)',
+    ]:
+        matches = re.findall(pattern, text, re.IGNORECASE)
+        if matches:
+            years = max([int(match) for match in matches])
+            experience_info['total_years'] = years
+            experience_info['found_patterns'].append(f"Found {years} years of experience")
+            if years >= 10:
+                experience_info['experience_level'] = 'expert'
+            elif years >= 6:
+                experience_info['experience_level'] = 'senior'
+            elif years >= 3:
+                experience_info['experience_level'] = 'mid'
+            else:
+                experience_info['experience_level'] = 'entry'
+            break
+    return experience_info
+
+
+EXPERIENCE_CORPUS = [
+    'Senior engineer with 12 years of experience in Python.',
+    'experience: 5 years of experience leading teams',
+    'Experience: 4 yrs\nworked for 9 years at Acme',
+    '5+ years of experience required, 3 years in the field preferred',
+    'a15 years experience, 2yrs experience, 7 yearsexperience',
+    'Worked 2 years. Then 8 yrs in field work. Also 6 years in the field.',
+    'worked for 11 yrs; experience:3 years',
+    'no numbers here, just years and years of toil',
+    'SUMMARY\n10 years of experience\nEXPERIENCE\nworked 1 year',
+    '',
+]
+
+
+class ExperienceExtractionTests(TestCase):
+
+    def test_matches_the_baseline_implementation(self):
+        processor = ResumeProcessor()
+        for text in EXPERIENCE_CORPUS:
+            self.assertEqual(processor._extract_experience(text.lower()), baseline_experience(text.lower()), text)
+
+    def test_every_pattern_sees_the_whole_text(self):
+        years = analyze('experience: 5 years of experience', split=False).experience_years
+        self.assertEqual(years, {0: 5, 1: 5})
+
+
+class ProfileSkillsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        category = SkillCategory.objects.create(name='test_skills')
+        skills = [Skill.objects.create(name=name, category=category) for name in ('Erlang', 'Elixir')]
+        cls.users = []
+        for number in range(3):
+            user = CustomUser.objects.create(username=f'user{number}', email=f'user{number}@example.com',
+                                             user_type='job_seeker')
+            JobSeekerProfile.objects.create(user=user, first_name='Test', last_name='Seeker', title='Developer',
+                                            experience_level='mid', current_location='Berlin',
+                                            extracted_skills=['Erlang'])
+            for skill in skills[:number]:
+                UserSkill.objects.create(user=user, skill=skill, proficiency_level='advanced', years_of_experience=2)
+            cls.users.append(user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[0])
+
+    def test_batch_profiles_load_skills_in_a_fixed_number_of_queries(self):
+        with self.assertNumQueries(2):
+            response = self.client.post('/api/users/profiles/batch/',
+                                        {'user_ids': [str(user.id) for user in self.users]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [sorted(skill['skill_name'] for skill in profile['skills']) for profile in response.data['profiles']],
+            [[], ['Erlang'], ['Elixir', 'Erlang']],
+        )
+
+    def test_profile_without_prefetch_reads_its_skills(self):
+        profile = JobSeekerProfile.objects.get(user=self.users[1])
+        self.assertEqual([skill['skill_name'] for skill in JobSeekerProfileSerializer(profile).data['skills']], ['Erlang'])
+
+    def test_extracted_skills(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/users/{self.users[2].id}/extracted-skills/')
+        self.assertEqual(response.data, {'extracted_skills': ['Erlang']})
+
+
+class TokenCacheTests(TestCase):
+
+    def setUp(self):
+        self.cache = TokenCache()
+        self.user = CustomUser.objects.create(username='firebase-uid', email='seeker@example.com',
+                                              user_type='job_seeker')
+
+    def test_hit_returns_a_copy(self):
+        self.cache.put('token', self.user, time.time() + 3600)
+        cached = self.cache.get('token')
+        self.assertEqual(cached.pk, self.user.pk)
+        cached.first_name = 'Changed'
+        self.assertEqual(self.cache.get('token').first_name, '')
+        self.assertIsNone(self.cache.get('other-token'))
+
+    def test_entries_expire_with_the_token(self):
+        self.cache.put('token', self.user, time.time() - 1)
+        self.assertIsNone(self.cache.get('token'))
+
+    @override_settings(FIREBASE_TOKEN_CACHE_TTL=60)
+    def test_entries_expire_after_the_ttl(self):
+        self.cache.put('token', self.user, time.time() + 3600)
+        with mock.patch('backend.utils.firebase_auth.time.time', return_value=time.time() + 61):
+            self.assertIsNone(self.cache.get('token'))
+
+    @override_settings(FIREBASE_TOKEN_CACHE_SIZE=2)
+    def test_least_recently_used_entry_is_evicted(self):
+        for token in ('a', 'b'):
+            self.cache.put(token, self.user, time.time() + 3600)
+        self.cache.get('a')
+        self.cache.put('c', self.user, time.time() + 3600)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertIsNotNone(self.cache.get('c'))
+
+    @override_settings(FIREBASE_TOKEN_CACHE_SIZE=0)
+    def test_size_zero_disables_the_cache(self):
+        self.cache.put('token', self.user, time.time() + 3600)
+        self.assertIsNone(self.cache.get('token'))
+
+    def test_authenticate_verifies_each_token_once(self):
+        verify = mock.Mock(return_value={'uid': 'firebase-uid', 'email': 'seeker@example.com',
+                                         'exp': time.time() + 3600})
+        request = mock.Mock(META={'HTTP_AUTHORIZATION': 'Bearer some-token'})
+        with mock.patch('backend.utils.firebase_auth.firebase_auth') as firebase_auth, \
+                mock.patch('backend.utils.firebase_auth.token_cache', self.cache):
+            firebase_auth.return_value.verify_id_token = verify
+            first, _ = FirebaseAuthentication().authenticate(request)
+            with self.assertNumQueries(0):
+                second, _ = FirebaseAuthentication().authenticate(request)
+        verify.assert_called_once_with('some-token')
+        self.assertEqual(first.pk, self.user.pk)
+        self.assertEqual(second.pk, self.user.pk)
+
+
+class UserSkillsUpdateTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        category = SkillCategory.objects.create(name='test_languages')
+        cls.skills = Skill.objects.bulk_create([Skill(name=f'Language {number}', category=category)
+                                                for number in range(40)])
+        cls.user = CustomUser.objects.create(username='skilled', email='skilled@example.com',
+                                             user_type='job_seeker')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, entries):
+        return self.client.post('/api/users/skills/', entries, format='json')
+
+    def saved(self):
+        return {
+            skill_id: (level, years)
+            for skill_id, level, years in UserSkill.objects.filter(user=self.user)
+            .values_list('skill_id', 'proficiency_level', 'years_of_experience')
+        }
+
+    def entry(self, skill, level='beginner', years=1):
+        return {'skill': skill.id, 'proficiency_level': level, 'years_of_experience': years}
+
+    def test_existing_skills_are_updated_and_omitted_ones_deleted(self):
+        first, second, third = self.skills[:3]
+        self.assertEqual(self.post([self.entry(first), self.entry(second)]).status_code, 200)
+
+        response = self.post([self.entry(first, 'expert', 5), self.entry(third)])
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.saved(), {first.id: ('expert', 5), third.id: ('beginner', 1)})
+
+    def test_empty_list_removes_every_skill(self):
+        self.post([self.entry(skill) for skill in self.skills[:3]])
+        self.assertEqual(self.post([]).status_code, 200)
+        self.assertEqual(self.saved(), {})
+
+    def test_duplicate_and_unknown_skills_are_rejected(self):
+        self.post([self.entry(self.skills[0])])
+        unknown_id = max(skill.id for skill in self.skills) + 1
+        for entries in (
+            [self.entry(self.skills[1]), self.entry(self.skills[1], 'expert')],
+            [self.entry(self.skills[1]), {'skill': unknown_id, 'proficiency_level': 'beginner'}],
+        ):
+            response = self.post(entries)
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(self.saved()), {self.skills[0].id})
+
+    def test_saving_forty_skills_takes_a_fixed_number_of_queries(self):
+        self.post([self.entry(skill) for skill in self.skills[:20]])
+        # Skill lookup and current rows, then delete and upsert in a savepoint (2 more queries)
+        with self.assertNumQueries(6):
+            response = self.post([self.entry(skill, 'advanced', 3) for skill in self.skills[10:]])
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.saved(), {skill.id: ('advanced', 3) for skill in self.skills[10:]})
@@ -1,11 +1,17 @@
 from rest_framework import generics, status, permissions, views
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
+from django.conf import settings
 from django.shortcuts import get_object_or_404
-from .models import CustomUser, JobSeekerProfile
+from .models import CustomUser, JobSeekerProfile, ResumeParseJob
 from backend.apps.skills.models import UserSkill, Skill
-from .serializers import JobSeekerProfileSerializer, ResumeUploadSerializer, ExtractedSkillsSerializer, UserSkillSerializer
+from .serializers import JobSeekerProfileSerializer, ResumeUploadSerializer, ExtractedSkillsSerializer, UserSkillSerializer, ResumeParseJobSerializer
 from backend.services.resume_parser import ResumeProcessor
+from backend.services import resume_queue
+import uuid
+
+# Most profiles ProfileBatchView returns per request
+MAX_BATCH_PROFILES = 100
 
 class JobSeekerProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -46,12 +52,36 @@ class GetProfileView(views.APIView):
     
     def get(self, request, user_id):
         try:
-            profile = get_object_or_404(JobSeekerProfile, user__id=user_id)
+            profile = get_object_or_404(JobSeekerProfileSerializer.with_skills(JobSeekerProfile.objects), user__id=user_id)
             serializer = JobSeekerProfileSerializer(profile)
             return Response(serializer.data)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
 
+class ProfileBatchView(views.APIView):
+    """Get the profiles of several users at once, in a fixed number of queries"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        user_ids = request.data.get('user_ids')
+        if not isinstance(user_ids, list) or not user_ids:
+            return Response({'error': 'user_ids must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(user_ids) > MAX_BATCH_PROFILES:
+            return Response({'error': f'At most {MAX_BATCH_PROFILES} user_ids per request'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            user_ids = list(dict.fromkeys(str(uuid.UUID(str(user_id))) for user_id in user_ids))
+        except ValueError:
+            return Response({'error': 'user_ids must be UUIDs'}, status=status.HTTP_400_BAD_REQUEST)
+
+        profiles = JobSeekerProfileSerializer.with_skills(JobSeekerProfile.objects.filter(user_id__in=user_ids))
+        by_user = {str(profile.user_id): profile for profile in profiles}
+        found = [by_user[user_id] for user_id in user_ids if user_id in by_user]
+        return Response({
+            'profiles': JobSeekerProfileSerializer(found, many=True).data,
+            'missing': [user_id for user_id in user_ids if user_id not in by_user]
+        })
+
 class JobSeekerProfileUpdateView(generics.UpdateAPIView):
     serializer_class = JobSeekerProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -88,6 +118,21 @@ class ResumeUploadView(generics.CreateAPIView):
         if not resume_file:
             return Response({'error': 'Resume file required'}, status=status.HTTP_400_BAD_REQUEST)
         
+        if resume_file.size > settings.MAX_UPLOAD_SIZE:
+            return Response({
+                'error': f'Resume file must be smaller than {settings.MAX_UPLOAD_SIZE // (1024 * 1024)}MB'
+            }, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        
+        if self.is_async(request):
+            # Store the file and hand parsing to the resume queue
+            job = ResumeParseJob.objects.create(user=request.user, resume=resume_file)
+            resume_queue.enqueue(job)
+            return Response({
+                'message': 'Resume queued for processing',
+                'job_id': str(job.id),
+                'status': job.status
+            }, status=status.HTTP_202_ACCEPTED)
+        
         try:
             # Process resume and extract skills
             processor = ResumeProcessor()
@@ -98,6 +143,7 @@ class ResumeUploadView(generics.CreateAPIView):
             profile.resume = resume_file
             profile.extracted_skills = extracted_data.get('skills', [])
             profile.extracted_experience = extracted_data.get('experience', {})
+            profile.resume_terms = extracted_data.get('terms')
             profile.save()
             
             return Response({
@@ -109,6 +155,22 @@ class ResumeUploadView(generics.CreateAPIView):
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def is_async(self, request):
+        """Upload mode: ?async=true (or an 'async' form field), defaulting to RESUME_PROCESSING_ASYNC"""
+        value = request.query_params.get('async', request.data.get('async'))
+        if value is None:
+            return getattr(settings, 'RESUME_PROCESSING_ASYNC', False)
+        return str(value).lower() in ('1', 'true', 'yes')
+
+class ResumeJobStatusView(views.APIView):
+    """Poll the status of an asynchronous resume upload"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = get_object_or_404(ResumeParseJob, id=job_id, user=request.user)
+        serializer = ResumeParseJobSerializer(job)
+        return Response(serializer.data)
+
 class ExtractedSkillsView(views.APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -124,6 +186,7 @@ class UserSkillsUpdateView(views.APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
+        """Replace the user's skills with the posted list, adding, updating and removing rows as needed"""
         serializer = UserSkillSerializer(data=request.data, many=True)
         if serializer.is_valid():
             serializer.save(user=request.user)
@@ -162,14 +162,82 @@ CSRF_TRUSTED_ORIGINS = [
 
 
 
+# Cache
+# Local memory by default (one cache per worker process). Set CACHE_BACKEND=file to
+# share one cache directory between every worker on the host.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+CACHES = {
+    'default': {
+        'BACKEND': {
+            'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+            'file': 'django.core.cache.backends.filebased.FileBasedCache',
+        }[CACHE_BACKEND],
+        'LOCATION': os.environ.get('CACHE_LOCATION', os.path.join(BASE_DIR, 'cache') if CACHE_BACKEND == 'file' else ''),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', '10000')),
+        },
+    }
+}
+
+# Serialized job responses; dropped whenever a job or employer changes. With the locmem
+# backend other workers only notice once their copies time out.
+JOB_RESPONSE_CACHE_TIMEOUT = int(os.environ.get('JOB_RESPONSE_CACHE_TIMEOUT', '300'))  # seconds
+
+# Each process's compiled skill taxonomy is rebuilt at least this often. Taxonomy edits
+# reach other workers at once only when they share the cache (CACHE_BACKEND=file).
+SKILL_INDEX_MAX_AGE = int(os.environ.get('SKILL_INDEX_MAX_AGE', '300'))  # seconds
+
+# Verified Firebase ID tokens kept per worker; an entry lasts until the token expires
+# or FIREBASE_TOKEN_CACHE_TTL seconds, whichever is sooner. Set the size to 0 to disable.
+FIREBASE_TOKEN_CACHE_SIZE = int(os.environ.get('FIREBASE_TOKEN_CACHE_SIZE', '10000'))
+FIREBASE_TOKEN_CACHE_TTL = int(os.environ.get('FIREBASE_TOKEN_CACHE_TTL', '300'))  # seconds
+
 # File upload settings
+# Uploads stream to disk; anything past MAX_UPLOAD_SIZE is dropped and rejected before parsing
 FILE_UPLOAD_HANDLERS = [
-    'django.core.files.uploadhandler.MemoryFileUploadHandler',
-    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+    'backend.utils.upload_handlers.BoundedTemporaryFileUploadHandler',
 ]
 
 MAX_UPLOAD_SIZE = 10485760  # 10MB
 
+# Resume text extraction limits; parsing stops early once any is reached
+RESUME_MAX_PAGES = int(os.environ.get('RESUME_MAX_PAGES', '50'))
+RESUME_MAX_CHARS = int(os.environ.get('RESUME_MAX_CHARS', '500000'))
+RESUME_PARSE_TIMEOUT = float(os.environ.get('RESUME_PARSE_TIMEOUT', '10'))  # seconds
+
+# Cache of extraction results keyed by file SHA-256 and skill taxonomy version
+RESUME_CACHE_ENABLED = os.environ.get('RESUME_CACHE_ENABLED', 'True') == 'True'
+RESUME_CACHE_MAX_ENTRIES = int(os.environ.get('RESUME_CACHE_MAX_ENTRIES', '10000'))
+RESUME_CACHE_MAX_AGE = int(os.environ.get('RESUME_CACHE_MAX_AGE', str(30 * 24 * 60 * 60)))  # seconds
+
+# Resume processing queue
+# Uploads are parsed in the background when ?async=true is passed, or always when enabled here.
+# Set RESUME_WORKER_CONCURRENCY to 0 to leave jobs queued for `manage.py process_resume_jobs`.
+RESUME_PROCESSING_ASYNC = os.environ.get('RESUME_PROCESSING_ASYNC', 'False') == 'True'
+RESUME_WORKER_CONCURRENCY = int(os.environ.get('RESUME_WORKER_CONCURRENCY', '2'))
+
+# New-job notifications
+# Matching seekers are notified by a background dispatcher after the job commits.
+# Set JOB_NOTIFICATION_CONCURRENCY to 0 to fan out in the committing thread instead.
+JOB_NOTIFICATION_CONCURRENCY = int(os.environ.get('JOB_NOTIFICATION_CONCURRENCY', '1'))
+JOB_NOTIFICATION_BATCH_SIZE = int(os.environ.get('JOB_NOTIFICATION_BATCH_SIZE', '100'))
+JOB_NOTIFICATION_CHUNK_SIZE = int(os.environ.get('JOB_NOTIFICATION_CHUNK_SIZE', '2000'))  # seekers per query
+# WebSocket clients get the jobs that arrive within JOB_UPDATES_BATCH_WINDOW seconds in one
+# frame of at most JOB_UPDATES_MAX_BATCH jobs; a window of 0 sends each job on its own.
+JOB_UPDATES_BATCH_WINDOW = float(os.environ.get('JOB_UPDATES_BATCH_WINDOW', '0.25'))
+JOB_UPDATES_MAX_BATCH = int(os.environ.get('JOB_UPDATES_MAX_BATCH', '50'))
+
+# Job recommendations
+# Each seeker keeps their MATCHING_TOP_K best active jobs scoring above MATCHING_MIN_SCORE.
+# MATCHING_MIN_SCORE is raised to 30 if set lower: new jobs are only scored against seekers
+# sharing a skill or location with them, and anyone else scores at most 30.
+MATCHING_TOP_K = int(os.environ.get('MATCHING_TOP_K', '50'))
+MATCHING_MIN_SCORE = int(os.environ.get('MATCHING_MIN_SCORE', '30'))
+MATCHING_CONCURRENCY = int(os.environ.get('MATCHING_CONCURRENCY', '1'))
+
+# Text similarity index (memory-mapped files shared by every worker on the host)
+ML_INDEX_DIR = os.environ.get('ML_INDEX_DIR', os.path.join(BASE_DIR, 'ml_index'))
+
 # Channels Configuration
 ASGI_APPLICATION = 'backend.config.asgi.application'
 CHANNEL_LAYERS = {
@@ -3,6 +3,7 @@ Production settings for the AI JobChain project.
 """
 
 import os
+import dj_database_url
 from .base import *
 
 # SECURITY WARNING: don't run with debug turned on in production!
@@ -37,17 +38,29 @@ CORS_ALLOW_HEADERS = [
 ]
 
 # Database configuration for production
+# DATABASE_URL selects the primary (SQLite next to the code when unset). Connections are
+# reused for DB_CONN_MAX_AGE seconds and health-checked before each reuse.
+# DATABASE_REPLICA_URLS is an optional comma-separated list of read replicas; GET and HEAD
+# requests read from them until they write (see backend/utils/database.py).
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', '600'))  # seconds
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': dj_database_url.config(
+        default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=True,
+    ),
 }
 
-# If you want to use PostgreSQL on Render (recommended for production)
-# DATABASES = {
-#     'default': dj_database_url.parse(os.environ.get('DATABASE_URL'))
-# }
+_replica_urls = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+for _index, _url in enumerate(_replica_urls, start=1):
+    DATABASES[f'replica_{_index}'] = dj_database_url.parse(
+        _url, conn_max_age=DB_CONN_MAX_AGE, conn_health_checks=True, test_options={'MIRROR': 'default'},
+    )
+
+if _replica_urls:
+    DATABASE_ROUTERS = ['backend.utils.database.ReplicaRouter']
+    MIDDLEWARE = ['backend.utils.database.ReplicaReadsMiddleware'] + MIDDLEWARE
 
 # Static files configuration
 STATIC_URL = '/static/'
@@ -4,24 +4,44 @@ from django.urls import path
 from backend.apps.users.views import (
     JobSeekerProfileView,
     GetProfileView,
+    ProfileBatchView,
     JobSeekerProfileUpdateView,
     ResumeUploadView,
+    ResumeJobStatusView,
     ExtractedSkillsView,
     UserSkillsUpdateView,
 )
-from backend.apps.jobs.views import create_job, list_jobs, get_job
+from backend.apps.jobs.views import create_job, list_jobs, search_jobs, export_jobs, get_job
+from backend.apps.applications.views import export_applications
+from backend.apps.matching.views import recommended_jobs, similar_jobs, resume_jobs
+from backend.utils.metrics import metrics_view
 
 urlpatterns = [
     # Profile Management
     path('api/users/profile/', JobSeekerProfileView.as_view(), name='user-profile'),
+    path('api/users/profiles/batch/', ProfileBatchView.as_view(), name='profile-batch'),
     path('api/users/<uuid:user_id>/profile/', GetProfileView.as_view(), name='get-user-profile'),
     path('api/users/job-seeker-profile/', JobSeekerProfileUpdateView.as_view(), name='job-seeker-profile'),
     path('api/users/upload-resume/', ResumeUploadView.as_view(), name='upload-resume'),
+    path('api/users/resume-jobs/<uuid:job_id>/', ResumeJobStatusView.as_view(), name='resume-job-status'),
     path('api/users/<uuid:user_id>/extracted-skills/', ExtractedSkillsView.as_view(), name='extracted-skills'),
     path('api/users/skills/', UserSkillsUpdateView.as_view(), name='user-skills'),
     
     # Job Management
     path('api/jobs/', create_job, name='create-job'),
     path('api/jobs/list/', list_jobs, name='list-jobs'),
+    path('api/jobs/search/', search_jobs, name='search-jobs'),
+    path('api/jobs/export/', export_jobs, name='export-jobs'),
     path('api/jobs/<uuid:job_id>/', get_job, name='get-job'),
+    
+    # Applications
+    path('api/applications/export/', export_applications, name='export-applications'),
+    
+    # Matching
+    path('api/matching/recommended/', recommended_jobs, name='recommended-jobs'),
+    path('api/matching/similar-jobs/<uuid:job_id>/', similar_jobs, name='similar-jobs'),
+    path('api/matching/resume-jobs/', resume_jobs, name='resume-jobs'),
+    
+    # Operations
+    path('api/metrics/', metrics_view, name='metrics'),
 ]
@@ -1,2 +1,209 @@
 # job_matcher.py
 # Service for matching jobs to candidates
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from backend.apps.jobs.models import Job
+from backend.utils.pagination import keyset_chunks
+
+# Scores above this are worth notifying a seeker about
+MATCH_THRESHOLD = 60
+
+# Rank of each experience level; levels one rank apart count as a near match
+EXPERIENCE_RANKS = {level: rank for rank, (level, _) in enumerate(Job.EXPERIENCE_LEVELS)}
+
+# Number of set bits in every byte value
+POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+# Seekers unpacked per block when scoring a batch of jobs
+BATCH_BLOCK_SIZE = 65536
+
+# Profiles read per query when streaming seekers
+SEEKER_CHUNK_SIZE = 2000
+
+# Profile fields a SeekerMatrix is built from, in row order
+SEEKER_FIELDS = (
+    'user_id', 'extracted_skills', 'experience_level',
+    'current_location', 'preferred_locations', 'preferred_job_type',
+)
+
+
+def seeker_locations(current_location, preferred_locations) -> List[str]:
+    """Lowercased locations a seeker wants to work in"""
+    locations = [current_location] + list(preferred_locations or [])
+    return [location.lower() for location in locations if isinstance(location, str) and location.strip()]
+
+
+class _Codes:
+    """Maps strings to small integer codes"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes = {}
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class SeekerMatrix:
+    """
+    Column-oriented snapshot of every job seeker's matching attributes
+
+    Skills are stored as one packed bitset per seeker over a shared skill
+    vocabulary, locations as (seeker, location code) postings and experience
+    level and preferred job type as integer codes. Scoring a job is then a
+    handful of NumPy operations over all seekers, with the same results as
+    calculate_job_match in backend/apps/jobs/signals.py.
+    """
+
+    def __init__(self, rows: Iterable[Sequence]):
+        """
+        Args:
+            rows: (user_id, extracted_skills, experience_level, current_location,
+                preferred_locations, preferred_job_type) per seeker
+        """
+        self.skill_columns = {}
+        levels = _Codes()
+        job_types = _Codes()
+        self._locations = _Codes()
+
+        user_ids = []
+        skill_rows, skill_cols = [], []
+        location_rows, location_codes = [], []
+        experience, preferred_job_types = [], []
+        for row, (user_id, skills, level, current_location, preferred_locations, job_type) in enumerate(rows):
+            user_ids.append(user_id)
+            for skill in {skill.lower() for skill in skills or []}:
+                skill_rows.append(row)
+                skill_cols.append(self.skill_columns.setdefault(skill, len(self.skill_columns)))
+            for location in set(seeker_locations(current_location, preferred_locations)):
+                location_rows.append(row)
+                location_codes.append(self._locations.encode(location))
+            experience.append(levels.encode(level) if level else -1)
+            preferred_job_types.append(job_types.encode(job_type) if job_type else -1)
+
+        self.user_ids = np.array(user_ids, dtype=object)
+        self.size = len(user_ids)
+
+        # One bit per (seeker, skill), eight skills to a byte
+        self.skill_bytes = max((len(self.skill_columns) + 7) // 8, 1)
+        self.skills = np.zeros((self.size, self.skill_bytes), dtype=np.uint8)
+        skill_rows = np.array(skill_rows, dtype=np.int64)
+        skill_cols = np.array(skill_cols, dtype=np.int64)
+        np.bitwise_or.at(self.skills, (skill_rows, skill_cols >> 3), (0x80 >> (skill_cols & 7)).astype(np.uint8))
+
+        self.location_rows = np.array(location_rows, dtype=np.int64)
+        self.location_codes = np.array(location_codes, dtype=np.int64)
+
+        self._levels = levels
+        self.experience = np.array(experience, dtype=np.int32)
+        # Rank of each seeker's level, -2 for unknown or missing levels (code -1
+        # picks the trailing entry) so nothing is "near" them
+        level_ranks = np.array([EXPERIENCE_RANKS.get(level, -2) for level in levels.values] + [-2], dtype=np.int32)
+        self.experience_ranks = level_ranks[self.experience]
+
+        self._job_types = job_types
+        self.job_types = np.array(preferred_job_types, dtype=np.int32)
+
+    @classmethod
+    def from_database(cls) -> 'SeekerMatrix':
+        """Build the matrix from every JobSeekerProfile"""
+        from backend.apps.users.models import JobSeekerProfile
+
+        chunks = keyset_chunks(JobSeekerProfile.objects.all(), SEEKER_FIELDS, chunk_size=SEEKER_CHUNK_SIZE)
+        return cls(row for chunk in chunks for row in chunk)
+
+    def score(self, job) -> np.ndarray:
+        """Match scores (0-100) of one job against every seeker, in user_ids order"""
+        job_skills = {skill.lower() for skill in job.extracted_skills or []}
+        scores = self._base_scores(job)
+        if job_skills:
+            mask = np.zeros(self.skill_bytes, dtype=np.uint8)
+            for skill in job_skills:
+                column = self.skill_columns.get(skill)
+                if column is not None:
+                    mask[column >> 3] |= 0x80 >> (column & 7)
+            # Only the bytes holding the job's skills can contribute
+            touched = np.flatnonzero(mask)
+            overlap = POPCOUNT[self.skills[:, touched] & mask[touched]].sum(axis=1, dtype=np.int64)
+            scores += (overlap / len(job_skills) * 40).astype(np.int32)
+        return np.minimum(scores, 100)
+
+    def score_many(self, jobs: Sequence) -> np.ndarray:
+        """
+        Match scores of several jobs against every seeker
+
+        Skill overlaps for the whole batch come from one matrix product per
+        block of seekers, which is much cheaper than scoring jobs one by one.
+
+        Returns:
+            Array of shape (len(jobs), number of seekers)
+        """
+        job_skills = [{skill.lower() for skill in job.extracted_skills or []} for job in jobs]
+        scores = np.stack([self._base_scores(job) for job in jobs]) if jobs else np.zeros((0, self.size), np.int32)
+
+        vocabulary = len(self.skill_columns)
+        wanted = np.zeros((len(jobs), vocabulary), dtype=np.float32)
+        for index, skills in enumerate(job_skills):
+            for skill in skills:
+                column = self.skill_columns.get(skill)
+                if column is not None:
+                    wanted[index, column] = 1
+        required = np.array([len(skills) for skills in job_skills], dtype=np.int64)
+
+        scored = required > 0
+        if vocabulary and scored.any():
+            for start in range(0, self.size, BATCH_BLOCK_SIZE):
+                block = np.unpackbits(self.skills[start:start + BATCH_BLOCK_SIZE], axis=1, count=vocabulary)
+                # Counts are small integers, so the float32 product is exact
+                overlap = (wanted[scored] @ block.astype(np.float32).T).astype(np.int64)
+                scores[scored, start:start + BATCH_BLOCK_SIZE] += (
+                    overlap / required[scored, None] * 40
+                ).astype(np.int32)
+        return np.minimum(scores, 100)
+
+    def matches(self, job, threshold: int = MATCH_THRESHOLD) -> List[Tuple[object, int]]:
+        """(user_id, score) for every seeker scoring above threshold"""
+        return self.above(self.score(job), threshold)
+
+    def above(self, scores: np.ndarray, threshold: int) -> List[Tuple[object, int]]:
+        """(user_id, score) for every entry of a score() result above threshold"""
+        hits = np.flatnonzero(scores > threshold)
+        return list(zip(self.user_ids[hits].tolist(), scores[hits].tolist()))
+
+    def _base_scores(self, job) -> np.ndarray:
+        """Location, experience and job type components of the score"""
+        scores = np.zeros(self.size, dtype=np.int32)
+
+        # Location match (30% weight)
+        if job.location and len(self.location_codes):
+            job_location = job.location.lower()
+            contained = np.fromiter(
+                (location in job_location for location in self._locations.values),
+                dtype=bool, count=len(self._locations.values),
+            )
+            located = np.zeros(self.size, dtype=bool)
+            located[self.location_rows[contained[self.location_codes]]] = True
+            scores += located * 30
+
+        # Experience level match (20% weight)
+        if job.experience_required:
+            same = self.experience == self._levels.codes.get(job.experience_required, -2)
+            rank = EXPERIENCE_RANKS.get(job.experience_required)
+            if rank is not None:
+                near = (self.experience_ranks >= 0) & (np.abs(self.experience_ranks - rank) <= 1)
+                scores += np.where(same, 20, np.where(near, 15, 0)).astype(np.int32)
+            else:
+                scores += same * 20
+
+        # Job type preference (10% weight)
+        if job.job_type:
+            scores += (self.job_types == self._job_types.codes.get(job.job_type, -2)) * 10
+
+        return scores
+
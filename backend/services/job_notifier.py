@@ -0,0 +1,122 @@
+# job_notifier.py
+# Background fan-out of new-job notifications to matching job seekers
+import asyncio
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from backend.apps.jobs.models import Job
+from backend.services import match_store
+from backend.services.job_matcher import MATCH_THRESHOLD, SEEKER_CHUNK_SIZE, SEEKER_FIELDS, SeekerMatrix
+from backend.services.seeker_index import candidate_profiles
+from backend.utils import metrics
+from backend.utils.pagination import keyset_chunks
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the process-wide dispatcher, or None to fan out inline after commit"""
+    global _executor
+    concurrency = getattr(settings, 'JOB_NOTIFICATION_CONCURRENCY', 1)
+    if concurrency <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='job-notifier')
+    return _executor
+
+
+def notify_new_job(job):
+    """Notify matching job seekers about a new job once the surrounding transaction commits"""
+    executor = get_executor()
+    if executor is not None:
+        transaction.on_commit(lambda: executor.submit(dispatch, job.id))
+    else:
+        transaction.on_commit(lambda: dispatch(job.id))
+
+
+def job_payload(job) -> dict:
+    """Job summary sent in new-job notifications"""
+    return {
+        'id': str(job.id),
+        'title': job.title,
+        'company': job.employer.company_name if job.employer else 'Unknown Company',
+        'location': job.location,
+        'salary_range': f"${job.salary_min:,} - ${job.salary_max:,}" if job.salary_min and job.salary_max else 'Not specified',
+        'job_type': job.job_type,
+        'posted_date': job.created_at.isoformat(),
+        'description': job.description[:200] + '...' if len(job.description) > 200 else job.description,
+    }
+
+
+def dispatch(job_id) -> int:
+    """
+    Score a job against its candidate seekers, send each good match a
+    job_update and add the job to the seekers' recommendations
+
+    Returns:
+        Number of notifications sent
+    """
+    close_old_connections()
+    started = time.perf_counter()
+    try:
+        job = Job.objects.select_related('employer').get(id=job_id)
+        # Encoded once here; consumers splice the JSON into their frames as-is
+        job_json = json.dumps(job_payload(job))
+        chunk_size = getattr(settings, 'JOB_NOTIFICATION_CHUNK_SIZE', SEEKER_CHUNK_SIZE)
+
+        # Stream candidates as (user_id, skills, ...) tuples one keyset page
+        # at a time, so memory stays flat however many seekers match
+        sent = 0
+        for rows in keyset_chunks(candidate_profiles(job), SEEKER_FIELDS, chunk_size=chunk_size):
+            matrix = SeekerMatrix(rows)
+            scores = matrix.score(job)
+            matches = matrix.above(scores, MATCH_THRESHOLD)
+            if matches:
+                _send(job_json, matches)
+                sent += len(matches)
+            if job.is_active:
+                match_store.record_job_matches(job.id, matrix.above(scores, match_store.min_score()))
+
+        elapsed = time.perf_counter() - started
+        metrics.incr('job_notifications.jobs')
+        metrics.incr('job_notifications.sent', sent)
+        metrics.incr('job_notifications.fanout_seconds', elapsed)
+        logger.info('Notified %d seekers about job %s in %.1f ms', sent, job_id, elapsed * 1000)
+        return sent
+    except Exception:
+        metrics.incr('job_notifications.failed')
+        logger.exception('Notification fan-out for job %s failed', job_id)
+        return 0
+    finally:
+        close_old_connections()
+
+
+def _send(job_json, matches):
+    """Send group messages concurrently, JOB_NOTIFICATION_BATCH_SIZE at a time, in one event loop"""
+    channel_layer = get_channel_layer()
+    batch_size = max(getattr(settings, 'JOB_NOTIFICATION_BATCH_SIZE', 100), 1)
+
+    async def send_all():
+        for start in range(0, len(matches), batch_size):
+            await asyncio.gather(*(
+                channel_layer.group_send(f'user_{user_id}', {
+                    'type': 'job_update',
+                    'job_json': job_json,
+                    'match_score': match_score
+                })
+                for user_id, match_score in matches[start:start + batch_size]
+            ))
+
+    async_to_sync(send_all)()
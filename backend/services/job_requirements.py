@@ -0,0 +1,47 @@
+# job_requirements.py
+# Service for extracting skill requirements from job descriptions
+import hashlib
+
+from backend.services.skill_extractor import extract_requirements, get_skill_index
+
+
+def description_hash(description: str) -> str:
+    """Return the SHA-256 of a job description"""
+    return hashlib.sha256((description or '').encode('utf-8')).hexdigest()
+
+
+def refresh_job_requirements(job) -> bool:
+    """
+    Fill job.extracted_skills and extracted_requirements from its description
+
+    Extraction is skipped when the description is unchanged since the last
+    run. Does not save the job.
+
+    Returns:
+        True if the requirements were re-extracted
+    """
+    digest = description_hash(job.description)
+    if digest == job.description_hash:
+        return False
+
+    requirements = extract_requirements(job.description or '', get_skill_index().matcher)
+    job.extracted_skills = requirements['skills']
+    job.extracted_requirements = requirements
+    job.description_hash = digest
+    return True
+
+
+def sync_job_skills(job):
+    """Make the job's JobSkill rows match its extracted skills"""
+    from backend.apps.jobs.models import JobSkill
+
+    # Built-in keywords without a Skill row have no ID to link to
+    skill_ids = get_skill_index().skill_ids
+    wanted = {skill_ids[name] for name in job.extracted_skills if name in skill_ids}
+
+    existing = set(JobSkill.objects.filter(job=job).values_list('skill_id', flat=True))
+    JobSkill.objects.filter(job=job).exclude(skill_id__in=wanted).delete()
+    JobSkill.objects.bulk_create([
+        JobSkill(job=job, skill_id=skill_id, importance='required', min_proficiency='intermediate')
+        for skill_id in wanted - existing
+    ])
@@ -0,0 +1,196 @@
+# match_store.py
+# Persisted top-K job recommendations for each job seeker
+import logging
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from backend.apps.jobs.models import Job
+from backend.apps.matching.models import JobMatch
+from backend.apps.users.models import JobSeekerProfile
+from backend.services.job_matcher import SEEKER_CHUNK_SIZE, SEEKER_FIELDS, SeekerMatrix
+from backend.services.seeker_index import NON_CANDIDATE_MAX_SCORE, candidate_profiles
+from backend.utils.pagination import keyset_chunks
+
+logger = logging.getLogger(__name__)
+
+# Job fields the matcher reads
+JobRow = namedtuple('JobRow', ['id', 'extracted_skills', 'experience_required', 'location', 'job_type'])
+
+# Active jobs scored per batch when rescoring seekers
+JOB_CHUNK_SIZE = 500
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def top_k() -> int:
+    return getattr(settings, 'MATCHING_TOP_K', 50)
+
+
+def min_score() -> int:
+    # New jobs are only scored against candidate_profiles(), so lower
+    # scores could never be recorded
+    return max(getattr(settings, 'MATCHING_MIN_SCORE', 30), NON_CANDIDATE_MAX_SCORE)
+
+
+def get_executor():
+    """Return the process-wide updater pool, or None to update inline after commit"""
+    global _executor
+    concurrency = getattr(settings, 'MATCHING_CONCURRENCY', 1)
+    if concurrency <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='match-store')
+    return _executor
+
+
+def schedule(func, *args):
+    """Run a store update once the surrounding transaction commits"""
+    def run():
+        close_old_connections()
+        try:
+            func(*args)
+        except Exception:
+            logger.exception('Match store update %s%r failed', func.__name__, args)
+        finally:
+            close_old_connections()
+
+    executor = get_executor()
+    transaction.on_commit((lambda: executor.submit(run)) if executor is not None else run)
+
+
+def lock_seekers(user_ids: Iterable):
+    """
+    Lock some seekers' profile rows until the surrounding transaction ends
+
+    Every write to a seeker's recommendations takes this lock first, so a
+    new job recorded while the seeker is being rescored is not lost.
+    """
+    list(
+        JobSeekerProfile.objects.select_for_update()
+        .filter(user_id__in=list(user_ids)).order_by('id').values_list('id', flat=True)
+    )
+
+
+def record_job_matches(job_id, matches: List[Tuple[object, int]]):
+    """
+    Add a newly scored job to the recommendations of the seekers it matched
+
+    Args:
+        job_id: Job that was scored
+        matches: (user_id, score) pairs scoring above MATCHING_MIN_SCORE
+    """
+    if not matches:
+        return
+    user_ids = [user_id for user_id, _ in matches]
+    with transaction.atomic():
+        lock_seekers(user_ids)
+        JobMatch.objects.bulk_create(
+            [JobMatch(user_id=user_id, job_id=job_id, score=score) for user_id, score in matches],
+            update_conflicts=True,
+            unique_fields=['user', 'job'],
+            update_fields=['score', 'updated_at'],
+        )
+        trim(user_ids)
+
+
+def trim(user_ids: Iterable):
+    """Drop everything below each seeker's top MATCHING_TOP_K matches"""
+    ranked = JobMatch.objects.filter(user_id__in=list(user_ids)).annotate(
+        rank=Window(RowNumber(), partition_by=[F('user_id')], order_by=[F('score').desc(), F('id')])
+    )
+    surplus = list(ranked.filter(rank__gt=top_k()).values_list('id', flat=True))
+    if surplus:
+        JobMatch.objects.filter(id__in=surplus).delete()
+
+
+@transaction.atomic
+def rescore_seekers(user_ids: Iterable):
+    """
+    Recompute the recommendations of some seekers from scratch
+
+    Every active job is scored against the seekers in batches, keeping a
+    running top-K per seeker, so memory is bounded by the batch size. The
+    seekers stay locked throughout (see lock_seekers).
+    """
+    user_ids = list(user_ids)
+    lock_seekers(user_ids)
+    limit = top_k()
+    matrix = SeekerMatrix(JobSeekerProfile.objects.filter(user_id__in=user_ids).values_list(*SEEKER_FIELDS))
+
+    job_ids = []
+    best_scores = np.zeros((0, matrix.size), dtype=np.int32)
+    best_jobs = np.zeros((0, matrix.size), dtype=np.int64)
+    if matrix.size:
+        for chunk in keyset_chunks(Job.objects.filter(is_active=True), JobRow._fields, JOB_CHUNK_SIZE, key='id'):
+            jobs = [JobRow(*row) for row in chunk]
+            positions = np.arange(len(job_ids), len(job_ids) + len(jobs), dtype=np.int64)
+            job_ids.extend(job.id for job in jobs)
+
+            scores = np.concatenate([best_scores, matrix.score_many(jobs)])
+            indexes = np.concatenate([best_jobs, np.repeat(positions[:, None], matrix.size, axis=1)])
+            order = np.argsort(-scores, axis=0, kind='stable')[:limit]
+            best_scores = np.take_along_axis(scores, order, axis=0)
+            best_jobs = np.take_along_axis(indexes, order, axis=0)
+
+    ranks, seekers = np.nonzero(best_scores > min_score())
+    matches = [
+        JobMatch(
+            user_id=matrix.user_ids[seeker],
+            job_id=job_ids[best_jobs[rank, seeker]],
+            score=int(best_scores[rank, seeker]),
+        )
+        for rank, seeker in zip(ranks.tolist(), seekers.tolist())
+    ]
+    JobMatch.objects.filter(user_id__in=user_ids).delete()
+    JobMatch.objects.bulk_create(matches)
+
+
+def rescore_in_chunks(user_ids: List):
+    """rescore_seekers() a bounded number of seekers at a time"""
+    for start in range(0, len(user_ids), SEEKER_CHUNK_SIZE):
+        rescore_seekers(user_ids[start:start + SEEKER_CHUNK_SIZE])
+
+
+def add_job(job_id):
+    """Score an active job against its candidate seekers and add it to their recommendations"""
+    job = Job.objects.filter(id=job_id, is_active=True).only(*JobRow._fields).first()
+    if job is None:
+        return
+    for rows in keyset_chunks(candidate_profiles(job), SEEKER_FIELDS, chunk_size=SEEKER_CHUNK_SIZE):
+        record_job_matches(job.id, SeekerMatrix(rows).matches(job, min_score()))
+
+
+def rescore_job(job_id):
+    """Bring a job's scores up to date after the fields the matcher reads changed"""
+    affected = list(JobMatch.objects.filter(job_id=job_id).values_list('user_id', flat=True))
+    JobMatch.objects.filter(job_id=job_id).delete()
+    add_job(job_id)
+    # A lower score can let a job that was trimmed away back into these lists
+    rescore_in_chunks(affected)
+
+
+def remove_job(job_id, user_ids: Iterable = None):
+    """
+    Take a deactivated or deleted job out of every recommendation list and
+    refill the lists it left
+
+    Args:
+        job_id: Job to remove
+        user_ids: Seekers whose lists held the job, for a deleted job whose
+            matches are already gone; read from the matches by default
+    """
+    if user_ids is None:
+        user_ids = JobMatch.objects.filter(job_id=job_id).values_list('user_id', flat=True)
+    affected = list(user_ids)
+    JobMatch.objects.filter(job_id=job_id).delete()
+    rescore_in_chunks(affected)
@@ -1,2 +1,416 @@
 # ml_pipeline.py
 # Machine learning pipeline for job matching
+import json
+import os
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from django.conf import settings
+
+from backend.utils.text_processor import TOKEN_RE, normalize
+
+# Size of the hashed feature space
+N_FEATURES = 1 << 18
+
+# Only the strongest query terms are looked up
+MAX_QUERY_FEATURES = 100
+
+# Terms in more than this share of documents are skipped at query time once
+# the index is large; they carry little weight but have the longest postings
+MAX_DF = 0.5
+MAX_DF_MIN_DOCS = 1000
+
+# Documents held in the delta segment before it is merged into the main one
+DELTA_LIMIT = 2000
+
+KEY_DTYPE = 'S36'
+SEGMENT_ARRAYS = ('keys', 'norms', 'indptr', 'docs', 'tf')
+
+
+def term_counts(text: str) -> Dict[str, int]:
+    """Number of times each token occurs in a text"""
+    return dict(Counter(TOKEN_RE.findall(normalize(text or ''))))
+
+
+def vectorize(text: Union[str, Mapping[str, int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash a text's tokens, or its term_counts(), into the feature space
+
+    Returns:
+        (sorted feature ids, sublinear term frequencies 1 + log(count))
+    """
+    counts = text if isinstance(text, Mapping) else term_counts(text)
+    if not counts:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+    # crc32 rather than hash(), which is salted per process
+    hashed = np.fromiter(
+        (zlib.crc32(token.encode('utf-8')) & (N_FEATURES - 1) for token in counts),
+        dtype=np.int32, count=len(counts),
+    )
+    # Distinct tokens can share a hash bucket
+    features, inverse = np.unique(hashed, return_inverse=True)
+    totals = np.bincount(inverse, weights=np.fromiter(counts.values(), dtype=np.float64, count=len(counts)))
+    return features.astype(np.int32), (1 + np.log(totals)).astype(np.float32)
+
+
+def inverse_document_frequency(df: np.ndarray, n_docs: int) -> np.ndarray:
+    """Smoothed idf, as in scikit-learn"""
+    return (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+
+
+class _Segment:
+    """
+    Documents in compressed sparse column form
+
+    For each feature f, docs[indptr[f]:indptr[f + 1]] are the documents
+    containing it and tf the matching term frequencies. norms holds each
+    document's TF-IDF vector length under the index's idf.
+    """
+
+    def __init__(self, keys, norms, indptr, docs, tf):
+        self.keys = keys
+        self.norms = norms
+        self.indptr = indptr
+        self.docs = docs
+        self.tf = tf
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def empty(cls) -> '_Segment':
+        return cls.build([], np.zeros(0, np.int32), np.zeros(0, np.int32), np.zeros(0, np.float32),
+                         np.ones(N_FEATURES, np.float32))
+
+    @classmethod
+    def build(cls, keys: Sequence[bytes], doc_ids: np.ndarray, features: np.ndarray,
+              tf: np.ndarray, idf: np.ndarray) -> '_Segment':
+        """Build a segment from (document, feature, tf) triplets"""
+        order = np.argsort(features, kind='stable')
+        indptr = np.zeros(N_FEATURES + 1, dtype=np.int64)
+        np.cumsum(np.bincount(features, minlength=N_FEATURES), out=indptr[1:])
+        norms = np.sqrt(np.bincount(doc_ids, weights=(tf * idf[features]) ** 2, minlength=len(keys)))
+        norms[norms == 0] = 1
+        return cls(
+            np.array(keys, dtype=KEY_DTYPE), norms.astype(np.float32), indptr,
+            doc_ids[order].astype(np.int32), tf[order].astype(np.float32),
+        )
+
+    def triplets(self, keep: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The segment as (keys, document ids, features, tf), optionally only for kept documents
+
+        Document ids are renumbered to positions in the returned keys.
+        """
+        doc_ids = np.asarray(self.docs)
+        features = np.repeat(np.arange(N_FEATURES, dtype=np.int32), np.diff(self.indptr))
+        tf = np.asarray(self.tf)
+        keys = np.asarray(self.keys)
+        if keep is not None:
+            renumber = np.cumsum(keep) - 1
+            kept = keep[doc_ids]
+            doc_ids, features, tf = renumber[doc_ids[kept]].astype(np.int32), features[kept], tf[kept]
+            keys = keys[keep]
+        return keys, doc_ids, features, tf
+
+    def scores(self, features: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Dot products of every document with a query, divided by the document norms"""
+        starts = self.indptr[features]
+        lengths = self.indptr[features + 1] - starts
+        if not lengths.sum():
+            return np.zeros(len(self), dtype=np.float64)
+        positions = np.concatenate([np.arange(start, start + length) for start, length in zip(starts, lengths)])
+        values = self.tf[positions] * np.repeat(weights, lengths)
+        return np.bincount(self.docs[positions], weights=values, minlength=len(self)) / self.norms
+
+    def save(self, prefix: str):
+        for name in SEGMENT_ARRAYS:
+            np.save(f'{prefix}-{name}.npy', getattr(self, name))
+
+    @classmethod
+    def load(cls, prefix: str) -> '_Segment':
+        return cls(*(np.load(f'{prefix}-{name}.npy', mmap_mode='r') for name in SEGMENT_ARRAYS))
+
+
+class _State:
+    """One published version of an index"""
+
+    def __init__(self, manifest, directory):
+        self.manifest = manifest
+        if manifest is None:
+            self.main = self.delta = _Segment.empty()
+            self.idf = np.ones(N_FEATURES, dtype=np.float32)
+            self.df = np.zeros(N_FEATURES, dtype=np.int32)
+            self.deleted = np.zeros(0, dtype=KEY_DTYPE)
+        else:
+            self.main = _Segment.load(os.path.join(directory, manifest['main']))
+            self.delta = _Segment.load(os.path.join(directory, manifest['delta']))
+            self.idf = np.load(os.path.join(directory, f"{manifest['main']}-idf.npy"), mmap_mode='r')
+            self.df = np.load(os.path.join(directory, f"{manifest['main']}-df.npy"), mmap_mode='r')
+            self.deleted = np.load(os.path.join(directory, f"{manifest['delta']}-deleted.npy"))
+        # Main documents that were deleted or replaced by a newer copy in the delta
+        self.main_live = ~np.isin(self.main.keys, np.concatenate([self.deleted, np.asarray(self.delta.keys)]))
+        self.n_main = int(manifest['n_main']) if manifest else 0
+
+    def __len__(self):
+        return int(self.main_live.sum()) + len(self.delta)
+
+    def contains(self, key: bytes) -> bool:
+        return bool((np.asarray(self.delta.keys) == key).any() or (np.asarray(self.main.keys)[self.main_live] == key).any())
+
+
+class _WriteLock:
+    """Cross-process lock held while an index is being changed"""
+
+    def __init__(self, path: str, stale_after: float = 300):
+        self.path = path
+        self.stale_after = stale_after
+
+    def __enter__(self):
+        while True:
+            try:
+                os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return self
+            except FileExistsError:
+                try:
+                    # A writer that died leaves its lock behind
+                    if time.time() - os.path.getmtime(self.path) > self.stale_after:
+                        os.remove(self.path)
+                except OSError:
+                    pass
+                time.sleep(0.05)
+
+    def __exit__(self, *exc):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class TfidfIndex:
+    """
+    Hashed TF-IDF index answering cosine top-K queries
+
+    Documents live in two segments of memory-mapped .npy files: a large main
+    segment rebuilt only when the delta segment outgrows DELTA_LIMIT, and a
+    small delta segment rewritten on every add or delete. Every worker maps
+    the same files, so the index is shared without being copied. A change is
+    published by atomically replacing manifest.json; readers notice the new
+    manifest on their next query. Term weights use the idf computed when the
+    main segment was last rebuilt.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._state = None
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, 'manifest.json')
+
+    def state(self) -> _State:
+        """The latest published version of the index"""
+        try:
+            stat = os.stat(self.manifest_path)
+            stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            stamp = None
+        with self._lock:
+            if self._state is None or stamp != self._stamp:
+                manifest = None
+                if stamp is not None:
+                    with open(self.manifest_path) as manifest_file:
+                        manifest = json.load(manifest_file)
+                self._state = _State(manifest, self.directory)
+                self._stamp = stamp
+            return self._state
+
+    def __len__(self):
+        return len(self.state())
+
+    def query(self, text: Union[str, Mapping[str, int]], k: int = 10,
+              exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """
+        Documents most similar to a text or its term_counts()
+
+        Returns:
+            Up to k (key, cosine similarity) pairs, most similar first
+        """
+        state = self.state()
+        features, tf = vectorize(text)
+        if not len(features) or not len(state):
+            return []
+
+        if len(state) >= MAX_DF_MIN_DOCS:
+            common = state.df[features] > MAX_DF * state.n_main
+            features, tf = features[~common], tf[~common]
+        weights = tf * state.idf[features]
+        if len(features) > MAX_QUERY_FEATURES:
+            strongest = np.argpartition(-weights, MAX_QUERY_FEATURES)[:MAX_QUERY_FEATURES]
+            features, weights = features[strongest], weights[strongest]
+        norm = np.linalg.norm(weights)
+        if not norm:
+            return []
+        # Document weights are tf * idf / norm, so fold the idf into the query side
+        weights = weights / norm * state.idf[features]
+
+        exclude = {key.encode() if isinstance(key, str) else key for key in exclude}
+        wanted = k + len(exclude)
+        results = []
+        for segment, live in ((state.main, state.main_live), (state.delta, None)):
+            if not len(segment):
+                continue
+            scores = segment.scores(features, weights)
+            if live is not None:
+                scores[~live] = 0
+            top = np.flatnonzero(scores > 0)
+            if len(top) > wanted:
+                top = top[np.argpartition(-scores[top], wanted)[:wanted]]
+            results.extend((float(scores[doc]), segment.keys[doc]) for doc in top)
+
+        results.sort(key=lambda result: -result[0])
+        return [(key.decode(), round(score, 6)) for score, key in results if key not in exclude][:k]
+
+    def add(self, documents: Iterable[Tuple[str, str]]):
+        """Add or replace documents given as (key, text) pairs"""
+        documents = {key.encode(): vectorize(text) for key, text in documents}
+        if documents:
+            self._change(documents, set())
+
+    def delete(self, keys: Iterable[str]):
+        """Remove documents; unknown keys are ignored"""
+        state = self.state()
+        keys = {key.encode() for key in keys}
+        keys = {key for key in keys if state.contains(key)}
+        if keys:
+            self._change({}, keys)
+
+    def rebuild(self, documents: Iterable[Tuple[str, str]]):
+        """Replace the whole index with the given (key, text) pairs"""
+        os.makedirs(self.directory, exist_ok=True)
+        with _WriteLock(os.path.join(self.directory, 'write.lock')):
+            keys, doc_ids, features, tf = [], [np.zeros(0, np.int32)], [np.zeros(0, np.int32)], [np.zeros(0, np.float32)]
+            for key, text in documents:
+                doc_features, doc_tf = vectorize(text)
+                doc_ids.append(np.full(len(doc_features), len(keys), dtype=np.int32))
+                keys.append(key.encode())
+                features.append(doc_features)
+                tf.append(doc_tf)
+            self._publish_main(
+                self.state(), np.array(keys, dtype=KEY_DTYPE),
+                np.concatenate(doc_ids), np.concatenate(features), np.concatenate(tf),
+            )
+
+    def _change(self, added, deleted):
+        os.makedirs(self.directory, exist_ok=True)
+        with _WriteLock(os.path.join(self.directory, 'write.lock')):
+            state = self.state()
+            replaced = set(added) | deleted
+
+            # Delta documents that survive, plus the new ones
+            delta_keep = ~np.isin(state.delta.keys, np.array(sorted(replaced), dtype=KEY_DTYPE))
+            keys, doc_ids, features, tf = state.delta.triplets(delta_keep)
+            new_keys = list(added)
+            for position, key in enumerate(new_keys, start=len(keys)):
+                doc_features, doc_tf = added[key]
+                doc_ids = np.concatenate([doc_ids, np.full(len(doc_features), position, dtype=np.int32)])
+                features = np.concatenate([features, doc_features])
+                tf = np.concatenate([tf, doc_tf])
+            keys = np.concatenate([keys, np.array(new_keys, dtype=KEY_DTYPE)])
+
+            main_deleted = np.union1d(state.deleted, np.array(sorted(deleted), dtype=KEY_DTYPE))
+            if len(keys) > DELTA_LIMIT or not state.n_main:
+                # Fold the delta into a new main segment
+                main_live = state.main_live & ~np.isin(state.main.keys, main_deleted)
+                main_keys, main_docs, main_features, main_tf = state.main.triplets(main_live)
+                self._publish_main(
+                    state,
+                    np.concatenate([main_keys, keys]),
+                    np.concatenate([main_docs, doc_ids + len(main_keys)]),
+                    np.concatenate([main_features, features]),
+                    np.concatenate([main_tf, tf]),
+                )
+            else:
+                delta = _Segment.build(keys, doc_ids, features, tf, np.asarray(state.idf))
+                self._publish(state, state.manifest['main'], state.n_main, delta, main_deleted)
+
+    def _publish_main(self, state, keys, doc_ids, features, tf):
+        """Write a new main segment with freshly computed idf and an empty delta"""
+        df = np.bincount(features, minlength=N_FEATURES).astype(np.int32)
+        idf = inverse_document_frequency(df, len(keys))
+        prefix = self._new_prefix(state, 'main')
+        _Segment.build(keys, doc_ids, features, tf, idf).save(os.path.join(self.directory, prefix))
+        np.save(os.path.join(self.directory, f'{prefix}-idf.npy'), idf)
+        np.save(os.path.join(self.directory, f'{prefix}-df.npy'), df)
+        empty = _Segment.build([], np.zeros(0, np.int32), np.zeros(0, np.int32), np.zeros(0, np.float32), idf)
+        self._publish(state, prefix, len(keys), empty, np.zeros(0, dtype=KEY_DTYPE))
+
+    def _publish(self, state, main_prefix, n_main, delta, deleted):
+        delta_prefix = self._new_prefix(state, 'delta')
+        delta.save(os.path.join(self.directory, delta_prefix))
+        np.save(os.path.join(self.directory, f'{delta_prefix}-deleted.npy'), deleted)
+
+        previous = state.manifest or {}
+        manifest = {
+            'version': previous.get('version', 0) + 1,
+            'main': main_prefix,
+            'delta': delta_prefix,
+            'n_main': n_main,
+        }
+        temporary = f'{self.manifest_path}.tmp'
+        with open(temporary, 'w') as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(temporary, self.manifest_path)
+        self._cleanup({manifest['main'], manifest['delta'], previous.get('main'), previous.get('delta')})
+
+    def _new_prefix(self, state, kind):
+        version = (state.manifest or {}).get('version', 0) + 1
+        return f'{kind}-{version}'
+
+    def _cleanup(self, keep):
+        """Remove files of versions older than the previous one, which readers may still have open"""
+        for name in os.listdir(self.directory):
+            if name.endswith('.npy') and name.rsplit('-', 1)[0] not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    # Still mapped by a reader on platforms that forbid this
+                    pass
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(name: str) -> TfidfIndex:
+    """Return the process-wide handle on a named index under ML_INDEX_DIR"""
+    with _indexes_lock:
+        if name not in _indexes:
+            _indexes[name] = TfidfIndex(os.path.join(settings.ML_INDEX_DIR, name))
+        return _indexes[name]
+
+
+def job_text(title: str, description: str) -> str:
+    """Text of a job as it goes into the job index"""
+    return f'{title}\n{description}'
+
+
+def index_jobs(job_ids: Iterable):
+    """Add or replace active jobs in the job index and remove inactive or deleted ones"""
+    from backend.apps.jobs.models import Job
+
+    job_ids = [str(job_id) for job_id in job_ids]
+    active = {
+        str(job_id): job_text(title, description)
+        for job_id, title, description in Job.objects.filter(id__in=job_ids, is_active=True)
+        .values_list('id', 'title', 'description')
+    }
+    index = get_index('jobs')
+    index.delete([job_id for job_id in job_ids if job_id not in active])
+    index.add(active.items())
@@ -0,0 +1,85 @@
+# resume_cache.py
+# Content-addressed cache of resume extraction results
+import hashlib
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+from backend.apps.users.models import ResumeExtractionCache
+from backend.utils import metrics
+
+
+def file_sha256(resume_file) -> str:
+    """
+    Return the SHA-256 of an uploaded file
+
+    Uses the digest computed while the upload streamed in when available,
+    otherwise reads the file in chunks and rewinds it.
+    """
+    digest = getattr(resume_file, 'sha256', None)
+    if digest:
+        return digest
+
+    sha256 = hashlib.sha256()
+    if hasattr(resume_file, 'chunks'):
+        for chunk in resume_file.chunks():
+            sha256.update(chunk)
+    else:
+        for chunk in iter(lambda: resume_file.read(64 * 1024), b''):
+            sha256.update(chunk)
+    resume_file.seek(0)
+    return sha256.hexdigest()
+
+
+def get(digest: str, taxonomy_version: str) -> Optional[Dict[str, Any]]:
+    """Return a cached extraction result, or None on a miss or an expired entry"""
+    entries = ResumeExtractionCache.objects.filter(
+        sha256=digest,
+        taxonomy_version=taxonomy_version,
+        created_at__gte=timezone.now() - timedelta(seconds=settings.RESUME_CACHE_MAX_AGE),
+    )
+    entry = entries.only('result').first()
+    if entry is None:
+        metrics.incr('resume_cache.misses')
+        return None
+
+    entries.update(hits=F('hits') + 1, last_used_at=timezone.now())
+    metrics.incr('resume_cache.hits')
+    return entry.result
+
+
+def put(digest: str, taxonomy_version: str, result: Dict[str, Any]):
+    """Store an extraction result and evict stale or surplus entries"""
+    try:
+        ResumeExtractionCache.objects.update_or_create(
+            sha256=digest,
+            taxonomy_version=taxonomy_version,
+            defaults={'result': result, 'created_at': timezone.now(), 'last_used_at': timezone.now()},
+        )
+    except IntegrityError:
+        # Another worker cached the same file concurrently
+        return
+    evict()
+
+
+def evict():
+    """Drop entries older than RESUME_CACHE_MAX_AGE and the least recently used beyond RESUME_CACHE_MAX_ENTRIES"""
+    expired_before = timezone.now() - timedelta(seconds=settings.RESUME_CACHE_MAX_AGE)
+    evicted, _ = ResumeExtractionCache.objects.filter(created_at__lt=expired_before).delete()
+
+    # Everything used no later than the first entry past the most recent MAX_ENTRIES
+    max_entries = settings.RESUME_CACHE_MAX_ENTRIES
+    cutoff = list(
+        ResumeExtractionCache.objects.order_by('-last_used_at')
+        .values_list('last_used_at', flat=True)[max_entries:max_entries + 1]
+    )
+    if cutoff:
+        surplus, _ = ResumeExtractionCache.objects.filter(last_used_at__lte=cutoff[0]).delete()
+        evicted += surplus
+
+    if evicted:
+        metrics.incr('resume_cache.evictions', evicted)
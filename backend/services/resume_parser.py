@@ -1,8 +1,10 @@
-import PyPDF2
-import docx
-import re
+from collections import Counter
 from typing import Dict, List, Any
-import io
+from django.conf import settings
+from backend.services import resume_cache
+from backend.services.skill_extractor import DEFAULT_SKILL_KEYWORDS, get_skill_index
+from backend.utils.resume_parser import ResumeText
+from backend.utils.text_processor import EXPERIENCE_PATTERNS, TOKEN_RE, analyze
 
 class ResumeProcessor:
     """
@@ -10,132 +12,114 @@ class ResumeProcessor:
     """
     
     def __init__(self):
-        self.skill_keywords = [
-            # Programming Languages
-            'python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift', 'kotlin',
-            'typescript', 'scala', 'r', 'matlab', 'perl', 'bash', 'powershell',
-            
-            # Frameworks & Libraries
-            'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'express', 'spring', 'laravel',
-            'asp.net', 'rails', 'fastapi', 'tornado', 'bootstrap', 'tailwind', 'material-ui',
-            'jquery', 'axios', 'lodash', 'moment', 'chart.js', 'd3.js',
-            
-            # Databases
-            'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 'sql server', 'mariadb',
-            'elasticsearch', 'cassandra', 'dynamodb', 'firebase',
-            
-            # Cloud & DevOps
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab', 'github actions',
-            'terraform', 'ansible', 'nginx', 'apache', 'linux', 'ubuntu', 'centos',
-            
-            # Data Science & ML
-            'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy', 'matplotlib', 'seaborn',
-            'jupyter', 'spark', 'hadoop', 'kafka', 'airflow', 'tableau', 'power bi',
-            
-            # Tools & Platforms
-            'git', 'svn', 'jira', 'confluence', 'slack', 'teams', 'zoom', 'figma', 'sketch',
-            'postman', 'swagger', 'graphql', 'rest api', 'soap', 'microservices',
-            
-            # Soft Skills
-            'leadership', 'communication', 'teamwork', 'problem solving', 'project management',
-            'agile', 'scrum', 'kanban', 'lean', 'six sigma', 'customer service', 'mentoring'
-        ]
-        
-        self.experience_patterns = [
-            r'(\d+)\s*(?:years?|yrs?)\s*(?:of\s*)?experience',
-            r'experience:\s*(\d+)\s*(?:years?|yrs?)',
-            r'(\d+)\s*(?:years?|yrs?)\s*in\s*(?:the\s*)?field',
-            r'worked\s*(?:for\s*)?(\d+)\s*(?:years?|yrs?)',
-        ]
+        self.skill_keywords = DEFAULT_SKILL_KEYWORDS
+        self.experience_patterns = EXPERIENCE_PATTERNS
+
+        # Shared, process-wide index compiled from the Skill taxonomy
+        self.skill_index = get_skill_index()
+        self.skill_matcher = self.skill_index.matcher
 
-    def process_resume(self, resume_file) -> Dict[str, Any]:
+    def process_resume(self, resume_file, use_cache: bool = True) -> Dict[str, Any]:
         """
         Process resume file and extract skills and experience
         
         Args:
             resume_file: Uploaded resume file
+            use_cache: Reuse the result for an identical file parsed with
+                the same skill taxonomy, and store it otherwise
             
         Returns:
             Dict containing extracted skills and experience
         """
         try:
-            # Extract text from resume
-            text = self._extract_text(resume_file)
-            
-            # Extract skills and experience
-            skills = self._extract_skills(text)
-            experience = self._extract_experience(text)
-            
-            return {
-                'skills': skills,
-                'experience': experience,
-                'text_length': len(text)
-            }
+            # Refuse oversized files before any parsing starts
+            max_size = getattr(settings, 'MAX_UPLOAD_SIZE', None)
+            if max_size and getattr(resume_file, 'size', 0) > max_size:
+                raise Exception(f"File exceeds the maximum upload size of {max_size // (1024 * 1024)}MB")
+
+            if not (use_cache and getattr(settings, 'RESUME_CACHE_ENABLED', False)):
+                return self._parse(resume_file)
+
+            digest = resume_cache.file_sha256(resume_file)
+            result = resume_cache.get(digest, self.skill_matcher.version)
+            if result is None:
+                result = self._parse(resume_file)
+                # A truncated result depends on the page and size limits in
+                # force, not only on the file, so it is not reused
+                if not result['truncated']:
+                    resume_cache.put(digest, self.skill_matcher.version, result)
+            return result
             
         except Exception as e:
             raise Exception(f"Failed to process resume: {str(e)}")
 
-    def _extract_text(self, resume_file) -> str:
-        """Extract text from different file formats"""
-        file_name = resume_file.name.lower()
-        
-        if file_name.endswith('.pdf'):
-            return self._extract_from_pdf(resume_file)
-        elif file_name.endswith(('.doc', '.docx')):
-            return self._extract_from_docx(resume_file)
-        else:
-            raise Exception("Unsupported file format. Please upload PDF or DOC/DOCX files.")
+    def _parse(self, resume_file) -> Dict[str, Any]:
+        """Extract skills and experience from the file contents"""
+        # Scan the resume page by page (or paragraph by paragraph)
+        # instead of materializing the whole text
+        text = self._open_text(resume_file)
+        skills = set()
+        pattern_years = {}
+        terms = Counter()
+        for chunk in text:
+            # One scan per chunk finds skills and experience mentions together
+            processed = analyze(chunk, self.skill_matcher, normalized=True, split=False)
+            skills.update(processed.skills)
+            for index, years in processed.experience_years.items():
+                pattern_years[index] = max(years, pattern_years.get(index, 0))
+            terms.update(TOKEN_RE.findall(chunk))
 
-    def _extract_from_pdf(self, pdf_file) -> str:
-        """Extract text from PDF file"""
-        try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.lower()
-        except Exception as e:
-            raise Exception(f"Failed to extract text from PDF: {str(e)}")
+        return {
+            'skills': sorted(skills),
+            'experience': self._summarize_experience(pattern_years),
+            # What the resume is matched against the job index with (see ml_pipeline.term_counts)
+            'terms': dict(terms),
+            'text_length': text.length,
+            'truncated': text.truncated
+        }
 
-    def _extract_from_docx(self, docx_file) -> str:
-        """Extract text from DOCX file"""
-        try:
-            doc = docx.Document(docx_file)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.lower()
-        except Exception as e:
-            raise Exception(f"Failed to extract text from DOCX: {str(e)}")
+    def extract_terms(self, resume_file) -> Dict[str, int]:
+        """Token counts of a resume, as stored in the 'terms' of a process_resume() result"""
+        terms = Counter()
+        for chunk in self._open_text(resume_file):
+            terms.update(TOKEN_RE.findall(chunk))
+        return dict(terms)
+
+    def _open_text(self, resume_file) -> ResumeText:
+        """Stream lowercased text from a PDF or DOC/DOCX file within the configured limits"""
+        return ResumeText(
+            resume_file,
+            max_pages=getattr(settings, 'RESUME_MAX_PAGES', None),
+            max_chars=getattr(settings, 'RESUME_MAX_CHARS', None),
+            timeout=getattr(settings, 'RESUME_PARSE_TIMEOUT', None),
+        )
+
+    def _extract_text(self, resume_file) -> str:
+        """Extract text from different file formats"""
+        return ''.join(self._open_text(resume_file))
 
     def _extract_skills(self, text: str) -> List[str]:
         """Extract skills from resume text"""
-        found_skills = []
-        
-        # Look for skill keywords in text
-        for skill in self.skill_keywords:
-            if skill in text:
-                found_skills.append(skill.title())
-        
-        # Remove duplicates and sort
-        found_skills = list(set(found_skills))
-        found_skills.sort()
-        
-        return found_skills
+        # One pass over the text; matches respect token boundaries and are
+        # returned as sorted, de-duplicated canonical names
+        return self.skill_matcher.extract(text)
 
     def _extract_experience(self, text: str) -> Dict[str, Any]:
         """Extract experience information from resume text"""
+        return self._summarize_experience(analyze(text, split=False).experience_years)
+
+    def _summarize_experience(self, pattern_years: Dict[int, int]) -> Dict[str, Any]:
+        """Build experience information from the first pattern that matched"""
         experience_info = {
             'total_years': 0,
             'experience_level': 'entry',
             'found_patterns': []
         }
         
-        # Look for experience patterns
-        for pattern in self.experience_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                years = max([int(match) for match in matches])
+        # Patterns are ordered by reliability; use the first one found
+        for index in range(len(self.experience_patterns)):
+            if index in pattern_years:
+                years = pattern_years[index]
                 experience_info['total_years'] = years
                 experience_info['found_patterns'].append(f"Found {years} years of experience")
                 
@@ -154,29 +138,4 @@ class ResumeProcessor:
 
     def get_skill_categories(self) -> Dict[str, List[str]]:
         """Get categorized skills for better organization"""
-        return {
-            'programming_languages': [
-                'python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift', 'kotlin',
-                'typescript', 'scala', 'r', 'matlab', 'perl', 'bash', 'powershell'
-            ],
-            'frameworks_libraries': [
-                'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'express', 'spring', 'laravel',
-                'asp.net', 'rails', 'fastapi', 'tornado', 'bootstrap', 'tailwind', 'material-ui'
-            ],
-            'databases': [
-                'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 'sql server', 'mariadb',
-                'elasticsearch', 'cassandra', 'dynamodb', 'firebase'
-            ],
-            'cloud_devops': [
-                'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab', 'github actions',
-                'terraform', 'ansible', 'nginx', 'apache', 'linux', 'ubuntu', 'centos'
-            ],
-            'data_science_ml': [
-                'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy', 'matplotlib', 'seaborn',
-                'jupyter', 'spark', 'hadoop', 'kafka', 'airflow', 'tableau', 'power bi'
-            ],
-            'soft_skills': [
-                'leadership', 'communication', 'teamwork', 'problem solving', 'project management',
-                'agile', 'scrum', 'kanban', 'lean', 'six sigma', 'customer service', 'mentoring'
-            ]
-        }
+        return self.skill_index.categories
@@ -0,0 +1,84 @@
+# resume_queue.py
+# In-process queue for parsing uploaded resumes outside the request cycle
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from backend.apps.users.models import JobSeekerProfile, ResumeParseJob
+from backend.services.resume_parser import ResumeProcessor
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the process-wide worker pool, or None when in-process workers are disabled"""
+    global _executor
+    concurrency = getattr(settings, 'RESUME_WORKER_CONCURRENCY', 2)
+    if concurrency <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='resume-worker')
+    return _executor
+
+
+def enqueue(job):
+    """
+    Schedule a queued ResumeParseJob once the surrounding transaction commits
+
+    With RESUME_WORKER_CONCURRENCY set to 0 the job stays queued in the
+    database for the process_resume_jobs management command to pick up.
+    """
+    executor = get_executor()
+    if executor is not None:
+        transaction.on_commit(lambda: executor.submit(run_job, job.id))
+
+
+def run_job(job_id) -> bool:
+    """
+    Parse the resume attached to a queued job and copy the results to the profile
+
+    Returns:
+        False if the job was already claimed by another worker
+    """
+    close_old_connections()
+    try:
+        # Claim the job atomically so a job is never processed twice
+        claimed = ResumeParseJob.objects.filter(id=job_id, status='queued').update(
+            status='running', started_at=timezone.now()
+        )
+        if not claimed:
+            return False
+
+        job = ResumeParseJob.objects.get(id=job_id)
+        try:
+            with job.resume.open('rb') as resume_file:
+                extracted_data = ResumeProcessor().process_resume(resume_file)
+
+            profile, created = JobSeekerProfile.objects.get_or_create(user_id=job.user_id)
+            profile.resume = job.resume.name
+            profile.extracted_skills = extracted_data.get('skills', [])
+            profile.extracted_experience = extracted_data.get('experience', {})
+            profile.resume_terms = extracted_data.get('terms')
+            profile.save()
+
+            job.extracted_skills = profile.extracted_skills
+            job.extracted_experience = profile.extracted_experience
+            job.status = 'done'
+        except Exception as e:
+            logger.exception('Resume job %s failed', job_id)
+            job.status = 'failed'
+            job.error = str(e)
+
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'extracted_skills', 'extracted_experience', 'error', 'finished_at'])
+        return True
+    finally:
+        close_old_connections()
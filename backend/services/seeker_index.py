@@ -0,0 +1,129 @@
+# seeker_index.py
+# Inverted skill and location index over job seekers
+from typing import Iterable, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.db.models.functions import Length
+
+from backend.services.job_matcher import seeker_locations
+
+# Longest posting key. Longer skills and locations are indexed under their
+# first POSTING_KEY_LENGTH characters, which can only add candidates.
+POSTING_KEY_LENGTH = 100
+
+# Most a seeker sharing no skill and no location with a job can score
+# (experience 20 and job type 10)
+NON_CANDIDATE_MAX_SCORE = 30
+
+
+def skill_keys(skills) -> Set[str]:
+    """Posting keys of a list of skills, compared the way SeekerMatrix compares them"""
+    return {skill.lower()[:POSTING_KEY_LENGTH] for skill in skills or []}
+
+
+def location_keys(location: str, max_length: int = POSTING_KEY_LENGTH) -> Set[str]:
+    """
+    Posting keys a job location is looked up under
+
+    A seeker location counts as a match when it is contained in the job's
+    lowercased location, so every substring of up to max_length characters
+    (at most POSTING_KEY_LENGTH) is a key.
+    """
+    location = (location or '').lower()
+    max_length = min(max_length, POSTING_KEY_LENGTH)
+    return {
+        location[start:end]
+        for start in range(len(location))
+        for end in range(start + 1, min(start + max_length, len(location)) + 1)
+    }
+
+
+def longest_location() -> int:
+    """Length of the longest location posting, 0 if there are none"""
+    from backend.apps.matching.models import SeekerLocationPosting
+
+    length = Length('location')
+    return SeekerLocationPosting.objects.order_by(length.desc()).values_list(length, flat=True).first() or 0
+
+
+def seeker_postings(profile) -> Tuple[Set[str], Set[str]]:
+    """Skill and location keys a JobSeekerProfile should be indexed under"""
+    locations = {
+        location[:POSTING_KEY_LENGTH]
+        for location in seeker_locations(profile.current_location, profile.preferred_locations)
+    }
+    return skill_keys(profile.extracted_skills), locations
+
+
+def index_seekers(profiles: Iterable):
+    """
+    Bring the skill and location postings of some profiles up to date
+
+    Only postings that were added or removed since the profile was last
+    indexed are written.
+    """
+    from backend.apps.matching.models import SeekerLocationPosting, SeekerSkillPosting
+
+    wanted = {profile.id: seeker_postings(profile) for profile in profiles}
+    if not wanted:
+        return
+
+    current_skills = {
+        (profile_id, skill): posting_id for posting_id, profile_id, skill in
+        SeekerSkillPosting.objects.filter(profile_id__in=wanted).values_list('id', 'profile_id', 'skill')
+    }
+    current_locations = {
+        (profile_id, location): posting_id for posting_id, profile_id, location in
+        SeekerLocationPosting.objects.filter(profile_id__in=wanted).values_list('id', 'profile_id', 'location')
+    }
+    wanted_skills = {(profile_id, skill) for profile_id, (skills, _) in wanted.items() for skill in skills}
+    wanted_locations = {
+        (profile_id, location) for profile_id, (_, locations) in wanted.items() for location in locations
+    }
+
+    with transaction.atomic():
+        SeekerSkillPosting.objects.filter(
+            id__in=[current_skills[pair] for pair in current_skills.keys() - wanted_skills]
+        ).delete()
+        SeekerLocationPosting.objects.filter(
+            id__in=[current_locations[pair] for pair in current_locations.keys() - wanted_locations]
+        ).delete()
+        SeekerSkillPosting.objects.bulk_create(
+            [SeekerSkillPosting(profile_id=profile_id, skill=skill)
+             for profile_id, skill in wanted_skills - current_skills.keys()],
+            ignore_conflicts=True,
+        )
+        SeekerLocationPosting.objects.bulk_create(
+            [SeekerLocationPosting(profile_id=profile_id, location=location)
+             for profile_id, location in wanted_locations - current_locations.keys()],
+            ignore_conflicts=True,
+        )
+
+
+def candidate_profiles(job) -> QuerySet:
+    """
+    Job seekers that share a skill or a location with a job
+
+    Postings use the same comparisons as SeekerMatrix: equal lowercased
+    skills, and seeker locations contained in the job's location. Anyone
+    else scores at most NON_CANDIDATE_MAX_SCORE, so they can be skipped
+    whenever only scores above that are wanted.
+    """
+    from backend.apps.matching.models import SeekerLocationPosting, SeekerSkillPosting
+    from backend.apps.users.models import JobSeekerProfile
+
+    by_skill = SeekerSkillPosting.objects.filter(
+        skill__in=sorted(skill_keys(job.extracted_skills))
+    ).values('profile_id')
+    # No seeker location is longer than the longest posting, so longer
+    # substrings can't match. The keys that do match are looked up once here,
+    # and only those are sent with every query of the returned queryset.
+    locations = []
+    if job.location:
+        keys = location_keys(job.location, longest_location())
+        locations = sorted(
+            SeekerLocationPosting.objects.filter(location__in=sorted(keys)).values_list('location', flat=True).distinct()
+        )
+    by_location = SeekerLocationPosting.objects.filter(location__in=locations).values('profile_id')
+    return JobSeekerProfile.objects.filter(Q(id__in=by_skill) | Q(id__in=by_location))
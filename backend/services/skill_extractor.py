@@ -1,2 +1,245 @@
 # skill_extractor.py
 # Service for extracting skills from text
+import hashlib
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+
+from backend.utils.text_processor import EXPERIENCE_PATTERNS, TOKEN_CHARS, analyze, normalize
+
+logger = logging.getLogger(__name__)
+
+# Built-in skill categories, as listed by ResumeProcessor.get_skill_categories
+DEFAULT_SKILL_CATEGORIES = {
+    'programming_languages': [
+        'python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift', 'kotlin',
+        'typescript', 'scala', 'r', 'matlab', 'perl', 'bash', 'powershell'
+    ],
+    'frameworks_libraries': [
+        'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'express', 'spring', 'laravel',
+        'asp.net', 'rails', 'fastapi', 'tornado', 'bootstrap', 'tailwind', 'material-ui'
+    ],
+    'databases': [
+        'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 'sql server', 'mariadb',
+        'elasticsearch', 'cassandra', 'dynamodb', 'firebase'
+    ],
+    'cloud_devops': [
+        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab', 'github actions',
+        'terraform', 'ansible', 'nginx', 'apache', 'linux', 'ubuntu', 'centos'
+    ],
+    'data_science_ml': [
+        'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy', 'matplotlib', 'seaborn',
+        'jupyter', 'spark', 'hadoop', 'kafka', 'airflow', 'tableau', 'power bi'
+    ],
+    'soft_skills': [
+        'leadership', 'communication', 'teamwork', 'problem solving', 'project management',
+        'agile', 'scrum', 'kanban', 'lean', 'six sigma', 'customer service', 'mentoring'
+    ]
+}
+
+# Category of the built-in keywords that resumes are scanned for but that are
+# not listed in any category; never listed by a SkillIndex
+UNCATEGORIZED = 'uncategorized'
+
+# Built-in taxonomy, used as-is when the database is unavailable. Migration
+# skills/0002 seeds a frozen copy of it; changes need a new data migration.
+DEFAULT_SKILL_TAXONOMY = dict(DEFAULT_SKILL_CATEGORIES, **{
+    UNCATEGORIZED: [
+        'jquery', 'axios', 'lodash', 'moment', 'chart.js', 'd3.js',
+        'git', 'svn', 'jira', 'confluence', 'slack', 'teams', 'zoom', 'figma', 'sketch',
+        'postman', 'swagger', 'graphql', 'rest api', 'soap', 'microservices'
+    ],
+})
+
+DEFAULT_SKILL_KEYWORDS = [keyword for keywords in DEFAULT_SKILL_TAXONOMY.values() for keyword in keywords]
+
+
+def _trie_pattern(node: dict) -> str:
+    """Render a character trie as a regex; longer terms win via greedy optionals"""
+    alternatives = [
+        (r'\s+' if char == ' ' else re.escape(char)) + _trie_pattern(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    terminal = '' in node
+    if not alternatives:
+        return ''
+    if len(alternatives) == 1 and not terminal:
+        return alternatives[0]
+    group = '(?:' + '|'.join(alternatives) + ')'
+    return group + '?' if terminal else group
+
+
+class SkillMatcher:
+    """
+    Compiled multi-pattern matcher mapping skill keywords and aliases to
+    canonical skill names.
+
+    All terms are folded into a single trie-shaped regex with token
+    boundaries, so a document is scanned once regardless of the number of
+    skills in the taxonomy.
+    """
+
+    def __init__(self, terms: Dict[str, str]):
+        """
+        Args:
+            terms: Mapping of lowercase term (keyword or alias) to the
+                canonical skill name returned on a match
+        """
+        self.terms = {' '.join(normalize(term).split()): name for term, name in terms.items() if term and term.strip()}
+        self.version = hashlib.sha1(
+            '\n'.join(f'{term}\t{name}' for term, name in sorted(self.terms.items())).encode('utf-8')
+        ).hexdigest()[:12]
+        self.trie_pattern = self._trie(self.terms)
+        self.pattern = None
+        if self.trie_pattern:
+            # A match must not be glued to a token character on either side, so
+            # 'r' does not match inside 'react' and 'go' not inside 'google',
+            # while 'c++', 'c#' and 'node.js' still match as a whole
+            self.pattern = re.compile(rf'(?<![{TOKEN_CHARS}]){self.trie_pattern}(?![{TOKEN_CHARS}])')
+
+    @staticmethod
+    def _trie(terms: Dict[str, str]) -> str:
+        # Fold the terms into a character trie so shared prefixes ('java',
+        # 'javascript', 'jenkins', 'jira') are only tried once per position
+        trie = {}
+        for term in terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        return _trie_pattern(trie)
+
+    @classmethod
+    def from_keywords(cls, keywords: Iterable[str],
+                      skills: Iterable[Tuple[str, Iterable[str]]] = ()) -> 'SkillMatcher':
+        """
+        Build a matcher from plain keywords and (name, aliases) skill pairs
+
+        Keywords map to their title-cased form, which is what the resume
+        parser has always returned. Skill names and aliases map to the skill
+        name and take precedence over a keyword with the same spelling.
+        """
+        terms = {keyword: keyword.title() for keyword in keywords}
+        for name, aliases in skills:
+            for term in [name, *(aliases or [])]:
+                if isinstance(term, str):
+                    terms[term] = name
+        return cls(terms)
+
+    def extract(self, text: str) -> List[str]:
+        """Return the sorted, de-duplicated canonical skill names found in text"""
+        if self.pattern is None:
+            return []
+        found = {self.terms[' '.join(term.split())] for term in self.pattern.findall(text)}
+        return sorted(found)
+
+
+class SkillIndex:
+    """
+    Compiled view of the skill taxonomy shared by every extractor and matcher
+
+    Attributes:
+        matcher: SkillMatcher over every skill name and alias
+        version: Stamp that changes whenever the taxonomy does
+        skill_ids: Canonical skill name -> Skill primary key
+        categories: Category name -> lowercase skill names
+    """
+
+    def __init__(self, matcher: SkillMatcher, skill_ids: Dict[str, int], categories: Dict[str, List[str]]):
+        self.matcher = matcher
+        self.version = matcher.version
+        self.skill_ids = skill_ids
+        self.categories = categories
+
+    @classmethod
+    def build(cls) -> 'SkillIndex':
+        """Build the index from the SkillCategory/Skill tables, or the built-in taxonomy without a database"""
+        from backend.apps.skills.models import Skill
+
+        try:
+            rows = list(Skill.objects.values_list('id', 'name', 'aliases', 'category__name'))
+        except DatabaseError:
+            logger.warning('Skill tables unavailable; using the built-in skill taxonomy')
+            rows = []
+
+        categories = {name: list(keywords) for name, keywords in DEFAULT_SKILL_CATEGORIES.items()}
+        skill_ids = {}
+        for skill_id, name, aliases, category in rows:
+            skill_ids[name] = skill_id
+            if category == UNCATEGORIZED:
+                continue
+            members = categories.setdefault(category, [])
+            if name.lower() not in members:
+                members.append(name.lower())
+
+        matcher = SkillMatcher.from_keywords(
+            DEFAULT_SKILL_KEYWORDS,
+            [(name, aliases) for _, name, aliases, _ in rows],
+        )
+        return cls(matcher, skill_ids, categories)
+
+
+# Cache key bumped whenever the taxonomy changes. Other workers see the bump
+# only if they share the cache; with the default per-process locmem cache
+# they pick up the change when their index is SKILL_INDEX_MAX_AGE old.
+TAXONOMY_GENERATION_KEY = 'skills:taxonomy_generation'
+
+_index: Optional[SkillIndex] = None
+_index_generation = None
+_index_built_at = 0.0
+_index_lock = threading.Lock()
+
+
+def _index_stale(generation) -> bool:
+    max_age = getattr(settings, 'SKILL_INDEX_MAX_AGE', 300)
+    return _index is None or generation != _index_generation or time.monotonic() - _index_built_at > max_age
+
+
+def get_skill_index() -> SkillIndex:
+    """Return this process's skill index, rebuilding it if the taxonomy changed or it is too old"""
+    global _index, _index_generation, _index_built_at
+    generation = cache.get(TAXONOMY_GENERATION_KEY)
+    index = _index
+    if _index_stale(generation):
+        with _index_lock:
+            if _index_stale(generation):
+                _index = SkillIndex.build()
+                _index_generation = generation
+                _index_built_at = time.monotonic()
+            index = _index
+    return index
+
+
+def invalidate_skill_index():
+    """Mark the skill index stale in this process and in other workers sharing the cache"""
+    global _index
+    _index = None
+    try:
+        cache.incr(TAXONOMY_GENERATION_KEY)
+    except ValueError:
+        cache.set(TAXONOMY_GENERATION_KEY, 1, None)
+
+
+def extract_requirements(text: str, skill_matcher: SkillMatcher) -> Dict[str, Any]:
+    """
+    Extract skills and required years of experience from a job description
+
+    Uses the same single-pass scanner as resume parsing.
+    """
+    processed = analyze(text, skill_matcher)
+    years = next(
+        (processed.experience_years[index] for index in range(len(EXPERIENCE_PATTERNS))
+         if index in processed.experience_years),
+        0,
+    )
+    return {
+        'skills': sorted(processed.skills),
+        'years_of_experience': years,
+        'sections': [name for name in processed.sections if name],
+    }
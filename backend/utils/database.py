@@ -0,0 +1,87 @@
+# database.py
+# Read-replica routing and SQLite connection tuning
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Applied to every new SQLite connection. WAL lets readers carry on while a
+# write is in progress; the rest trade a little durability on power loss
+# (never corruption) and memory for fewer disk syncs and reads.
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA mmap_size=134217728',
+)
+
+# {'replica_reads': bool} for the request being served, None outside requests.
+# A mutable dict, so a write flips it for every context copied from the request's.
+_request_state = ContextVar('database_request_state', default=None)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            for pragma in SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+
+
+def replica_aliases():
+    """Database aliases of the read replicas in DATABASES"""
+    return [alias for alias in settings.DATABASES if alias != 'default' and alias.startswith('replica')]
+
+
+class ReplicaRouter:
+    """
+    Send reads made while serving safe requests to a random replica
+
+    Only requests let through by ReplicaReadsMiddleware read from replicas;
+    writes, background work and management commands always use the primary.
+    A request that writes reads from the primary for the rest of its life,
+    and so sees its own changes despite replication lag. Queries pinned with
+    using('default') read from the primary regardless.
+    """
+
+    def db_for_read(self, model, **hints):
+        # Relations and deferred fields come from the database their row did
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        state = _request_state.get()
+        replicas = replica_aliases()
+        if replicas and state is not None and state['replica_reads']:
+            return random.choice(replicas)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state['replica_reads'] = False
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+class ReplicaReadsMiddleware:
+    """Let GET and HEAD requests read from replicas through ReplicaRouter"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _request_state.set({'replica_reads': request.method in ('GET', 'HEAD')})
+        try:
+            return self.get_response(request)
+        finally:
+            _request_state.reset(token)
@@ -0,0 +1,79 @@
+# export.py
+# Streaming NDJSON and CSV exports of querysets
+import csv
+import json
+from typing import Dict, Iterator, Sequence
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+
+# Content type of each supported export format
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Rows fetched from the database per round trip
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """File-like object whose write() hands the line back, so csv.writer output can be streamed"""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset: QuerySet, fields: Sequence[str], expressions: Dict = None) -> Iterator[dict]:
+    """
+    Rows of a queryset as dicts, read in chunks instead of all at once
+
+    Args:
+        queryset: Rows to export
+        fields: Model fields (or lookups) to project
+        expressions: Extra columns, output name -> expression, e.g. F('job__title')
+    """
+    return queryset.values(*fields, **(expressions or {})).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def ndjson_lines(rows: Iterator[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+
+def csv_lines(rows: Iterator[dict], columns: Sequence[str]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([row[column] for column in columns])
+
+
+def streaming_export(queryset: QuerySet, fields: Sequence[str], filename: str, export_format: str = 'ndjson',
+                     expressions: Dict = None) -> StreamingHttpResponse:
+    """
+    Stream a queryset as NDJSON (one JSON object per line) or CSV
+
+    Nothing is read until the response is iterated, and only one chunk of
+    rows is held in memory at a time, so the first bytes go out right away
+    however large the export is.
+
+    Args:
+        queryset: Rows to export, in the order they should be written
+        fields: Model fields (or lookups) to project
+        filename: Download name without extension
+        export_format: 'ndjson' or 'csv'
+        expressions: Extra columns, output name -> expression
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{export_format}'; use {' or '.join(EXPORT_FORMATS)}")
+
+    rows = export_rows(queryset, fields, expressions)
+    if export_format == 'csv':
+        lines = csv_lines(rows, list(fields) + list(expressions or {}))
+    else:
+        lines = ndjson_lines(rows)
+
+    response = StreamingHttpResponse(lines, content_type=EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
@@ -1,15 +1,25 @@
-import firebase_admin
-from firebase_admin import credentials, auth
 from django.conf import settings
-from django.contrib.auth.models import User
+from django.contrib.auth import get_user_model
 from rest_framework import authentication
 from rest_framework.exceptions import AuthenticationFailed
+from backend.utils import metrics
+from collections import OrderedDict
+import copy
+import hashlib
 import os
+import threading
+import time
 from pathlib import Path
 
+_firebase_lock = threading.Lock()
+
 # Initialize Firebase Admin SDK
 def initialize_firebase():
     """Initialize Firebase Admin SDK with service account"""
+    # The SDK is imported here rather than at module level, so workers that
+    # never verify a token don't pay for it at startup
+    import firebase_admin
+    from firebase_admin import credentials
     try:
         # Check if Firebase is already initialized
         if not firebase_admin._apps:
@@ -47,6 +57,68 @@ def initialize_firebase():
     except Exception as e:
         print(f"Firebase initialization error: {e}")
 
+def firebase_auth():
+    """The firebase_admin.auth module, initializing the SDK on first use"""
+    import firebase_admin
+    from firebase_admin import auth
+    if not firebase_admin._apps:
+        with _firebase_lock:
+            initialize_firebase()
+    return auth
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified ID tokens and the users they resolved to
+
+    Tokens are keyed by their SHA-256, never stored as-is. An entry lives
+    until the token's exp claim, or FIREBASE_TOKEN_CACHE_TTL seconds if that
+    comes first, so changes to the user show up within that time.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()  # token digest -> (user, expires_at)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token):
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token):
+        """The cached user for a token, or None"""
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                metrics.incr('firebase_token_cache.hits')
+                # Each request gets its own copy, so one view can't change another's user
+                return copy.copy(entry[0])
+            if entry is not None:
+                del self._entries[key]
+        metrics.incr('firebase_token_cache.misses')
+        return None
+
+    def put(self, token, user, exp):
+        max_size = getattr(settings, 'FIREBASE_TOKEN_CACHE_SIZE', 10000)
+        if max_size <= 0:
+            return
+        expires_at = min(exp, time.time() + getattr(settings, 'FIREBASE_TOKEN_CACHE_TTL', 300))
+        with self._lock:
+            self._entries[self.key(token)] = (copy.copy(user), expires_at)
+            self._entries.move_to_end(self.key(token))
+            evicted = 0
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            metrics.incr('firebase_token_cache.evictions', evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+token_cache = TokenCache()
+
 class FirebaseAuthentication(authentication.BaseAuthentication):
     """Custom authentication class for Firebase"""
     
@@ -65,15 +137,20 @@ class FirebaseAuthentication(authentication.BaseAuthentication):
         if not token:
             return None
             
+        # A token verified moments ago needs neither the signature check nor the user lookup
+        user = token_cache.get(token)
+        if user is not None:
+            return (user, None)
+
         try:
             # Verify the Firebase token
-            decoded_token = auth.verify_id_token(token)
+            decoded_token = firebase_auth().verify_id_token(token)
             firebase_uid = decoded_token['uid']
             email = decoded_token.get('email', '')
             name = decoded_token.get('name', '')
             
             # Get or create Django user
-            user, created = User.objects.get_or_create(
+            user, created = get_user_model().objects.get_or_create(
                 username=firebase_uid,
                 defaults={
                     'email': email,
@@ -85,6 +162,7 @@ class FirebaseAuthentication(authentication.BaseAuthentication):
             if created:
                 print(f"Created new user: {user.username}")
             
+            token_cache.put(token, user, decoded_token['exp'])
             return (user, None)
             
         except Exception as e:
@@ -93,6 +171,3 @@ class FirebaseAuthentication(authentication.BaseAuthentication):
     
     def authenticate_header(self, request):
         return 'Bearer realm="api"'
-
-# Initialize Firebase when the module is imported
-initialize_firebase()
@@ -0,0 +1,43 @@
+# metrics.py
+# Lightweight in-process counters for caches and background work
+import threading
+from collections import defaultdict
+
+from rest_framework import permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+_counters = defaultdict(float)
+_lock = threading.Lock()
+
+
+def incr(name: str, value: float = 1):
+    """Increment a named counter for this worker process"""
+    with _lock:
+        _counters[name] += value
+
+
+def snapshot() -> dict:
+    """Return a copy of every counter in this worker process"""
+    with _lock:
+        return dict(_counters)
+
+
+def hit_rate(prefix: str) -> float:
+    """Hit rate for a '<prefix>.hits' / '<prefix>.misses' counter pair"""
+    with _lock:
+        hits = _counters.get(f'{prefix}.hits', 0)
+        misses = _counters.get(f'{prefix}.misses', 0)
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def metrics_view(request):
+    """Counters and cache hit rates for the worker process that served this request"""
+    counters = snapshot()
+    prefixes = {name[:-len('.hits')] for name in counters if name.endswith('.hits')}
+    return Response({
+        'counters': counters,
+        'hit_rates': {prefix: hit_rate(prefix) for prefix in sorted(prefixes)},
+    })
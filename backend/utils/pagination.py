@@ -0,0 +1,152 @@
+# pagination.py
+# Keyset (seek) pagination helpers
+import base64
+import json
+import operator
+from functools import reduce
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+def keyset_chunks(queryset: QuerySet, fields: Sequence[str], chunk_size: int = 1000,
+                  key: str = 'pk') -> Iterator[List[Tuple]]:
+    """
+    Yield the rows of a queryset as lists of value tuples, chunk_size at a time
+
+    Each chunk is one query that seeks past the last key of the previous
+    chunk, so no page costs more than the first one and only one chunk is
+    held in memory at a time. Rows are ordered by key, which must be unique.
+
+    Args:
+        queryset: Rows to iterate; any ordering it has is replaced
+        fields: Columns to project into each tuple; key may be one of them
+        chunk_size: Rows per query
+        key: Unique column to paginate on
+    """
+    fields = list(fields)
+    extra_key = key not in fields
+    columns = [key] + fields if extra_key else fields
+    position = columns.index(key)
+
+    queryset = queryset.order_by(key).values_list(*columns)
+    last = None
+    while True:
+        page = queryset if last is None else queryset.filter(**{f'{key}__gt': last})
+        rows = list(page[:chunk_size])
+        if not rows:
+            return
+        last = rows[-1][position]
+        yield [row[1:] for row in rows] if extra_key else rows
+        if len(rows) < chunk_size:
+            return
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks on every column of a unique ordering
+
+    DRF's CursorPagination keeps only the first ordering column in its
+    cursor and steps over rows sharing that value with an OFFSET. Here the
+    cursor holds all the ordering columns of the row a page ends (or starts)
+    at, and the next page is fetched with a row comparison on them, so
+    every page is a single index seek however deep it is.
+
+    The ordering must end in a unique column, e.g. ('-created_at', '-id').
+    """
+    ordering: Sequence[str] = ()
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+
+        reverse, position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.after(position, reverse))
+        order = [f'{"-" if descending != reverse else ""}{name}' for name, descending in self.fields]
+        rows = list(queryset.order_by(*order)[:self.page_size + 1])
+
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+        # Coming back from a later page means there is one; reaching a page
+        # through a cursor means there is an earlier one
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else position is not None
+        self.page = rows
+        return rows
+
+    @property
+    def fields(self) -> List[Tuple[str, bool]]:
+        """(column, descending) for each ordering column"""
+        return [(field.lstrip('-'), field.startswith('-')) for field in self.ordering]
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+            if size > 0:
+                return min(size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def after(self, position, reverse: bool) -> Q:
+        """Rows past a position in page order (before it when reverse)"""
+        # (a, b) after (a0, b0) is a > a0 OR (a = a0 AND b > b0), with < for descending columns
+        conditions = []
+        for index, (name, descending) in enumerate(self.fields):
+            lookup = 'lt' if descending != reverse else 'gt'
+            equal = {previous: value for (previous, _), value in zip(self.fields[:index], position)}
+            conditions.append(Q(**equal, **{f'{name}__{lookup}': position[index]}))
+        # The redundant bound on the first column lets the planner seek on the index
+        name, descending = self.fields[0]
+        bound = Q(**{f'{name}__{"lt" if descending != reverse else "gt"}e': position[0]})
+        return bound & reduce(operator.or_, conditions)
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        return self.link(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous or not self.page:
+            return None
+        return self.link(self.page[0], reverse=True)
+
+    def link(self, row, reverse: bool) -> str:
+        position = [self.model._meta.get_field(name).value_to_string(row) for name, _ in self.fields]
+        cursor = base64.urlsafe_b64encode(json.dumps([int(reverse), position]).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """(reverse, position) from the request's cursor, or (False, None) for the first page"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return False, None
+        try:
+            reverse, values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if len(values) != len(self.fields):
+                raise ValueError
+            position = [
+                self.model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(self.fields, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return bool(reverse), position
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'previous': self.get_previous_link(), 'results': data})
@@ -1,2 +1,83 @@
 # resume_parser.py
 # Utility for parsing resumes
+import time
+from typing import Iterator, Optional
+
+from backend.utils.text_processor import normalize
+
+
+def iter_pdf_text(pdf_file) -> Iterator[str]:
+    """Yield the text of each PDF page"""
+    # Imported on first use to keep it out of worker startup
+    import PyPDF2
+
+    try:
+        pdf_reader = PyPDF2.PdfReader(pdf_file)
+        for page in pdf_reader.pages:
+            yield (page.extract_text() or '') + "\n"
+    except Exception as e:
+        raise Exception(f"Failed to extract text from PDF: {str(e)}")
+
+
+def iter_docx_text(docx_file) -> Iterator[str]:
+    """Yield the text of each DOCX paragraph"""
+    import docx
+
+    try:
+        doc = docx.Document(docx_file)
+    except Exception as e:
+        raise Exception(f"Failed to extract text from DOCX: {str(e)}")
+    for paragraph in doc.paragraphs:
+        yield paragraph.text + "\n"
+
+
+class ResumeText:
+    """
+    Normalized, lowercased text of a resume, produced one page or paragraph at a time
+
+    Iteration stops early and sets `truncated` once max_pages, max_chars or
+    the timeout (in seconds) is reached, so pathological documents cost a
+    bounded amount of memory and time. The limits are checked between
+    chunks; a single slow page is not interrupted.
+    """
+
+    def __init__(self, resume_file, max_pages: Optional[int] = None,
+                 max_chars: Optional[int] = None, timeout: Optional[float] = None):
+        file_name = resume_file.name.lower()
+        if file_name.endswith('.pdf'):
+            self._chunks = iter_pdf_text(resume_file)
+        elif file_name.endswith(('.doc', '.docx')):
+            # DOCX paragraphs have no page structure, so only the other limits apply
+            self._chunks = iter_docx_text(resume_file)
+            max_pages = None
+        else:
+            raise Exception("Unsupported file format. Please upload PDF or DOC/DOCX files.")
+
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.timeout = timeout
+        self.truncated = False
+        self.length = 0
+
+    def __iter__(self) -> Iterator[str]:
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        pages = 0
+
+        while True:
+            # Check limits before pulling the next chunk, since pulling a PDF page extracts it
+            if (self.max_pages and pages >= self.max_pages) or (deadline and time.monotonic() > deadline):
+                self.truncated = True
+                return
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                return
+            pages += 1
+
+            if self.max_chars and self.length + len(chunk) > self.max_chars:
+                chunk = chunk[:self.max_chars - self.length]
+                self.truncated = True
+            self.length += len(chunk)
+            yield normalize(chunk)
+            if self.truncated:
+                return
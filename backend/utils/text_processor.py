@@ -1,2 +1,171 @@
 # text_processor.py
 # Utility for processing text
+import re
+import threading
+import unicodedata
+from typing import Dict, List, Optional
+
+# Characters that make up a token; a skill or token match never starts or
+# ends next to one of these
+TOKEN_CHARS = r'a-z0-9+#'
+
+# Experience patterns, most reliable first. Each captures the number of years.
+EXPERIENCE_PATTERNS = [
+    r'(\d+)\s*(?:years?|yrs?)\s*(?:of\s*)?experience',
+    r'experience:\s*(\d+)\s*(?:years?|yrs?)',
+    r'(\d+)\s*(?:years?|yrs?)\s*in\s*(?:the\s*)?field',
+    r'worked\s*(?:for\s*)?(\d+)\s*(?:years?|yrs?)',
+]
+
+# Lines consisting only of one of these start a new section
+SECTION_HEADINGS = [
+    'summary', 'profile', 'objective', 'experience', 'work experience', 'professional experience',
+    'employment history', 'education', 'skills', 'technical skills', 'projects', 'certifications',
+    'awards', 'publications', 'languages', 'interests', 'references',
+    'about the role', 'about us', 'responsibilities', 'requirements', 'qualifications',
+    'preferred qualifications', 'nice to have', 'benefits',
+]
+
+# Invisible characters PDF and DOCX exports scatter through words
+_INVISIBLE = dict.fromkeys(map(ord, '\u00ad\u200b\u200c\u200d\u2060\ufeff'))
+
+
+def normalize(text: str) -> str:
+    """NFKC-normalize and lowercase text, folding ligatures and full-width forms"""
+    return unicodedata.normalize('NFKC', text).translate(_INVISIBLE).lower()
+
+
+class ProcessedText:
+    """Result of a single scan over normalized text"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.sentences: List[str] = []
+        self.sections: Dict[str, str] = {}
+        self.skills = set()
+        # Largest year count per EXPERIENCE_PATTERNS index
+        self.experience_years: Dict[int, int] = {}
+        self._tokens = None
+
+    @property
+    def tokens(self) -> List[str]:
+        """Word tokens, split on demand since most callers never need them"""
+        if self._tokens is None:
+            self._tokens = TOKEN_RE.findall(self.text)
+        return self._tokens
+
+
+TOKEN_RE = re.compile(rf'\.?[{TOKEN_CHARS}]+(?:\.[{TOKEN_CHARS}]+)*')
+
+
+class TextScanner:
+    """
+    Sentence/section splitter and skill matcher in one regex
+
+    Section headings, sentence ends and (when a skill matcher is given) the
+    skill trie are alternatives of a single compiled pattern, so a document
+    is read once no matter how many skills are looked for. With split=False
+    sentence and section splitting is left out, which roughly halves the
+    work for callers that only need skills and experience.
+
+    Experience patterns can overlap each other ("experience: 5 years of
+    experience" matches two), so each is run on its own, like
+    re.findall() per pattern, and only over text mentioning years at all.
+    """
+
+    def __init__(self, skill_matcher=None, split: bool = True):
+        self.skill_matcher = skill_matcher
+        self.split = split
+        headings = '|'.join(re.escape(heading).replace(r'\ ', r'\s+') for heading in SECTION_HEADINGS)
+        alternatives = []
+        if split:
+            # Headings are only looked for right after a line break, which keeps
+            # the alternation off the hot path for ordinary characters
+            alternatives.append(rf'(?P<stop>[.!?]+(?=\s|$)|\n(?:[ \t]*(?P<heading>{headings})[ \t]*:?[ \t]*$)?)')
+        if skill_matcher is not None and skill_matcher.trie_pattern:
+            alternatives.append(rf'(?<![{TOKEN_CHARS}])(?P<skill>{skill_matcher.trie_pattern})(?![{TOKEN_CHARS}])')
+        self.pattern = re.compile('|'.join(alternatives), re.MULTILINE) if alternatives else None
+        self.first_heading = re.compile(rf'[ \t]*(?P<heading>{headings})[ \t]*:?[ \t]*$', re.MULTILINE)
+        self.experience_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in EXPERIENCE_PATTERNS]
+
+    def scan(self, text: str) -> ProcessedText:
+        """Scan already-normalized text"""
+        result = ProcessedText(text)
+        section = ''
+        section_start = sentence_start = 0
+
+        # A heading on the first line has no line break in front of it
+        heading = self.first_heading.match(text) if self.split else None
+        if heading:
+            section = ' '.join(heading.group('heading').split())
+            section_start = sentence_start = heading.end()
+
+        # Every pattern needs "year(s)" or "yr(s)"
+        if 'yr' in text or 'year' in text:
+            for index, pattern in enumerate(self.experience_patterns):
+                years = pattern.findall(text)
+                if years:
+                    result.experience_years[index] = max(int(value) for value in years)
+
+        matches = self.pattern.finditer(text, section_start) if self.pattern is not None else ()
+        for match in matches:
+            if match.lastgroup == 'skill':
+                result.skills.add(self.skill_matcher.terms[' '.join(match.group('skill').split())])
+            elif match.group('heading') is not None:
+                self._add_sentence(result, text[sentence_start:match.start()])
+                self._add_section(result, section, text[section_start:match.start()])
+                section = ' '.join(match.group('heading').split())
+                section_start = sentence_start = match.end()
+            else:
+                self._add_sentence(result, text[sentence_start:match.end()])
+                sentence_start = match.end()
+
+        if self.split:
+            self._add_sentence(result, text[sentence_start:])
+            self._add_section(result, section, text[section_start:])
+        return result
+
+    @staticmethod
+    def _add_sentence(result, sentence):
+        sentence = sentence.strip()
+        if sentence:
+            result.sentences.append(sentence)
+
+    @staticmethod
+    def _add_section(result, name, body):
+        body = body.strip()
+        if body:
+            result.sections[name] = f"{result.sections[name]}\n{body}" if name in result.sections else body
+
+
+_scanners: Dict[tuple, TextScanner] = {}
+_scanners_lock = threading.Lock()
+
+
+def get_scanner(skill_matcher=None, split: bool = True) -> TextScanner:
+    """Return the compiled scanner for a skill matcher, building it once per matcher version"""
+    key = (skill_matcher.version if skill_matcher is not None else None, split)
+    scanner = _scanners.get(key)
+    if scanner is None:
+        scanner = TextScanner(skill_matcher, split)
+        with _scanners_lock:
+            # Matchers are rebuilt when the taxonomy changes; drop scanners for old versions
+            if len(_scanners) > 8:
+                _scanners.clear()
+            _scanners[key] = scanner
+    return scanner
+
+
+def analyze(text: str, skill_matcher=None, normalized: bool = False, split: bool = True) -> ProcessedText:
+    """
+    Normalize text and scan it once for sentences, sections, experience
+    mentions and skills
+
+    Args:
+        text: Raw text, or normalized text when normalized=True
+        skill_matcher: Optional SkillMatcher whose skills should be found
+        split: Also split the text into sentences and sections
+    """
+    if not normalized:
+        text = normalize(text)
+    return get_scanner(skill_matcher, split).scan(text)
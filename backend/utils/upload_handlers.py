@@ -0,0 +1,36 @@
+# upload_handlers.py
+# File upload handlers
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+
+class BoundedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Stream uploads straight to a temporary file, never into memory
+
+    Once an upload grows past MAX_UPLOAD_SIZE the remaining chunks are
+    discarded instead of written. The resulting file still reports the
+    full upload size, so views can reject it before any parsing starts.
+
+    The SHA-256 of the content is computed as it streams in and exposed
+    as `sha256` on the uploaded file.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.sha256 = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.MAX_UPLOAD_SIZE:
+            return None
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        uploaded_file.sha256 = self.sha256.hexdigest()
+        return uploaded_file
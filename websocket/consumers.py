@@ -1,4 +1,6 @@
+import asyncio
 import json
+from django.conf import settings
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth.models import User
@@ -6,7 +8,20 @@ from backend.apps.jobs.models import Job
 from backend.apps.users.models import JobSeekerProfile
 
 class JobUpdatesConsumer(AsyncWebsocketConsumer):
+    """
+    Pushes new matching jobs to one user
+
+    job_update events are buffered for JOB_UPDATES_BATCH_WINDOW seconds (or
+    until JOB_UPDATES_MAX_BATCH are waiting) and sent together. A lone event
+    goes out as a 'new_job' frame, several as one 'new_jobs' frame:
+    {"type": "new_jobs", "jobs": [{"job": {...}, "match_score": 87}, ...]}
+    Updates still buffered when the client disconnects are not delivered.
+    """
+
     async def connect(self):
+        self._pending = []  # (job JSON, match score)
+        self._flush_task = None
+
         # Get user from URL route or token
         self.user_id = self.scope['url_route']['kwargs']['user_id']
         self.user_group_name = f'user_{self.user_id}'
@@ -19,6 +34,11 @@ class JobUpdatesConsumer(AsyncWebsocketConsumer):
         await self.accept()
 
     async def disconnect(self, close_code):
+        # The socket is already closed, so buffered updates can't be sent and
+        # are dropped; the jobs stay in the user's recommendations
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        self._pending = []
         # Leave user group
         await self.channel_layer.group_discard(
             self.user_group_name,
@@ -31,11 +51,37 @@ class JobUpdatesConsumer(AsyncWebsocketConsumer):
 
     # Receive message from group
     async def job_update(self, event):
-        job_data = event['job_data']
-        
-        # Send job data to WebSocket
-        await self.send(text_data=json.dumps({
-            'type': 'new_job',
-            'job': job_data,
-            'match_score': event.get('match_score', 0)
-        }))
+        # The notifier encodes each job once and every recipient reuses it
+        job_json = event.get('job_json') or json.dumps(event['job_data'])
+        self._pending.append((job_json, event.get('match_score', 0)))
+
+        window = getattr(settings, 'JOB_UPDATES_BATCH_WINDOW', 0.25)
+        if window <= 0 or len(self._pending) >= getattr(settings, 'JOB_UPDATES_MAX_BATCH', 50):
+            await self.flush_job_updates()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after(window))
+
+    async def _flush_after(self, window):
+        await asyncio.sleep(window)
+        self._flush_task = None
+        await self.flush_job_updates()
+
+    async def flush_job_updates(self):
+        """Send every buffered job update in one frame"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        # Frames are assembled around the pre-encoded job JSON instead of
+        # decoding and re-encoding it
+        if len(pending) == 1:
+            job_json, match_score = pending[0]
+            await self.send(text_data=f'{{"type": "new_job", "job": {job_json}, "match_score": {json.dumps(match_score)}}}')
+            return
+        jobs = ', '.join(
+            f'{{"job": {job_json}, "match_score": {json.dumps(match_score)}}}' for job_json, match_score in pending
+        )
+        await self.send(text_data=f'{{"type": "new_jobs", "jobs": [{jobs}]}}')
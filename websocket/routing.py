@@ -2,5 +2,5 @@ from django.urls import path
 from . import consumers
 
 websocket_urlpatterns = [
-    path('ws/job-updates/<int:user_id>/', consumers.JobUpdatesConsumer.as_asgi()),
+    path('ws/job-updates/<str:user_id>/', consumers.JobUpdatesConsumer.as_asgi()),
 ]